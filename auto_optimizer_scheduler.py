@@ -30,7 +30,7 @@ LAST_RUN_FILE    = os.path.join(CACHE_DIR, '.last_optimization_run')
 IN_PROGRESS_FILE = os.path.join(CACHE_DIR, '.optimization_in_progress')
 PORTFOLIO_SCRIPT = os.path.join(PROJECT_ROOT, 'run_portfolio_optimizer.py')
 
-log_dir = os.path.join(PROJECT_ROOT, 'logs')
+log_dir = os.environ.get('MBOT_LOG_DIR', os.path.join(PROJECT_ROOT, 'logs'))
 os.makedirs(log_dir, exist_ok=True)
 logging.basicConfig(
     level=logging.INFO,
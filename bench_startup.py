@@ -0,0 +1,116 @@
+# bench_startup.py
+"""
+Startzeit-Benchmark fuer run.py-Prozesse (Exchange-Init mit/ohne Markets-Cache).
+
+Misst pro Variante in frischen Python-Prozessen:
+  import : Import von mbot.strategy.run (ccxt, pandas, numpy, ...)
+  init   : Exchange({}) inkl. Markets (Cache bzw. load_markets())
+  total  : Prozess-Wandzeit (Interpreter-Start bis Ende)
+
+Varianten:
+  cache    : Markets aus artifacts/markets (bzw. --offline: synthetischer Cache)
+  no-cache : MBOT_MARKETS_CACHE=0 -> load_markets() bei jedem Start (Netzwerk)
+
+Nutzung:
+  python bench_startup.py --runs 5
+  python bench_startup.py --runs 5 --offline 600   # ohne Netzwerk, 600 synthetische Maerkte
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+import tempfile
+
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(PROJECT_ROOT, 'src'))
+
+PROBE = '''
+import sys, time, json, logging
+t0 = time.perf_counter()
+sys.path.append({src!r})
+logging.disable(logging.CRITICAL)
+import mbot.strategy.run
+from mbot.utils.exchange import Exchange
+t1 = time.perf_counter()
+ex = Exchange({{}})
+t2 = time.perf_counter()
+print(json.dumps({{'import': t1 - t0, 'init': t2 - t1, 'markets': len(ex.markets)}}))
+'''
+
+
+def _synthetic_markets(n: int) -> dict:
+    markets = {}
+    for i in range(n):
+        base   = f'SYN{i:04d}'
+        symbol = f'{base}/USDT:USDT'
+        markets[symbol] = {
+            'id': f'{base}USDT', 'symbol': symbol, 'base': base, 'quote': 'USDT', 'settle': 'USDT',
+            'baseId': base, 'quoteId': 'USDT', 'settleId': 'USDT', 'type': 'swap',
+            'spot': False, 'margin': False, 'swap': True, 'future': False, 'option': False,
+            'contract': True, 'linear': True, 'inverse': False, 'contractSize': 1.0, 'active': True,
+            'precision': {'amount': 0.001, 'price': 0.0001},
+            'limits': {'amount': {'min': 0.001, 'max': None}, 'price': {'min': None, 'max': None},
+                       'cost': {'min': 5.0, 'max': None}, 'leverage': {'min': 1, 'max': 125}},
+            # Bitget liefert pro Markt ~40 Rohfelder
+            'info': {f'field{k}': str(k * 0.5) for k in range(40)},
+        }
+    return markets
+
+
+def _run(env: dict, runs: int) -> list:
+    results = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        out   = subprocess.run([sys.executable, '-c', PROBE.format(src=os.path.join(PROJECT_ROOT, 'src'))],
+                               env=env, capture_output=True, text=True, timeout=300)
+        total = time.perf_counter() - start
+        if out.returncode != 0:
+            raise RuntimeError(out.stderr.strip().splitlines()[-1] if out.stderr else 'Probe fehlgeschlagen')
+        res = json.loads(out.stdout.strip().splitlines()[-1])
+        res['total'] = total
+        results.append(res)
+    return results
+
+
+def _report(name: str, results: list):
+    def fmt(key):
+        vals = [r[key] for r in results]
+        return f"{statistics.median(vals) * 1000:8.0f} ms (min {min(vals) * 1000:6.0f})"
+    print(f"  {name:<9} import {fmt('import')} | init {fmt('init')} | total {fmt('total')} "
+          f"| Maerkte: {results[-1]['markets']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Startzeit-Benchmark (Markets-Cache)')
+    parser.add_argument('--runs', type=int, default=5, help='Prozesse pro Variante')
+    parser.add_argument('--offline', type=int, default=0,
+                        help='N synthetische Maerkte als Cache verwenden (kein Netzwerk noetig)')
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    tmp = None
+    if args.offline:
+        from mbot.utils.markets_cache import MarketsCache
+        tmp = tempfile.TemporaryDirectory()
+        MarketsCache(tmp.name).write('bitget', _synthetic_markets(args.offline))
+        env['MBOT_MARKETS_CACHE_DIR'] = tmp.name
+
+    print(f"\n===== run.py Startzeit ({args.runs} Prozesse pro Variante) =====")
+    try:
+        _report('cache', _run(dict(env, MBOT_MARKETS_CACHE='1'), args.runs))
+        no_cache = _run(dict(env, MBOT_MARKETS_CACHE='0'), args.runs)
+        if no_cache[-1]['markets'] == 0:
+            print("  no-cache  load_markets() fehlgeschlagen (kein Netzwerk?) - nicht vergleichbar")
+        else:
+            _report('no-cache', no_cache)
+    finally:
+        if tmp is not None:
+            tmp.cleanup()
+
+
+if __name__ == '__main__':
+    main()
@@ -31,8 +31,9 @@ def load_data():
 def compute_indicators(df, cfg):
     from mbot.strategy.mers_signal import (
         calc_log_returns, calc_rolling_entropy, calc_velocity,
-        calc_acceleration, calc_energy, calc_atr, classify_phase_regime,
+        calc_acceleration, calc_energy, calc_atr,
     )
+    from mbot.strategy.mdef_analysis import classify_phase_regime_series, REGIME_NAMES
     price    = df['close']
     returns  = calc_log_returns(price)
     entropy  = calc_rolling_entropy(returns, window=cfg.get('entropy_window', 18))
@@ -43,26 +44,8 @@ def compute_indicators(df, cfg):
 
     # Regime pro Kerze
     regime_window = cfg.get('regime_window', 14)
-    regimes = []
-    for i in range(len(df)):
-        if i < regime_window:
-            regimes.append('neutral')
-            continue
-        v_win = velocity.iloc[max(0, i-regime_window):i]
-        a_win = acc.iloc[max(0, i-regime_window):i]
-        std_v = v_win.std()
-        std_a = a_win.std()
-        if std_v == 0:
-            regimes.append('neutral')
-            continue
-        vel_consistency = abs(v_win.mean()) / std_v
-        chaos_ratio     = std_a / std_v if std_v > 0 else 0
-        if chaos_ratio > 1.5:
-            regimes.append('chaos')
-        elif vel_consistency > 0.3:
-            regimes.append('trend')
-        else:
-            regimes.append('range')
+    regimes = [REGIME_NAMES[int(c)]
+               for c in classify_phase_regime_series(velocity, acc, window=regime_window)]
 
     # Signal-Punkte ermitteln (wo alle Bedingungen erfüllt)
     min_entropy_drop = cfg.get('min_entropy_drop_pct', 0.18)
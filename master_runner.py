@@ -8,9 +8,12 @@ Logik:
   3. Liest active_positions.json -> welche Strategien haben offene Trades?
 
   FALL A: Aktive Positionen vorhanden
-    -> Fuer JEDE aktive Position 'run.py --mode check' ausfuehren
-    -> Prueft ob Position noch offen
-    -> Falls geschlossen: Position wird in run.py aus State entfernt
+    -> Reconciliation in diesem Prozess: alle Positionen + Trigger-Orders
+       des Accounts in zwei Requests, Abgleich mit active_positions.json,
+       Storno nur fuer Symbole mit Trigger-Orders ohne Position
+    -> Falls geschlossen: Position wird aus State entfernt
+    -> live_trading_settings.batched_reconciliation=false: wie frueher
+       'run.py --mode check' pro Position
 
   FALL B: Freie Strategien vorhanden (max_open_positions nicht erreicht)
     -> Fuer jede FREIE Strategie 'run.py --mode signal' ausfuehren
@@ -18,9 +21,21 @@ Logik:
     -> Stoppe wenn max_open_positions erreicht
 
 Wird per Cronjob alle 1-5 Minuten ausgefuehrt (je nach Timeframe der Strategien).
+
+--async_signals (oder live_trading_settings.async_signal_checks): FALL B
+laeuft in diesem Prozess statt run.py pro Strategie - OHLCV aller freien
+Strategien gleichzeitig, Signale im Worker-Pool, Orders in fester
+Prioritaetsreihenfolge, Latenz-Report pro Lauf
+(siehe src/mbot/strategy/concurrent_signals.py).
+
+Daemon-Modus (--daemon): ein langlaufender Prozess statt Cron + run.py pro
+Strategie - Exchange, Settings und Configs bleiben im Speicher, Signal-Checks
+genau an den Kerzen-Grenzen (siehe src/mbot/strategy/daemon.py).
 """
 
 import json
+import signal
+import argparse
 import subprocess
 import sys
 import os
@@ -32,7 +47,7 @@ PROJECT_ROOT = SCRIPT_DIR
 sys.path.append(os.path.join(PROJECT_ROOT, 'src'))
 
 # Logging
-log_dir  = os.path.join(PROJECT_ROOT, 'logs')
+log_dir  = os.environ.get('MBOT_LOG_DIR', os.path.join(PROJECT_ROOT, 'logs'))
 os.makedirs(log_dir, exist_ok=True)
 log_file = os.path.join(log_dir, 'master_runner.log')
 logging.basicConfig(
@@ -101,20 +116,19 @@ def run_strategy(python_exe: str, symbol: str, timeframe: str, mode: str, wait:
         logging.error(f"Fehler beim Starten von run.py fuer {symbol}: {e}")
 
 
-def main():
-    logging.info("=" * 55)
-    logging.info("mbot Master Runner (Multi-Position)")
-    logging.info("=" * 55)
-
-    # --- Python-Interpreter ---
+def find_python() -> str:
+    """Python-Interpreter aus .venv (Fallback: aktueller Interpreter)."""
     python_exe = os.path.join(PROJECT_ROOT, '.venv', 'bin', 'python3')
     if not os.path.exists(python_exe):
         python_exe = os.path.join(PROJECT_ROOT, '.venv', 'Scripts', 'python.exe')
     if not os.path.exists(python_exe):
         python_exe = sys.executable
         logging.warning(f"Kein .venv gefunden, verwende: {python_exe}")
+    return python_exe
 
-    # --- Auto-Optimizer im Hintergrund pruefen ---
+
+def start_auto_optimizer(python_exe: str):
+    """Startet den Auto-Optimizer-Scheduler im Hintergrund (prueft selbst, ob faellig)."""
     if os.path.exists(AUTO_OPT_SCRIPT):
         logging.info("[Auto-Optimizer] Pruefe ob Optimierung faellig...")
         os.makedirs(log_dir, exist_ok=True)
@@ -125,6 +139,82 @@ def main():
                 stderr=subprocess.STDOUT,
             )
 
+
+def connect_exchange(secrets: dict):
+    """Exchange-Instanz fuer den ersten Account (in-process Pfade: Reconciliation, --async_signals)."""
+    from mbot.utils.exchange import Exchange
+    return Exchange(secrets['mbot'][0])
+
+
+def run_reconciliation(exchange, secrets: dict, active_strategy_keys: set) -> bool:
+    """FALL A in-process: ein Account-Snapshot statt run.py --mode check pro Position."""
+    from mbot.utils.trade_manager import reconcile_positions
+    try:
+        summary = reconcile_positions(exchange, secrets.get('telegram', {}), logging.getLogger('reconcile'),
+                                      active_strategy_keys)
+        return summary is not None
+    except Exception as e:
+        logging.error(f"Reconciliation fehlgeschlagen: {e}", exc_info=True)
+        return False
+
+
+def run_concurrent_signal_checks(exchange, settings: dict, secrets: dict, strategies: list,
+                                 max_open_positions: int, active_strategy_keys: set):
+    """FALL B in-process: alle freien Strategien in einem asyncio-Durchlauf (mbot.strategy.concurrent_signals)."""
+    from mbot.strategy.run import setup_logging, load_strategy_config
+    from mbot.strategy.concurrent_signals import run_signal_checks
+
+    configs = {}
+    for strategy in strategies:
+        key = (strategy['symbol'], strategy['timeframe'])
+        try:
+            configs[key] = load_strategy_config(key[0], key[1], settings, setup_logging(*key))
+        except Exception as e:
+            logging.error(f"Config fuer {key[0]} ({key[1]}) nicht lesbar: {e}")
+    strategies = [s for s in strategies if (s['symbol'], s['timeframe']) in configs]
+
+    try:
+        run_signal_checks(exchange or connect_exchange(secrets), strategies, configs, max_open_positions,
+                          secrets.get('telegram', {}), active_keys=active_strategy_keys)
+    except Exception as e:
+        logging.error(f"Gleichzeitige Signal-Checks fehlgeschlagen: {e}", exc_info=True)
+
+
+def run_daemon(check_interval: float, close_delay: float, async_signals: bool = False):
+    """Daemon-Modus: ein Prozess, Ticks an Kerzen-Grenzen (mbot.strategy.daemon)."""
+    from mbot.strategy.daemon import MasterDaemon
+
+    logging.info("=" * 55)
+    logging.info("mbot Master Daemon (Multi-Position)")
+    logging.info("=" * 55)
+
+    python_exe = find_python()
+    last_opt   = [0.0]
+
+    def on_wake():
+        # Auto-Optimizer hoechstens stuendlich anstossen (wie bisher pro Cron-Lauf)
+        if time.time() - last_opt[0] >= 3600:
+            last_opt[0] = time.time()
+            start_auto_optimizer(python_exe)
+
+    daemon = MasterDaemon(check_interval=check_interval, close_delay=close_delay, on_wake=on_wake,
+                          async_signals=async_signals)
+    signal.signal(signal.SIGTERM, lambda *_: daemon.stop())
+    signal.signal(signal.SIGINT,  lambda *_: daemon.stop())
+    on_wake()
+    daemon.run()
+
+
+def main(async_signals: bool = False):
+    logging.info("=" * 55)
+    logging.info("mbot Master Runner (Multi-Position)")
+    logging.info("=" * 55)
+
+    python_exe = find_python()
+
+    # --- Auto-Optimizer im Hintergrund pruefen ---
+    start_auto_optimizer(python_exe)
+
     # --- Settings laden ---
     try:
         with open(os.path.join(PROJECT_ROOT, 'settings.json'), 'r') as f:
@@ -145,6 +235,7 @@ def main():
     live_settings      = settings.get('live_trading_settings', {})
     use_auto_optimizer = live_settings.get('use_auto_optimizer_results', False)
     max_open_positions = int(live_settings.get('max_open_positions', 10))
+    async_signals      = async_signals or bool(live_settings.get('async_signal_checks', False))
 
     if use_auto_optimizer:
         logging.info("Modus: Auto-Optimizer (Strategien aus settings.json active_strategies).")
@@ -172,7 +263,15 @@ def main():
     for p in orphaned:
         logging.warning(f"  Ignoriere verwaiste Position (nicht in settings): {p.get('symbol')} ({p.get('timeframe')})")
 
-    if relevant_positions:
+    exchange = None
+    if relevant_positions and live_settings.get('batched_reconciliation', True):
+        logging.info(f"Offene Trades: {len(relevant_positions)} -> Reconciliation (ein Account-Snapshot)...")
+        try:
+            exchange = connect_exchange(secrets)
+            run_reconciliation(exchange, secrets, active_strategy_keys)
+        except Exception as e:
+            logging.error(f"Exchange-Verbindung fehlgeschlagen: {e}", exc_info=True)
+    elif relevant_positions:
         logging.info(f"Offene Trades: {len(relevant_positions)} -> Pruefe alle Positionen...")
         for pos in relevant_positions:
             sym = pos.get('symbol')
@@ -204,6 +303,16 @@ def main():
         f"Pruefe Signale fuer freie Strategien..."
     )
 
+    if async_signals:
+        free_strategies = [s for s in active_strategies
+                           if s.get('symbol') and s.get('timeframe')
+                           and (s['symbol'], s['timeframe']) not in active_keys]
+        logging.info(f"  Signal-Check gleichzeitig fuer {len(free_strategies)} freie Strategie(n)")
+        run_concurrent_signal_checks(exchange, settings, secrets, free_strategies,
+                                     max_open_positions, active_strategy_keys)
+        logging.info("Master Runner beendet.")
+        return
+
     for strategy in active_strategies:
         sym = strategy.get('symbol')
         tf  = strategy.get('timeframe')
@@ -234,4 +343,17 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
+    parser = argparse.ArgumentParser(description='mbot Master Runner')
+    parser.add_argument('--daemon', action='store_true',
+                        help='Langlaufender Prozess statt Cron-Lauf (Ticks an Kerzen-Grenzen)')
+    parser.add_argument('--check_interval', type=float, default=300.0,
+                        help='Daemon: Positions-Check mindestens alle N Sekunden')
+    parser.add_argument('--close_delay', type=float, default=2.0,
+                        help='Daemon: Sekunden nach Kerzen-Schluss bis zum Signal-Check')
+    parser.add_argument('--async_signals', action='store_true',
+                        help='Signal-Checks aller freien Strategien gleichzeitig (asyncio) statt nacheinander')
+    args = parser.parse_args()
+    if args.daemon:
+        run_daemon(args.check_interval, args.close_delay, args.async_signals)
+    else:
+        main(args.async_signals)
@@ -146,42 +146,28 @@ echo ""
 # ── [Schritt 1/3] MERS Signal-Optimierung ────────────────────────────────────
 echo -e "${YELLOW}[Schritt 1/3] MERS Signal-Optimierung (Optuna)...${NC}"
 
-echo "$PAIRS" | while IFS=' ' read -r sym tf; do
-    # Datum berechnen
-    if [[ "$HISTORY_INPUT" =~ ^[0-9]+$ ]]; then
-        LOOKBACK=$HISTORY_INPUT
-    else
-        case "$tf" in
-            5m|15m) LOOKBACK=90   ;;
-            30m|1h) LOOKBACK=365  ;;
-            2h|4h)  LOOKBACK=730  ;;
-            6h|1d)  LOOKBACK=1095 ;;
-            *)      LOOKBACK=730  ;;
-        esac
-    fi
-    START_DATE=$(date -d "$LOOKBACK days ago" +%F 2>/dev/null || date -v-${LOOKBACK}d +%F)
-    END_DATE=$(date +%F)
-
-    echo ""
-    echo -e "${CYAN}  Optimiere: $sym ($tf) | ${START_DATE} → ${END_DATE}${NC}"
-
-    $PYTHON "src/mbot/analysis/optimizer.py" \
-        --symbols       "$sym" \
-        --timeframes    "$tf" \
-        --start_date    "$START_DATE" \
-        --end_date      "$END_DATE" \
-        --start_capital "$CAPITAL" \
-        --trials        "$N_TRIALS" \
-        --jobs          "$N_CORES" \
-        --max_drawdown  "$MAX_DD" \
-        --min_win_rate  "$MIN_WR" \
-        --min_pnl       "$MIN_PNL" \
-        --mode          "$OPTIM_MODE_ARG"
-
-    if [ $? -ne 0 ]; then
-        echo -e "${RED}  Fehler bei $sym ($tf). Weiter mit naechstem Paar.${NC}"
-    fi
-done
+# Alle Paare in einem Lauf: Downloads parallel zur Optimierung, CPU-Budget
+# ueber alle Paare, Rueckblick pro Timeframe (--history_days auto)
+SYMS=$(echo "$PAIRS" | awk '!seen[$1]++ {print $1}' | tr '\n' ' ')
+TFS=$(echo "$PAIRS"  | awk '!seen[$2]++ {print $2}' | tr '\n' ' ')
+if [[ "$HISTORY_INPUT" =~ ^[0-9]+$ ]]; then HISTORY_DAYS=$HISTORY_INPUT; else HISTORY_DAYS="auto"; fi
+
+$PYTHON "src/mbot/analysis/optimizer.py" \
+    --symbols       "$SYMS" \
+    --timeframes    "$TFS" \
+    --history_days  "$HISTORY_DAYS" \
+    --start_capital "$CAPITAL" \
+    --trials        "$N_TRIALS" \
+    --workers       "$N_CORES" \
+    --cpu_budget    "$N_CORES" \
+    --max_drawdown  "$MAX_DD" \
+    --min_win_rate  "$MIN_WR" \
+    --min_pnl       "$MIN_PNL" \
+    --mode          "$OPTIM_MODE_ARG"
+
+if [ $? -ne 0 ]; then
+    echo -e "${RED}  Fehler bei der Optimierung. Weiter mit der Validierung.${NC}"
+fi
 
 echo ""
 
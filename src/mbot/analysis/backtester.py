@@ -15,12 +15,18 @@ Exit:   Intra-candle SL/TP-Pruefung via High/Low (Hard Stop)
 
 Optimierung: Features werden einmal auf dem gesamten DataFrame vorberechnet
 (O(N) statt O(N^2)) anstatt get_mers_signal() fuer jede Kerze aufzurufen.
+Entry-Bedingungen werden als Maske vorberechnet, die Trade-Simulation
+(simulate_trades) laeuft auf NumPy-Arrays ohne pandas-Zugriffe pro Kerze,
+mit installiertem numba als kompilierte Schleife (MBOT_JIT, mbot.utils.jit).
+run_backtest_batch() bewertet viele Configs in einem Aufruf (Kennzahlen-Tabelle).
 """
 
 import os
 import sys
+import hashlib
 import logging
-import time
+import threading
+from collections import OrderedDict
 import pandas as pd
 import numpy as np
 
@@ -30,14 +36,23 @@ sys.path.append(os.path.join(PROJECT_ROOT, 'src'))
 from mbot.strategy.mdef_analysis import (
     calc_log_returns,
     calc_rolling_entropy,
+    calc_entropy_cube,
     calc_velocity,
     calc_acceleration,
     calc_energy,
     calc_atr,
-    classify_phase_regime,
-    calc_multitf_alignment,
+    classify_phase_regime_series,
+    calc_multitf_alignment_series,
+    REGIME_RANGE,
+    REGIME_CHAOS,
 )
 
+from mbot.utils.jit import njit, NUMBA_ENABLED
+from mbot.utils import ohlcv_cache
+from mbot.utils.ohlcv_cache import OHLCV_CACHE
+from mbot.utils.ohlcv_downloader import download_ohlcv
+from mbot.utils.ohlcv_resample import RESAMPLE_TARGETS, resample_ohlcv, pick_base
+
 logger = logging.getLogger(__name__)
 
 # Mindest-Kerzen bevor erstes Signal berechnet werden kann
@@ -45,11 +60,207 @@ logger = logging.getLogger(__name__)
 MIN_CANDLES = 110
 
 
+class FeatureCache:
+    """
+    LRU-Cache fuer vorberechnete Indikator-Arrays (thread-safe).
+
+    Schluessel: (Feature-Name, Dataset-Hash, Indikator-Parameter...).
+    Werte: read-only NumPy-Arrays oder Tupel davon. Der Speicher ist durch
+    max_bytes begrenzt, bei Ueberschreitung werden die am laengsten nicht
+    genutzten Eintraege verworfen.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024):
+        self.max_bytes = int(max_bytes)
+        self.hits      = 0
+        self.misses    = 0
+        self.nbytes    = 0
+        self._entries  = OrderedDict()
+        self._lock     = threading.Lock()
+
+    def get(self, key, compute):
+        """Liefert den Eintrag fuer key; berechnet ihn bei Bedarf via compute()."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+            self.misses += 1
+
+        value = compute()
+        size  = _nbytes(value)
+        with self._lock:
+            if key not in self._entries and size <= self.max_bytes:
+                self._entries[key] = (value, size)
+                self.nbytes += size
+                while self.nbytes > self.max_bytes:
+                    _, (_, old_size) = self._entries.popitem(last=False)
+                    self.nbytes -= old_size
+        return value
+
+    def clear(self):
+        """Leert den Cache und setzt die Zaehler zurueck."""
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+            self.hits   = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits':     self.hits,
+                'misses':   self.misses,
+                'hit_rate': round(self.hits / total * 100, 1) if total else 0.0,
+                'entries':  len(self._entries),
+                'mb':       round(self.nbytes / 1024 / 1024, 1),
+            }
+
+
+# Prozessweiter Cache, Groesse per MBOT_FEATURE_CACHE_MB (Standard 256 MB)
+FEATURE_CACHE = FeatureCache(int(float(os.environ.get('MBOT_FEATURE_CACHE_MB', 256)) * 1024 * 1024))
+
+
+def dataset_hash(df: pd.DataFrame) -> str:
+    """Hash ueber Index und OHLC-Arrays (identifiziert den Datensatz im Feature-Cache)."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(np.ascontiguousarray(df.index.asi8 if hasattr(df.index, 'asi8') else df.index.to_numpy()).tobytes())
+    for col in ('open', 'high', 'low', 'close'):
+        if col in df:
+            h.update(np.ascontiguousarray(df[col].to_numpy(dtype=np.float64)).tobytes())
+    return h.hexdigest()
+
+
+def _cached(cache, key, compute):
+    return compute() if cache is None else cache.get(key, compute)
+
+
+def _nbytes(value) -> int:
+    if isinstance(value, tuple):
+        return sum(_nbytes(v) for v in value)
+    return getattr(value, 'nbytes', 0)
+
+
+def _frozen(values) -> np.ndarray:
+    """Array-Kopie ohne Schreibrecht (Cache-Eintraege werden geteilt)."""
+    arr = np.array(values)
+    arr.setflags(write=False)
+    return arr
+
+
+def _frozen_tuple(arrays) -> tuple:
+    for arr in arrays:
+        arr.setflags(write=False)
+    return tuple(arrays)
+
+
+def _base_features(df: pd.DataFrame) -> tuple:
+    """Parameterfreie Features: close, velocity, acceleration, energy."""
+    price    = df['close']
+    velocity = calc_velocity(price)
+    acc      = calc_acceleration(velocity)
+    energy   = calc_energy(velocity)
+    return (_frozen(price.to_numpy(dtype=np.float64)), _frozen(velocity),
+            _frozen(acc), _frozen(energy))
+
+
+def _mtf_features(df: pd.DataFrame, meso_tf_mult: int, macro_tf_mult: int) -> tuple:
+    mtf = calc_multitf_alignment_series(df, meso_mult=meso_tf_mult,
+                                        macro_mult=macro_tf_mult,
+                                        window=MIN_CANDLES + 1)
+    return _frozen(mtf['aligned'].to_numpy()), _frozen(mtf['direction'].to_numpy())
+
+
+def _fetch_ohlcv_range(exchange_instance, symbol: str, timeframe: str,
+                       since: int, until: int) -> tuple:
+    """
+    Laedt Kerzen [since, until] parallel in Seiten zu 200 (mbot.utils.ohlcv_downloader).
+    Returns (rows, ok) - ok=False wenn ein Abschnitt fehlschlug.
+    """
+    return download_ohlcv(exchange_instance.exchange, symbol, timeframe, since, until)
+
+
+def _sync_cache(exchange_instance, symbol: str, timeframe: str, start_ts: int, end_ts: int,
+                cache) -> tuple:
+    """
+    Laedt die im Store fehlenden Bereiche von [start_ts, end_ts] nach.
+    Returns (data, open_rows, fetched): Store-Stand, noch offene Kerze(n), Anzahl neuer Kerzen.
+    """
+    tf_ms       = exchange_instance.exchange.parse_timeframe(timeframe) * 1000
+    # Kerzen mit Start <= last_closed sind abgeschlossen und duerfen in den Cache
+    last_closed = exchange_instance.exchange.milliseconds() - tf_ms
+    open_rows   = []
+    fetched     = 0
+
+    with cache.lock(symbol, timeframe):
+        data = cache.read(symbol, timeframe) or ohlcv_cache.empty_data()
+        for lo, hi in ohlcv_cache.missing_ranges(data, start_ts, end_ts, tf_ms):
+            rows, ok = _fetch_ohlcv_range(exchange_instance, symbol, timeframe, lo, hi)
+            fetched += len(rows)
+            closed   = [r for r in rows if r[0] <= last_closed]
+            open_rows.extend(r for r in rows if r[0] > last_closed)
+            # Bereiche ohne Kerzen nur vermerken, wenn der Abruf vollstaendig war
+            empty = []
+            if ok and lo <= min(hi, last_closed):
+                probe = ohlcv_cache.empty_data()
+                probe['timestamp'] = np.asarray([r[0] for r in closed], dtype=np.int64)
+                empty = ohlcv_cache.missing_ranges(probe, lo, min(hi, last_closed), tf_ms)
+            if closed or empty:
+                data = cache.update(symbol, timeframe, closed, empty)
+    return data, open_rows, fetched
+
+
+def _load_resampled(exchange_instance, symbol: str, timeframe: str, base: str,
+                    start_ts: int, end_ts: int, cache) -> tuple:
+    """
+    timeframe aus dem Basis-Timeframe base bilden (mbot.utils.ohlcv_resample).
+    Buckets mit Luecken in der Basis kommen ueber den Store des Ziel-Timeframes
+    vom Exchange. Returns (df, fetched).
+    """
+    tf_ms   = exchange_instance.exchange.parse_timeframe(timeframe) * 1000
+    base_ms = exchange_instance.exchange.parse_timeframe(base) * 1000
+    data, open_rows, fetched = _sync_cache(exchange_instance, symbol, base, start_ts, end_ts, cache)
+
+    lo, hi = ohlcv_cache._bounds(data['timestamp'], start_ts, end_ts)
+    ts, ohlcv = data['timestamp'][lo:hi], data['ohlcv'][:, lo:hi]
+    if open_rows:
+        forming   = ohlcv_cache.rows_to_data([r for r in open_rows if start_ts <= r[0] <= end_ts])
+        ts, ohlcv = np.concatenate([ts, forming['timestamp']]), np.hstack([ohlcv, forming['ohlcv']])
+    bucket_ts, out, complete = resample_ohlcv(ts, ohlcv, base_ms, tf_ms)
+
+    forming = bucket_ts + tf_ms > exchange_instance.exchange.milliseconds()
+    gaps    = np.flatnonzero(~complete & ~forming)
+    if len(gaps):
+        # Zusammenhaengende Luecken-Buckets gemeinsam nachladen
+        runs = np.split(gaps, np.flatnonzero(np.diff(gaps) > 1) + 1)
+        for run in runs:
+            first, last = int(bucket_ts[run[0]]), int(bucket_ts[run[-1]]) + tf_ms - 1
+            tgt, _, n = _sync_cache(exchange_instance, symbol, timeframe, first, last, cache)
+            fetched  += n
+            pos = np.searchsorted(tgt['timestamp'], bucket_ts[run])
+            hit = pos < len(tgt['timestamp'])
+            hit[hit] = tgt['timestamp'][pos[hit]] == bucket_ts[run][hit]
+            out[:, run[hit]] = tgt['ohlcv'][:, pos[hit]]
+        logger.info(f"  {len(gaps)} {timeframe}-Kerzen mit Luecken in {base} direkt vom Exchange.")
+
+    return ohlcv_cache.to_dataframe({'timestamp': bucket_ts, 'ohlcv': out}), fetched
+
+
 def load_data(exchange_instance, symbol: str, timeframe: str,
-              start_date: str, end_date: str) -> pd.DataFrame:
+              start_date: str, end_date: str, cache=OHLCV_CACHE,
+              resample_from: str = None) -> pd.DataFrame:
     """
     Laedt historische OHLCV-Daten von Bitget.
     Benoetigt eine Exchange-Instanz.
+
+    Mit cache (Standard: artifacts/ohlcv_cache, mbot.utils.ohlcv_cache) werden
+    nur fehlende Bereiche geladen: neuere Kerzen als die letzte gespeicherte,
+    ein fehlender Anfang und Luecken. Die noch offene Kerze wird geliefert,
+    aber nicht gespeichert.
+
+    2h/4h/6h/12h/1d werden lokal aus 1h/15m gebildet, wenn resample_from
+    gesetzt ist oder der Store der Basis den Zeitraum bereits abdeckt.
     """
     logger.info(f"Lade Daten: {symbol} ({timeframe}) | {start_date} -> {end_date}")
     if not hasattr(exchange_instance, 'exchange'):
@@ -58,281 +269,794 @@ def load_data(exchange_instance, symbol: str, timeframe: str,
 
     start_ts = int(exchange_instance.exchange.parse8601(start_date + 'T00:00:00Z'))
     end_ts   = int(exchange_instance.exchange.parse8601(end_date   + 'T23:59:59Z'))
-    tf_ms    = exchange_instance.exchange.parse_timeframe(timeframe) * 1000
-
-    all_ohlcv = []
-    current   = start_ts
-
-    while current < end_ts:
-        try:
-            chunk = exchange_instance.exchange.fetch_ohlcv(symbol, timeframe, current, 200)
-            if not chunk:
-                break
-            chunk = [c for c in chunk if c[0] <= end_ts]
-            if not chunk:
-                break
-            all_ohlcv.extend(chunk)
-            current = chunk[-1][0] + tf_ms
-            time.sleep(exchange_instance.exchange.rateLimit / 1000)
-        except Exception as e:
-            logger.error(f"Fehler beim Laden der Daten: {e}")
-            break
 
-    if not all_ohlcv:
-        return pd.DataFrame()
+    if cache is None:
+        rows, _ = _fetch_ohlcv_range(exchange_instance, symbol, timeframe, start_ts, end_ts)
+        if not rows:
+            return pd.DataFrame()
+        df = pd.DataFrame(rows, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
+        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms', utc=True)
+        df.set_index('timestamp', inplace=True)
+        df.sort_index(inplace=True)
+        df = df[~df.index.duplicated(keep='last')]
+        logger.info(f"  -> {len(df)} Kerzen geladen.")
+        return df
 
-    df = pd.DataFrame(all_ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
-    df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms', utc=True)
-    df.set_index('timestamp', inplace=True)
-    df.sort_index(inplace=True)
-    df = df[~df.index.duplicated(keep='last')]
-    logger.info(f"  -> {len(df)} Kerzen geladen.")
+    tf_ms = lambda tf: exchange_instance.exchange.parse_timeframe(tf) * 1000
+    base  = resample_from if timeframe in RESAMPLE_TARGETS else None
+    base  = base or pick_base(cache, symbol, timeframe, start_ts, tf_ms)
+    if base:
+        df, fetched = _load_resampled(exchange_instance, symbol, timeframe, base, start_ts, end_ts, cache)
+        source = f"aus {base} gebildet"
+    else:
+        data, open_rows, fetched = _sync_cache(exchange_instance, symbol, timeframe, start_ts, end_ts, cache)
+        df = ohlcv_cache.to_dataframe(data, start_ts, end_ts)
+        if open_rows:
+            df = pd.concat([df, ohlcv_cache.to_dataframe(ohlcv_cache.rows_to_data(open_rows))])
+            df = df[~df.index.duplicated(keep='last')].sort_index()
+        source = "Rest aus dem Cache"
+    if df.empty:
+        return pd.DataFrame()
+    logger.info(f"  -> {len(df)} Kerzen ({fetched} neu vom Exchange, {source}).")
     return df
 
 
 def run_backtest(df: pd.DataFrame, signal_config: dict, risk_config: dict,
                   start_capital: float = 1000.0, symbol: str = '',
-                  trial=None) -> dict:
+                  trial=None, feature_cache=FEATURE_CACHE,
+                  entropy_cube: dict = None) -> dict:
     """
     Fuehrt den MERS-Backtest durch.
 
-    Optimierung: Alle Features (Entropy, ATR, Velocity, Acc, Energy) werden
-    einmal auf dem gesamten DataFrame vorberechnet (O(N)). Danach werden im
-    Loop nur Werte per Index nachgeschlagen, statt get_mers_signal() fuer
-    jede Kerze neu aufzurufen (was O(N^2) waere).
+    Optimierung: Alle Features (Entropy, ATR, Velocity, Acc, Energy, Regime,
+    MTF) werden einmal auf dem gesamten DataFrame vorberechnet (O(N)) und zu
+    einer Entry-Maske zusammengefasst. Die Trade-Simulation laeuft danach
+    auf reinen NumPy-Arrays (simulate_trades) und springt nur zwischen
+    Entry-Kandidaten und Exits.
+
+    Zweistufig: Stufe 1 (_entry_stage: Features, Teilbedingungen, Entry-Maske)
+    haengt nur von Indikator-/Filter-Parametern ab und liegt im feature_cache
+    (Standard: FEATURE_CACHE) unter (Dataset-Hash, Parameter). Stufe 2 (SL/TP,
+    Risiko, Hebel) ist die Trade-Simulation. Trials, die sich nur in Stufe-2-Parametern
+    unterscheiden, rechnen damit nur die Simulation neu.
+    feature_cache=None schaltet den Cache ab.
+
+    entropy_cube (siehe build_entropy_cube) liefert die Entropy als
+    Zeilen-Slice, sofern er zum DataFrame passt und entropy_window enthaelt.
 
     Returns dict mit allen Ergebnissen.
     """
-    risk_per_trade_pct = float(signal_config.get('risk_per_trade_pct',
-                               risk_config.get('risk_per_trade_pct', 1.0)))
-    leverage           = int(signal_config.get('leverage', risk_config.get('leverage', 1)))
-    fee_rate           = float(risk_config.get('fee_rate_pct',       0.06)) / 100.0
-    slippage_pct       = float(risk_config.get('entry_slippage_pct', 0.15))
-    min_notional_usdt  = float(risk_config.get('min_notional_usdt',  5.0))
-
-    # --- Signal-Parameter auslesen ---
-    entropy_window    = int(signal_config.get('entropy_window',       20))
-    entropy_lookback  = int(signal_config.get('entropy_lookback',     10))
-    energy_lookback   = int(signal_config.get('energy_lookback',       5))
-    min_entropy_drop  = float(signal_config.get('min_entropy_drop_pct', 0.05))
-    min_energy_rise   = float(signal_config.get('min_energy_rise_pct',  0.20))
-    atr_period        = int(signal_config.get('atr_period',            14))
-    atr_sl_mult       = float(signal_config.get('atr_sl_mult',          1.5))
-    atr_tp_mult       = float(signal_config.get('atr_tp_mult',          3.0))
-    use_regime_filter = bool(int(signal_config.get('use_regime_filter',   1)))
-    regime_window     = int(signal_config.get('regime_window',          20))
-    allow_range_trade = bool(int(signal_config.get('allow_range_trade',   0)))
-    use_multitf_filter = bool(int(signal_config.get('use_multitf_filter', 0)))
-    meso_tf_mult      = int(signal_config.get('meso_tf_mult',            4))
-    macro_tf_mult     = int(signal_config.get('macro_tf_mult',           16))
-
+    p = _backtest_params(signal_config, risk_config)
     if len(df) < MIN_CANDLES + 1:
         return _empty_result(symbol, start_capital)
 
-    # -------------------------------------------------------
-    # FEATURE-VORBERECHNUNG (einmalig auf vollem DataFrame)
-    # -------------------------------------------------------
-    price    = df['close']
-    returns  = calc_log_returns(price)
-    entropy  = calc_rolling_entropy(returns, window=entropy_window)
-    velocity = calc_velocity(price)
-    acc      = calc_acceleration(velocity)
-    energy   = calc_energy(velocity)
-    atr_ser  = calc_atr(df, period=atr_period)
+    cache = feature_cache
+    key   = dataset_hash(df) if cache is not None or entropy_cube is not None else None
 
-    capital  = start_capital
-    trades   = []
-    in_trade = False
-    trade    = {}
-
-    total_steps      = len(df) - MIN_CANDLES
-    checkpoint_every = max(1, total_steps // 8)  # 8 Checkpoints: 12.5/25/.../100%
-
-    for i in range(MIN_CANDLES, len(df)):
-        # --- Optuna Pruning: Intermediate Value alle 25% der Kerzen ---
-        if trial is not None:
-            step = (i - MIN_CANDLES) // checkpoint_every
-            if step > 0 and (i - MIN_CANDLES) % checkpoint_every == 0:
-                pnl_so_far = (capital - start_capital) / start_capital * 100 if start_capital > 0 else 0.0
-                trial.report(pnl_so_far, step)
-                if trial.should_prune():
-                    import optuna
-                    raise optuna.exceptions.TrialPruned()
-
-        current = df.iloc[i]
-
-        # --- Trade-Aufloesung (SL/TP hit check) ---
-        if in_trade:
-            entry = trade['entry_price']
-            side  = trade['side']
-            sl_p  = trade['sl_price']
-            tp_p  = trade['tp_price']
-            hi    = current['high']
-            lo    = current['low']
-
-            hit_sl = (side == 'long'  and lo  <= sl_p) or (side == 'short' and hi >= sl_p)
-            hit_tp = (side == 'long'  and hi  >= tp_p) or (side == 'short' and lo <= tp_p)
-
-            if hit_sl or hit_tp:
-                # Bei gleicher Kerze: SL-Prioritaet (konservativ)
-                if hit_sl and hit_tp:
-                    result = 'loss'
-                    exit_p = sl_p
-                elif hit_tp:
-                    result = 'win'
-                    exit_p = tp_p
-                else:
-                    result = 'loss'
-                    exit_p = sl_p
-
-                # Risiko-basierte Positionsgroesse (wie dnabot)
-                sl_distance = abs(entry - trade['sl_price'])
-                risk_amount = capital * risk_per_trade_pct / 100.0
-                if sl_distance > 0:
-                    pos_contracts = risk_amount / sl_distance
-                else:
-                    pos_contracts = 0.0
-
-                if side == 'long':
-                    pnl_usdt = pos_contracts * (exit_p - entry)
-                else:
-                    pnl_usdt = pos_contracts * (entry - exit_p)
-
-                # Handelsgebühren (Entry + Exit Notional × fee_rate pro Leg)
-                fee_usdt = pos_contracts * (entry + exit_p) * fee_rate
-                pnl_usdt -= fee_usdt
-
-                pnl_pct  = pnl_usdt / capital * 100 if capital > 0 else 0.0
-                capital  = max(capital + pnl_usdt, 0.0)
-
-                idx = df.index[i]
-                exit_time = idx.isoformat() if hasattr(idx, 'isoformat') else str(idx)
-                trade.update({
-                    'exit_price':         exit_p,
-                    'exit_time':          exit_time,
-                    'result':             result,
-                    'pnl_pct':            round(pnl_pct, 2),
-                    'pnl_usdt':           round(pnl_usdt, 2),
-                    'capital_after':      round(capital, 2),
-                    'risk_per_trade_pct': risk_per_trade_pct,
-                    'leverage':           leverage,
-                })
-                trades.append(trade)
-                in_trade = False
-                trade = {}
-            continue  # Wenn in Trade: keine neue Signal-Pruefung
-
-        # -------------------------------------------------------
-        # MERS-SIGNAL-PRUEFUNG (vorberechnete Features nutzen)
-        # -------------------------------------------------------
-        cur_entropy  = entropy.iloc[i]
-        cur_energy   = energy.iloc[i]
-        cur_acc      = acc.iloc[i]
-        cur_atr      = atr_ser.iloc[i]
-        entry_price  = float(price.iloc[i])
-
-        # Lookback-Schutz
-        if i < entropy_lookback or i < energy_lookback:
-            continue
-        prev_entropy = entropy.iloc[i - entropy_lookback]
-        prev_energy  = energy.iloc[i - energy_lookback]
+    # STUFE 1: Entry-Kandidaten (Features + Entry-Maske, gecacht)
+    close, atr, entry_side = _entry_stage(df, p, cache, key, entropy_cube)
 
-        # NaN / ungueltige Werte ueberspringen
-        if any(np.isnan(v) for v in [cur_entropy, prev_entropy, cur_energy,
-                                      prev_energy, cur_acc, cur_atr]):
-            continue
-        if cur_atr <= 0 or entry_price <= 0:
-            continue
+    # STUFE 2: Exits und Positionsgroesse (SL/TP, Risiko, Hebel)
+    high, low, exit_index = _exit_arrays(df, cache, key)
+    sim = simulate_trades(
+        high, low, close, atr, entry_side,
+        atr_sl_mult=p['atr_sl_mult'], atr_tp_mult=p['atr_tp_mult'],
+        start_capital=start_capital, risk_per_trade_pct=p['risk_per_trade_pct'],
+        fee_rate=p['fee_rate'], slippage_pct=p['slippage_pct'],
+        min_notional_usdt=p['min_notional_usdt'],
+        exit_index=exit_index,
+    )
 
-        # --- Layer 2: Regime-Check (optional) ---
-        if use_regime_filter:
-            vel_win = velocity.iloc[max(0, i - regime_window):i + 1]
-            acc_win = acc.iloc[max(0, i - regime_window):i + 1]
-            regime  = classify_phase_regime(vel_win, acc_win, window=regime_window)
-            if regime == 'chaos':
-                continue
-            if regime == 'range' and not allow_range_trade:
-                continue
-
-        # --- Layer 1: Entropy-Bedingung ---
-        if prev_entropy <= 0:
-            continue
-        entropy_drop = (prev_entropy - cur_entropy) / prev_entropy
-        if entropy_drop < min_entropy_drop:
-            continue
+    if trial is not None:
+        _report_to_trial(trial, sim, len(df), start_capital)
 
-        # --- Layer 1: Energie-Bedingung ---
-        if prev_energy <= 0:
-            continue
-        energy_rise = (cur_energy - prev_energy) / prev_energy
-        if energy_rise < min_energy_rise:
-            continue
+    return _build_result(df, sim, symbol, start_capital, p['risk_per_trade_pct'], p['leverage'])
 
-        # --- Layer 1: Richtung via Beschleunigung ---
-        if cur_acc > 0:
-            side = 'long'
-        elif cur_acc < 0:
-            side = 'short'
-        else:
-            continue
 
-        # --- Layer 3: Multi-Timeframe (optional) ---
-        if use_multitf_filter:
-            window_df = df.iloc[max(0, i - MIN_CANDLES):i + 1]
-            mtf = calc_multitf_alignment(window_df,
-                                          meso_mult=meso_tf_mult,
-                                          macro_mult=macro_tf_mult)
-            if not mtf['aligned']:
-                continue
-            if side == 'long'  and mtf['direction'] < 0:
-                continue
-            if side == 'short' and mtf['direction'] > 0:
-                continue
+def run_backtest_batch(df: pd.DataFrame, signal_configs: list, risk_config: dict,
+                       start_capital: float = 1000.0, feature_cache=FEATURE_CACHE,
+                       entropy_cube: dict = None) -> pd.DataFrame:
+    """
+    Bewertet K Signal-Configs auf demselben DataFrame in einem Aufruf.
+
+    Features und Teilbedingungen werden ueber den Feature-Cache geteilt, die
+    K Entry-Masken als (K x N) int8-Matrix aufgebaut und alle Trade-Pfade
+    in einem Durchlauf simuliert (mit Numba: ein kompilierter Kernel ueber
+    alle Configs). Kein Optuna-Pruning, keine Trade-Listen.
+
+    Returns DataFrame mit einer Zeile pro Config (gleiche Reihenfolge) und
+    den Kennzahlen von run_backtest(): total_trades, wins, losses, win_rate,
+    total_pnl_pct, total_pnl_usdt, max_drawdown, best_trade, worst_trade,
+    end_capital.
+    """
+    params = [_backtest_params(cfg, risk_config) for cfg in signal_configs]
+    if len(df) < MIN_CANDLES + 1 or not params:
+        empty = _empty_result('', start_capital)
+        return pd.DataFrame([{k: empty[k] for k in _STAT_COLUMNS} for _ in params],
+                            columns=_STAT_COLUMNS)
+
+    cache = feature_cache
+    key   = dataset_hash(df) if cache is not None or entropy_cube is not None else None
+
+    # Stufe 1 fuer alle Configs; ATR-Zeilen nur einmal pro atr_period
+    atr_rows, atr_row_of = [], {}
+    row_idx = np.empty(len(params), dtype=np.int64)
+    entry_sides = np.empty((len(params), len(df)), dtype=np.int8)
+    for r, p in enumerate(params):
+        close, atr, entry_sides[r] = _entry_stage(df, p, cache, key, entropy_cube)
+        if p['atr_period'] not in atr_row_of:
+            atr_row_of[p['atr_period']] = len(atr_rows)
+            atr_rows.append(atr)
+        row_idx[r] = atr_row_of[p['atr_period']]
+    atr_matrix = np.vstack(atr_rows)
+
+    # Stufe 2: alle Trade-Pfade
+    high, low, (min_low, max_high) = _exit_arrays(df, cache, key)
+    sl_mults = np.array([p['atr_sl_mult'] for p in params])
+    tp_mults = np.array([p['atr_tp_mult'] for p in params])
+    risks    = np.array([p['risk_per_trade_pct'] for p in params])
+    fees     = np.array([p['fee_rate'] for p in params])
+    slips    = np.array([p['slippage_pct'] for p in params])
+    notional = np.array([p['min_notional_usdt'] for p in params])
+    batch_args = (high, low, min_low, max_high, close, atr_matrix, row_idx, entry_sides,
+                  sl_mults, tp_mults, float(start_capital), risks, fees, slips, notional)
+    if NUMBA_ENABLED:
+        offsets, win, pnl_pct, capital_after, end_capital = _simulate_batch_jit(*batch_args)
+    else:
+        offsets, win, pnl_pct, capital_after, end_capital = _simulate_batch_numpy(*batch_args)
+
+    rows = []
+    for r in range(len(params)):
+        lo, hi = offsets[r], offsets[r + 1]
+        rows.append(_summary_stats(win[lo:hi], pnl_pct[lo:hi], capital_after[lo:hi],
+                                   float(end_capital[r]), start_capital))
+    return pd.DataFrame(rows, columns=_STAT_COLUMNS)
+
+
+# Spalten von run_backtest_batch() (Kennzahlen aus run_backtest())
+_STAT_COLUMNS = ['total_trades', 'wins', 'losses', 'win_rate', 'total_pnl_pct',
+                 'total_pnl_usdt', 'max_drawdown', 'best_trade', 'worst_trade', 'end_capital']
+
+
+def _backtest_params(signal_config: dict, risk_config: dict) -> dict:
+    """Liest Signal- und Risiko-Parameter mit den Backtest-Defaults aus."""
+    return {
+        'risk_per_trade_pct': float(signal_config.get('risk_per_trade_pct',
+                                    risk_config.get('risk_per_trade_pct', 1.0))),
+        'leverage':           int(signal_config.get('leverage', risk_config.get('leverage', 1))),
+        'fee_rate':           float(risk_config.get('fee_rate_pct',       0.06)) / 100.0,
+        'slippage_pct':       float(risk_config.get('entry_slippage_pct', 0.15)),
+        'min_notional_usdt':  float(risk_config.get('min_notional_usdt',  5.0)),
+
+        # --- Signal-Parameter ---
+        'entropy_window':     int(signal_config.get('entropy_window',       20)),
+        'entropy_lookback':   int(signal_config.get('entropy_lookback',     10)),
+        'energy_lookback':    int(signal_config.get('energy_lookback',       5)),
+        'min_entropy_drop':   float(signal_config.get('min_entropy_drop_pct', 0.05)),
+        'min_energy_rise':    float(signal_config.get('min_energy_rise_pct',  0.20)),
+        'atr_period':         int(signal_config.get('atr_period',            14)),
+        'atr_sl_mult':        float(signal_config.get('atr_sl_mult',          1.5)),
+        'atr_tp_mult':        float(signal_config.get('atr_tp_mult',          3.0)),
+        'use_regime_filter':  bool(int(signal_config.get('use_regime_filter',   1))),
+        'regime_window':      int(signal_config.get('regime_window',          20)),
+        'allow_range_trade':  bool(int(signal_config.get('allow_range_trade',   0))),
+        'use_multitf_filter': bool(int(signal_config.get('use_multitf_filter',  0))),
+        'meso_tf_mult':       int(signal_config.get('meso_tf_mult',            4)),
+        'macro_tf_mult':      int(signal_config.get('macro_tf_mult',           16)),
+    }
+
+
+def _entry_stage(df: pd.DataFrame, p: dict, cache, key: str, entropy_cube: dict) -> tuple:
+    """
+    Stufe 1: Features und Entry-Maske fuer die Parameter p.
+
+    Haengt nur von Indikator-/Filter-Parametern ab und wird zwischen Trials
+    ueber den Feature-Cache wiederverwendet - inkl. der einzelnen
+    Teilbedingungen (Entropy, Energie, Regime, MTF).
+
+    Returns (close, atr, entry_side)
+    """
+    close, velocity, acc, energy = _cached(cache, ('base', key), lambda: _base_features(df))
+    atr = _cached(cache, ('atr', key, p['atr_period']),
+                  lambda: _frozen(calc_atr(df, period=p['atr_period'])))
+    cube_entropy = _entropy_cube_row(entropy_cube, key, p['entropy_window'])
+    entropy_src  = 'cube' if cube_entropy is not None else 'exact'
+
+    def entropy_ok():
+        entropy = cube_entropy
+        if entropy is None:
+            entropy = _cached(cache, ('entropy', key, p['entropy_window']),
+                              lambda: _frozen(calc_rolling_entropy(calc_log_returns(df['close']),
+                                                                   window=p['entropy_window'])))
+        return _frozen(_lookback_change_ok(entropy, p['entropy_lookback'],
+                                           p['min_entropy_drop'], falling=True))
+
+    def regime_ok():
+        regimes = _cached(cache, ('regime', key, p['regime_window']),
+                          lambda: _frozen(classify_phase_regime_series(
+                              pd.Series(velocity), pd.Series(acc), window=p['regime_window'])))
+        return _frozen(_regime_ok(regimes, p['allow_range_trade']))
+
+    def entry_side():
+        masks = [
+            _cached(cache, ('base_ok', key, p['atr_period']),
+                    lambda: _frozen(_base_ok(close, acc, atr))),
+            _cached(cache, ('entropy_ok', key, entropy_src, p['entropy_window'],
+                            p['entropy_lookback'], p['min_entropy_drop']), entropy_ok),
+            _cached(cache, ('energy_ok', key, p['energy_lookback'], p['min_energy_rise']),
+                    lambda: _frozen(_lookback_change_ok(energy, p['energy_lookback'],
+                                                        p['min_energy_rise'], falling=False))),
+        ]
+        if p['use_regime_filter']:
+            masks.append(_cached(cache, ('regime_ok', key, p['regime_window'],
+                                         p['allow_range_trade']), regime_ok))
+        # MTF pro Kerze auf denselben Fenstern wie frueher df.iloc[i-MIN_CANDLES:i+1]
+        mtf_aligned = mtf_direction = None
+        if p['use_multitf_filter']:
+            mtf_aligned, mtf_direction = _cached(
+                cache, ('mtf', key, p['meso_tf_mult'], p['macro_tf_mult']),
+                lambda: _mtf_features(df, p['meso_tf_mult'], p['macro_tf_mult']))
+        return _frozen(_combine_entry_sides(acc, masks, mtf_aligned, mtf_direction))
+
+    entry_key = ('entry', key, entropy_src, p['entropy_window'], p['entropy_lookback'],
+                 p['min_entropy_drop'], p['energy_lookback'], p['min_energy_rise'], p['atr_period'],
+                 (p['regime_window'], p['allow_range_trade']) if p['use_regime_filter'] else None,
+                 (p['meso_tf_mult'], p['macro_tf_mult']) if p['use_multitf_filter'] else None)
+    return close, atr, _cached(cache, entry_key, entry_side)
+
+
+def _exit_arrays(df: pd.DataFrame, cache, key: str) -> tuple:
+    """High/Low als float64 und der (gecachte) Exit-Index fuer Stufe 2."""
+    high = df['high'].to_numpy(dtype=np.float64)
+    low  = df['low'].to_numpy(dtype=np.float64)
+    exit_index = _cached(cache, ('exit_index', key), lambda: _frozen_tuple(build_exit_index(high, low)))
+    return high, low, exit_index
+
+
+def build_entropy_cube(df: pd.DataFrame, windows, bins: int = 10) -> dict:
+    """
+    Entropy fuer alle Fenstergroessen (z.B. range(10, 61)) als float32-Matrix.
+
+    Wird einmal pro Symbol/Timeframe berechnet; run_backtest(entropy_cube=...)
+    liest die Entropy dann als Zeile statt sie neu zu berechnen. Die Werte
+    sind auf float32 gerundet (Live-Signal rechnet mit float64).
+
+    Returns dict: dataset (Hash), windows (int64-Array), values (float32-Matrix)
+    """
+    windows = np.asarray(list(windows), dtype=np.int64)
+    values  = calc_entropy_cube(calc_log_returns(df['close']), windows, bins=bins)
+    values.setflags(write=False)
+    return {'dataset': dataset_hash(df), 'windows': windows, 'values': values}
+
+
+def save_entropy_cube(path: str, cube: dict):
+    """Speichert den Entropy-Cube als .npz (unkomprimiert, schnell ladbar)."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.tmp.npz'
+    np.savez(tmp_path, dataset=np.array(cube['dataset']),
+             windows=cube['windows'], values=cube['values'])
+    os.replace(tmp_path, path)
+
+
+def load_entropy_cube(path: str):
+    """Laedt einen mit save_entropy_cube() gespeicherten Cube (None wenn nicht lesbar)."""
+    try:
+        with np.load(path) as data:
+            values = data['values']
+            values.setflags(write=False)
+            return {'dataset': str(data['dataset']), 'windows': data['windows'], 'values': values}
+    except Exception as e:
+        logger.warning(f"Entropy-Cube {path} nicht lesbar: {e}")
+        return None
+
+
+def _entropy_cube_row(cube: dict, key: str, window: int):
+    """Zeile fuer window aus dem Cube, oder None wenn Cube/Datensatz/Fenster nicht passen."""
+    if cube is None or cube['dataset'] != key:
+        return None
+    rows = np.flatnonzero(cube['windows'] == window)
+    if len(rows) == 0:
+        return None
+    return cube['values'][rows[0]]
+
+
+def build_entry_sides(close: np.ndarray, entropy: np.ndarray, energy: np.ndarray,
+                      acc: np.ndarray, atr: np.ndarray,
+                      entropy_lookback: int, energy_lookback: int,
+                      min_entropy_drop: float, min_energy_rise: float,
+                      regimes: np.ndarray = None, allow_range_trade: bool = False,
+                      mtf_aligned: np.ndarray = None,
+                      mtf_direction: np.ndarray = None) -> np.ndarray:
+    """
+    Vorberechnete Entry-Maske: +1 (Long), -1 (Short), 0 (kein Entry) pro Kerze.
+
+    Enthaelt alle zustandsunabhaengigen MERS-Bedingungen (Layer 1-3).
+    Der Min-Notional-Check haengt vom Kapital ab und bleibt in simulate_trades().
+    Kerzen vor MIN_CANDLES sind immer 0.
+    """
+    masks = [
+        _base_ok(close, acc, atr),
+        _lookback_change_ok(entropy, entropy_lookback, min_entropy_drop, falling=True),
+        _lookback_change_ok(energy, energy_lookback, min_energy_rise, falling=False),
+    ]
+    if regimes is not None:
+        masks.append(_regime_ok(regimes, allow_range_trade))
+    return _combine_entry_sides(acc, masks, mtf_aligned, mtf_direction)
+
+
+def _base_ok(close: np.ndarray, acc: np.ndarray, atr: np.ndarray) -> np.ndarray:
+    """Gueltige Kerzen: Beschleunigung und ATR definiert, ATR > 0, Preis > 0."""
+    with np.errstate(invalid='ignore'):
+        return ~(np.isnan(acc) | np.isnan(atr)) & (atr > 0) & (close > 0)
+
+
+def _lookback_change_ok(values: np.ndarray, lookback: int, min_change: float,
+                        falling: bool) -> np.ndarray:
+    """
+    Layer 1: relative Aenderung gegenueber values[i - lookback].
+    falling=True  -> Entropy-Abfall (prev - cur) / prev >= min_change
+    falling=False -> Energie-Anstieg (cur - prev) / prev >= min_change
+    """
+    n = len(values)
+    prev = np.full(n, np.nan)
+    prev[lookback:] = values[:n - lookback]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        ok = ~(np.isnan(values) | np.isnan(prev)) & (prev > 0)
+        change = (prev - values) / prev if falling else (values - prev) / prev
+        ok &= ~(change < min_change)
+    return ok
+
+
+def _regime_ok(regimes: np.ndarray, allow_range_trade: bool) -> np.ndarray:
+    """Layer 2: kein Chaos, Range nur wenn erlaubt."""
+    ok = regimes != REGIME_CHAOS
+    if not allow_range_trade:
+        ok &= regimes != REGIME_RANGE
+    return ok
+
+
+def _combine_entry_sides(acc: np.ndarray, masks: list, mtf_aligned: np.ndarray = None,
+                         mtf_direction: np.ndarray = None) -> np.ndarray:
+    """Richtung via Beschleunigung, gefiltert durch alle Teilbedingungen und MTF."""
+    side = np.where(acc > 0, 1, np.where(acc < 0, -1, 0)).astype(np.int8)
+    for ok in masks:
+        side[~ok] = 0
+
+    # --- Layer 3: Multi-Timeframe (optional) ---
+    if mtf_aligned is not None:
+        side[~mtf_aligned] = 0
+        side[(side > 0) & (mtf_direction < 0)] = 0
+        side[(side < 0) & (mtf_direction > 0)] = 0
+
+    side[:MIN_CANDLES] = 0
+    return side
+
+
+def simulate_trades(high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                    atr: np.ndarray, entry_side: np.ndarray,
+                    atr_sl_mult: float, atr_tp_mult: float,
+                    start_capital: float, risk_per_trade_pct: float,
+                    fee_rate: float, slippage_pct: float,
+                    min_notional_usdt: float,
+                    timestamps: np.ndarray = None,
+                    exit_index: tuple = None) -> dict:
+    """
+    Trade-Simulation auf reinen NumPy-Arrays.
+
+    Springt von Entry-Kandidat zu Entry-Kandidat; ein offener Trade wird ab
+    der Folgekerze per High/Low auf SL/TP geprueft (SL-Prioritaet bei
+    gleicher Kerze). Auf der Exit-Kerze wird kein neuer Entry geprueft, ein
+    am Ende noch offener Trade wird verworfen.
+
+    timestamps (optional, int64) werden als entry_ts/exit_ts mitgegeben.
+    exit_index (optional, siehe build_exit_index) wird sonst hier erzeugt;
+    der Exit wird damit in O(log N) statt Kerze fuer Kerze gefunden.
+
+    Returns dict mit gleich langen Arrays (ein Eintrag pro Trade):
+      entry_idx, exit_idx, side (+1/-1), entry_price, sl_price, tp_price,
+      atr, exit_price, win, pnl_usdt, pnl_pct, capital_after
+    sowie end_capital (float).
+
+    Mit aktivem Numba-Backend (siehe mbot.utils.jit) laeuft die Schleife
+    kompiliert (_simulate_trades_jit), Ergebnis identisch.
+    """
+    if exit_index is None:
+        exit_index = build_exit_index(high, low)
+    min_low, max_high = exit_index
+    args = (high, low, min_low, max_high, close, atr, entry_side, atr_sl_mult, atr_tp_mult,
+            float(start_capital), risk_per_trade_pct, fee_rate, slippage_pct, min_notional_usdt)
+    if NUMBA_ENABLED:
+        *columns, capital = _simulate_trades_jit(*args)
+    else:
+        columns, capital = _simulate_trades_numpy(*args)
+
+    result = {
+        'entry_idx':     np.array(columns[0], dtype=np.int64),
+        'exit_idx':      np.array(columns[1], dtype=np.int64),
+        'side':          np.array(columns[2], dtype=np.int8),
+        'entry_price':   np.array(columns[3], dtype=np.float64),
+        'sl_price':      np.array(columns[4], dtype=np.float64),
+        'tp_price':      np.array(columns[5], dtype=np.float64),
+        'atr':           np.array(columns[6], dtype=np.float64),
+        'exit_price':    np.array(columns[7], dtype=np.float64),
+        'win':           np.array(columns[8], dtype=bool),
+        'pnl_usdt':      np.array(columns[9], dtype=np.float64),
+        'pnl_pct':       np.array(columns[10], dtype=np.float64),
+        'capital_after': np.array(columns[11], dtype=np.float64),
+        'end_capital':   capital,
+    }
+    if timestamps is not None:
+        result['entry_ts'] = timestamps[result['entry_idx']]
+        result['exit_ts']  = timestamps[result['exit_idx']]
+    return result
+
+
+def _simulate_trades_numpy(high, low, min_low, max_high, close, atr, entry_side,
+                           atr_sl_mult, atr_tp_mult,
+                           start_capital, risk_per_trade_pct, fee_rate, slippage_pct,
+                           min_notional_usdt):
+    """NumPy-Pfad von simulate_trades(): Returns (12 Spalten, end_capital)."""
+    candidates = np.flatnonzero(entry_side)
+    capital    = start_capital
+    rows       = []
+
+    c = 0
+    while c < len(candidates):
+        i    = int(candidates[c])
+        side = int(entry_side[i])
+        c   += 1
 
         # --- Slippage auf Entry-Preis (Market Order Realismus) ---
-        if side == 'long':
+        cur_atr     = atr[i]
+        entry_price = float(close[i])
+        if side > 0:
             entry_price = entry_price * (1.0 + slippage_pct / 100.0)
+            sl_price    = entry_price - atr_sl_mult * cur_atr
+            tp_price    = entry_price + atr_tp_mult * cur_atr
         else:
             entry_price = entry_price * (1.0 - slippage_pct / 100.0)
+            sl_price    = entry_price + atr_sl_mult * cur_atr
+            tp_price    = entry_price - atr_tp_mult * cur_atr
+
+        # --- Min-Notional Check (wie Live Bot) ---
+        sl_dist         = abs(entry_price - sl_price)
+        contracts_check = capital * risk_per_trade_pct / 100.0 / sl_dist if sl_dist > 0 else 0.0
+        if contracts_check * entry_price < min_notional_usdt:
+            continue
+
+        # --- Trade-Aufloesung (erste Kerze mit SL/TP-Treffer) ---
+        if side > 0:
+            k = _find_exit(high, low, min_low, max_high, i + 1, sl_price, tp_price)
+        else:
+            k = _find_exit(high, low, min_low, max_high, i + 1, tp_price, sl_price)
+        if k < 0:
+            break
+        if side > 0:
+            hit_sl = low[k] <= sl_price
+        else:
+            hit_sl = high[k] >= sl_price
+        # Bei gleicher Kerze: SL-Prioritaet (konservativ)
+        exit_price = sl_price if hit_sl else tp_price
 
-        # --- SL/TP berechnen (ATR-basiert, vom geslippten Entry) ---
-        if side == 'long':
-            sl_price_abs = entry_price - atr_sl_mult * cur_atr
-            tp_price_abs = entry_price + atr_tp_mult * cur_atr
+        # Risiko-basierte Positionsgroesse (wie dnabot)
+        risk_amount   = capital * risk_per_trade_pct / 100.0
+        pos_contracts = risk_amount / sl_dist if sl_dist > 0 else 0.0
+        if side > 0:
+            pnl_usdt = pos_contracts * (exit_price - entry_price)
         else:
-            sl_price_abs = entry_price + atr_sl_mult * cur_atr
-            tp_price_abs = entry_price - atr_tp_mult * cur_atr
+            pnl_usdt = pos_contracts * (entry_price - exit_price)
 
-        # --- Min-Notional Check (wie Live Bot) ---
-        sl_dist = abs(entry_price - sl_price_abs)
-        risk_amount_check = capital * risk_per_trade_pct / 100.0
-        contracts_check = risk_amount_check / sl_dist if sl_dist > 0 else 0.0
+        # Handelsgebuehren (Entry + Exit Notional x fee_rate pro Leg)
+        pnl_usdt -= pos_contracts * (entry_price + exit_price) * fee_rate
+        pnl_pct   = pnl_usdt / capital * 100 if capital > 0 else 0.0
+        capital   = max(capital + pnl_usdt, 0.0)
+
+        rows.append((i, k, side, entry_price, sl_price, tp_price, cur_atr,
+                     exit_price, not hit_sl, pnl_usdt, pnl_pct, capital))
+
+        # Naechster Entry fruehestens nach der Exit-Kerze
+        c = int(np.searchsorted(candidates, k + 1))
+
+    columns = list(zip(*rows)) if rows else [()] * 12
+    return columns, capital
+
+
+@njit
+def _simulate_trades_jit(high, low, min_low, max_high, close, atr, entry_side,
+                         atr_sl_mult, atr_tp_mult,
+                         start_capital, risk_per_trade_pct, fee_rate, slippage_pct,
+                         min_notional_usdt):
+    """
+    Kompilierter Pfad von simulate_trades() (Numba-Backend).
+    Gleiche Formeln und Reihenfolge wie _simulate_trades_numpy.
+    """
+    candidates = np.flatnonzero(entry_side)
+    m          = len(candidates)
+    entry_idx  = np.empty(m, dtype=np.int64)
+    exit_idx   = np.empty(m, dtype=np.int64)
+    sides      = np.empty(m, dtype=np.int8)
+    entry_arr  = np.empty(m)
+    sl_arr     = np.empty(m)
+    tp_arr     = np.empty(m)
+    atr_arr    = np.empty(m)
+    exit_arr   = np.empty(m)
+    win_arr    = np.empty(m, dtype=np.bool_)
+    pnl_arr    = np.empty(m)
+    pct_arr    = np.empty(m)
+    cap_arr    = np.empty(m)
+
+    capital  = start_capital
+    n_trades = 0
+    c        = 0
+    while c < m:
+        i    = candidates[c]
+        side = entry_side[i]
+        c   += 1
+
+        cur_atr     = atr[i]
+        entry_price = close[i]
+        if side > 0:
+            entry_price = entry_price * (1.0 + slippage_pct / 100.0)
+            sl_price    = entry_price - atr_sl_mult * cur_atr
+            tp_price    = entry_price + atr_tp_mult * cur_atr
+        else:
+            entry_price = entry_price * (1.0 - slippage_pct / 100.0)
+            sl_price    = entry_price + atr_sl_mult * cur_atr
+            tp_price    = entry_price - atr_tp_mult * cur_atr
+
+        sl_dist         = abs(entry_price - sl_price)
+        contracts_check = capital * risk_per_trade_pct / 100.0 / sl_dist if sl_dist > 0 else 0.0
         if contracts_check * entry_price < min_notional_usdt:
             continue
 
-        idx = df.index[i]
-        entry_time = idx.isoformat() if hasattr(idx, 'isoformat') else str(idx)
-        in_trade = True
-        trade = {
-            'symbol':      symbol,
-            'side':        side,
-            'entry_time':  entry_time,
-            'entry_price': entry_price,
-            'sl_price':    sl_price_abs,
-            'tp_price':    tp_price_abs,
-            'atr':         round(cur_atr, 6),
-        }
-
-    # --- Statistiken ---
-    if not trades:
+        if side > 0:
+            k = _first_passage(min_low, max_high, i + 1, sl_price, tp_price)
+        else:
+            k = _first_passage(min_low, max_high, i + 1, tp_price, sl_price)
+        if k < 0:
+            break
+        if side > 0:
+            hit_sl = low[k] <= sl_price
+        else:
+            hit_sl = high[k] >= sl_price
+        exit_price = sl_price if hit_sl else tp_price
+
+        risk_amount   = capital * risk_per_trade_pct / 100.0
+        pos_contracts = risk_amount / sl_dist if sl_dist > 0 else 0.0
+        if side > 0:
+            pnl_usdt = pos_contracts * (exit_price - entry_price)
+        else:
+            pnl_usdt = pos_contracts * (entry_price - exit_price)
+        pnl_usdt -= pos_contracts * (entry_price + exit_price) * fee_rate
+        pnl_pct   = pnl_usdt / capital * 100 if capital > 0 else 0.0
+        capital   = max(capital + pnl_usdt, 0.0)
+
+        entry_idx[n_trades] = i
+        exit_idx[n_trades]  = k
+        sides[n_trades]     = side
+        entry_arr[n_trades] = entry_price
+        sl_arr[n_trades]    = sl_price
+        tp_arr[n_trades]    = tp_price
+        atr_arr[n_trades]   = cur_atr
+        exit_arr[n_trades]  = exit_price
+        win_arr[n_trades]   = not hit_sl
+        pnl_arr[n_trades]   = pnl_usdt
+        pct_arr[n_trades]   = pnl_pct
+        cap_arr[n_trades]   = capital
+        n_trades += 1
+
+        c = np.searchsorted(candidates, k + 1)
+
+    t = n_trades
+    return (entry_idx[:t], exit_idx[:t], sides[:t], entry_arr[:t], sl_arr[:t], tp_arr[:t],
+            atr_arr[:t], exit_arr[:t], win_arr[:t], pnl_arr[:t], pct_arr[:t], cap_arr[:t],
+            capital)
+
+
+def _simulate_batch_numpy(high, low, min_low, max_high, close, atr_matrix, atr_row,
+                          entry_sides, sl_mults, tp_mults, start_capital, risks, fees,
+                          slips, notional):
+    """NumPy-Pfad von run_backtest_batch(): simulate_trades() pro Config."""
+    offsets = np.zeros(len(entry_sides) + 1, dtype=np.int64)
+    win, pnl_pct, capital_after = [], [], []
+    end_capital = np.empty(len(entry_sides))
+    for r in range(len(entry_sides)):
+        columns, end_capital[r] = _simulate_trades_numpy(
+            high, low, min_low, max_high, close, atr_matrix[atr_row[r]], entry_sides[r],
+            sl_mults[r], tp_mults[r], start_capital, risks[r], fees[r], slips[r], notional[r])
+        if columns[0]:
+            win.extend(columns[8])
+            pnl_pct.extend(columns[10])
+            capital_after.extend(columns[11])
+        offsets[r + 1] = len(win)
+    return (offsets, np.array(win, dtype=bool), np.array(pnl_pct, dtype=np.float64),
+            np.array(capital_after, dtype=np.float64), end_capital)
+
+
+@njit
+def _simulate_batch_jit(high, low, min_low, max_high, close, atr_matrix, atr_row,
+                        entry_sides, sl_mults, tp_mults, start_capital, risks, fees,
+                        slips, notional):
+    """
+    Kompilierter Pfad von run_backtest_batch(): alle Configs in einem Aufruf.
+    Returns (offsets, win, pnl_pct, capital_after, end_capital); die Trades
+    von Config r liegen in [offsets[r], offsets[r + 1]).
+    """
+    k_configs   = entry_sides.shape[0]
+    offsets     = np.zeros(k_configs + 1, dtype=np.int64)
+    end_capital = np.empty(k_configs)
+    size          = 1024
+    win           = np.empty(size, dtype=np.bool_)
+    pnl_pct       = np.empty(size)
+    capital_after = np.empty(size)
+    total = 0
+    for r in range(k_configs):
+        res = _simulate_trades_jit(high, low, min_low, max_high, close, atr_matrix[atr_row[r]],
+                                   entry_sides[r], sl_mults[r], tp_mults[r], start_capital,
+                                   risks[r], fees[r], slips[r], notional[r])
+        n_trades = len(res[0])
+        if total + n_trades > size:
+            while total + n_trades > size:
+                size *= 2
+            new_win = np.empty(size, dtype=np.bool_)
+            new_pct = np.empty(size)
+            new_cap = np.empty(size)
+            new_win[:total] = win[:total]
+            new_pct[:total] = pnl_pct[:total]
+            new_cap[:total] = capital_after[:total]
+            win, pnl_pct, capital_after = new_win, new_pct, new_cap
+        win[total:total + n_trades]           = res[8]
+        pnl_pct[total:total + n_trades]       = res[10]
+        capital_after[total:total + n_trades] = res[11]
+        total += n_trades
+        offsets[r + 1]  = total
+        end_capital[r] = res[12]
+    return offsets, win[:total], pnl_pct[:total], capital_after[:total], end_capital
+
+
+def build_exit_index(high: np.ndarray, low: np.ndarray) -> tuple:
+    """
+    Sparse Table fuer Bereichs-Min (low) und Bereichs-Max (high).
+
+    Zeile j enthaelt Min/Max ueber [p, p + 2^j); Positionen, deren Bereich
+    ueber das Datenende hinausgeht, sind NaN. NaN-Kerzen werden ignoriert
+    (fmin/fmax), wie in der linearen Suche, wo NaN nie SL/TP ausloest.
+
+    Returns (min_low, max_high), je float64 (Ebenen x Kerzen)
+    """
+    n      = len(high)
+    levels = max(1, int(n).bit_length())
+    min_low  = np.full((levels, n), np.nan)
+    max_high = np.full((levels, n), np.nan)
+    min_low[0]  = low
+    max_high[0] = high
+    for j in range(1, levels):
+        half = 1 << (j - 1)
+        m    = n - (1 << j) + 1
+        if m <= 0:
+            break
+        min_low[j, :m]  = np.fmin(min_low[j - 1, :m],  min_low[j - 1, half:half + m])
+        max_high[j, :m] = np.fmax(max_high[j - 1, :m], max_high[j - 1, half:half + m])
+    return min_low, max_high
+
+
+@njit
+def _first_passage(min_low, max_high, start, low_level, high_level):
+    """
+    Erste Kerze ab start mit low <= low_level oder high >= high_level (-1 wenn keine).
+
+    Galoppierende Suche ueber die Sparse-Table-Ebenen: Bloecke der Groesse
+    1, 2, 4, ... ueberspringen bis ein Block einen Treffer enthaelt, dann
+    absteigend eingrenzen. O(log L) fuer einen Trade ueber L Kerzen.
+    """
+    n      = min_low.shape[1]
+    levels = min_low.shape[0]
+    p = start
+    j = 0
+    while (j < levels and p + (1 << j) <= n
+           and not (min_low[j, p] <= low_level) and not (max_high[j, p] >= high_level)):
+        p += 1 << j
+        j += 1
+    for j in range(min(j, levels) - 1, -1, -1):
+        size = 1 << j
+        if p + size <= n and not (min_low[j, p] <= low_level) and not (max_high[j, p] >= high_level):
+            p += size
+    return p if p < n else -1
+
+
+# Kerzen, die _find_exit vor der Sparse-Table-Suche linear prueft
+_EXIT_SCAN = 32
+
+
+def _find_exit(high, low, min_low, max_high, start: int,
+               low_level: float, high_level: float) -> int:
+    """
+    NumPy-Pfad: die ersten _EXIT_SCAN Kerzen vektorisiert pruefen (kurze
+    Trades), danach Sparse-Table-Suche via _first_passage().
+    """
+    end = min(len(high), start + _EXIT_SCAN)
+    hit = (low[start:end] <= low_level) | (high[start:end] >= high_level)
+    if hit.any():
+        return start + int(hit.argmax())
+    return _first_passage(min_low, max_high, end, low_level, high_level)
+
+
+def _report_to_trial(trial, sim: dict, n_bars: int, start_capital: float):
+    """
+    Optuna Pruning: Zwischenstand an 8 Checkpoints (12.5/25/.../100% der Kerzen).
+    Gemeldet wird das Kapital vor der Checkpoint-Kerze, also nach allen
+    Exits auf frueheren Kerzen.
+    """
+    total_steps      = n_bars - MIN_CANDLES
+    checkpoint_every = max(1, total_steps // 8)
+    exit_idx         = sim['exit_idx']
+    capital_after    = sim['capital_after']
+
+    for step in range(1, total_steps // checkpoint_every + 1):
+        i = MIN_CANDLES + step * checkpoint_every
+        if i >= n_bars:
+            break
+        n_closed   = int(np.searchsorted(exit_idx, i))
+        capital    = capital_after[n_closed - 1] if n_closed else start_capital
+        pnl_so_far = (capital - start_capital) / start_capital * 100 if start_capital > 0 else 0.0
+        trial.report(pnl_so_far, step)
+        if trial.should_prune():
+            import optuna
+            raise optuna.exceptions.TrialPruned()
+
+
+def _build_result(df: pd.DataFrame, sim: dict, symbol: str, start_capital: float,
+                  risk_per_trade_pct: float, leverage: int) -> dict:
+    """Baut das Ergebnis-Dict (inkl. Trade-Liste) aus den Trade-Arrays."""
+    if len(sim['entry_idx']) == 0:
         return _empty_result(symbol, start_capital)
 
-    wins   = sum(1 for t in trades if t['result'] == 'win')
-    losses = len(trades) - wins
-    pnls   = [t['pnl_pct'] for t in trades]
+    index  = df.index
+    trades = []
+    for t in range(len(sim['entry_idx'])):
+        entry_ts = index[sim['entry_idx'][t]]
+        exit_ts  = index[sim['exit_idx'][t]]
+        trades.append({
+            'symbol':             symbol,
+            'side':               'long' if sim['side'][t] > 0 else 'short',
+            'entry_time':         entry_ts.isoformat() if hasattr(entry_ts, 'isoformat') else str(entry_ts),
+            'entry_price':        float(sim['entry_price'][t]),
+            'sl_price':           float(sim['sl_price'][t]),
+            'tp_price':           float(sim['tp_price'][t]),
+            'atr':                round(float(sim['atr'][t]), 6),
+            'exit_price':         float(sim['exit_price'][t]),
+            'exit_time':          exit_ts.isoformat() if hasattr(exit_ts, 'isoformat') else str(exit_ts),
+            'result':             'win' if sim['win'][t] else 'loss',
+            'pnl_pct':            round(float(sim['pnl_pct'][t]), 2),
+            'pnl_usdt':           round(float(sim['pnl_usdt'][t]), 2),
+            'capital_after':      round(float(sim['capital_after'][t]), 2),
+            'risk_per_trade_pct': risk_per_trade_pct,
+            'leverage':           leverage,
+        })
+
+    stats = _summary_stats(sim['win'], sim['pnl_pct'], sim['capital_after'],
+                           sim['end_capital'], start_capital)
+    return {
+        'symbol':        symbol,
+        'trades':        trades,
+        **{k: stats[k] for k in _STAT_COLUMNS if k != 'end_capital'},
+        'start_capital': start_capital,
+        'end_capital':   stats['end_capital'],
+    }
+
+
+def _summary_stats(win: np.ndarray, pnl_pct: np.ndarray, capital_after: np.ndarray,
+                   end_capital: float, start_capital: float) -> dict:
+    """Kennzahlen aus den Trade-Arrays (gerundet wie die Trade-Liste)."""
+    if len(win) == 0:
+        empty = _empty_result('', start_capital)
+        return {k: empty[k] for k in _STAT_COLUMNS}
+
+    wins   = int(np.count_nonzero(win))
+    pnls   = [round(float(x), 2) for x in pnl_pct]
 
     # Drawdown
-    cap_curve = [start_capital] + [t['capital_after'] for t in trades]
+    cap_curve = [start_capital] + [round(float(x), 2) for x in capital_after]
     peak  = cap_curve[0]
     max_dd = 0.0
     for c in cap_curve:
@@ -342,23 +1066,20 @@ def run_backtest(df: pd.DataFrame, signal_config: dict, risk_config: dict,
         if dd > max_dd:
             max_dd = dd
 
-    total_pnl_usdt = capital - start_capital
+    total_pnl_usdt = end_capital - start_capital
     total_pnl_pct  = total_pnl_usdt / start_capital * 100 if start_capital > 0 else 0.0
 
     return {
-        'symbol':         symbol,
-        'trades':         trades,
-        'total_trades':   len(trades),
+        'total_trades':   len(pnls),
         'wins':           wins,
-        'losses':         losses,
-        'win_rate':       round(wins / len(trades) * 100, 1),
+        'losses':         len(pnls) - wins,
+        'win_rate':       round(wins / len(pnls) * 100, 1),
         'total_pnl_pct':  round(total_pnl_pct, 2),
         'total_pnl_usdt': round(total_pnl_usdt, 2),
         'max_drawdown':   round(max_dd, 2),
         'best_trade':     round(max(pnls), 2),
         'worst_trade':    round(min(pnls), 2),
-        'start_capital':  start_capital,
-        'end_capital':    round(capital, 2),
+        'end_capital':    round(end_capital, 2),
     }
 
 
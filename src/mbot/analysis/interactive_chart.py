@@ -61,6 +61,7 @@ def _compute_mers_panels(df, signal_config: dict):
         calc_log_returns, calc_rolling_entropy,
         calc_velocity, calc_acceleration, calc_energy, calc_atr,
     )
+    from mbot.strategy.mdef_analysis import classify_phase_regime_series, REGIME_NAMES
     price    = df['close']
     returns  = calc_log_returns(price)
     entropy  = calc_rolling_entropy(returns, window=signal_config.get('entropy_window', 18))
@@ -70,25 +71,8 @@ def _compute_mers_panels(df, signal_config: dict):
     atr_ser  = calc_atr(df, period=signal_config.get('atr_period', 21))
 
     regime_window = signal_config.get('regime_window', 14)
-    regimes = []
-    for i in range(len(df)):
-        if i < regime_window:
-            regimes.append('neutral')
-            continue
-        v_win = velocity.iloc[max(0, i - regime_window):i]
-        a_win = acc.iloc[max(0, i - regime_window):i]
-        std_v = v_win.std()
-        if std_v == 0:
-            regimes.append('neutral')
-            continue
-        vel_consistency = abs(v_win.mean()) / std_v
-        chaos_ratio     = a_win.std() / std_v
-        if chaos_ratio > 1.5:
-            regimes.append('chaos')
-        elif vel_consistency > 0.3:
-            regimes.append('trend')
-        else:
-            regimes.append('range')
+    regimes = [REGIME_NAMES[int(c)]
+               for c in classify_phase_regime_series(velocity, acc, window=regime_window)]
 
     return entropy, energy, velocity, atr_ser, regimes
 
@@ -15,11 +15,30 @@ Optimierte Parameter (Signal):
   atr_period           : ATR-Periode (7-28)
   atr_sl_mult          : SL = entry +/- atr_sl_mult * ATR (0.5-3.0)
   atr_tp_mult          : TP = entry +/- atr_tp_mult * ATR (1.0-6.0, immer > atr_sl_mult)
+  use_multitf_filter   : Multi-Timeframe Filter (0/1)
+  meso_tf_mult         : Meso-Zeitskala (2-8)
+  macro_tf_mult        : Makro-Zeitskala (>= 2 * meso_tf_mult, 8-32)
 
 Fixe Parameter (vom User vorgegeben):
   risk_per_trade_pct   : Risiko pro Trade in % (0.5 - 3.0, Optuna)
   leverage             : Hebel (5 - 20, Optuna)
 
+Indikator-Features (Entropy, ATR, Regime, MTF) werden zwischen Trials im
+Feature-Cache des Backtesters wiederverwendet (--feature_cache_mb).
+Die Entropy fuer alle entropy_window-Werte wird pro Symbol/Timeframe vorab
+als float32-Cube berechnet (optional gespeichert: --persist_entropy_cube).
+Mit --batch_size > 1 werden Trials per Ask/Tell gebuendelt und mit
+run_backtest_batch() gemeinsam bewertet.
+Die Trials laufen in Worker-Prozessen: der Zustand steckt im picklebaren
+MersObjective, OHLCV-Daten und Entropy-Cube liegen in Shared Memory,
+koordiniert wird ueber artifacts/db/optuna_studies_mbot.db.
+
+Symbol/Timeframe-Tasks werden von einem TaskScheduler verteilt: Downloads
+laufen parallel zur Optimierung, alle Tasks teilen sich ein CPU-Budget
+(--cpu_budget Prozesse, max. --workers pro Task), teure Tasks (Kerzen x
+Trials) starten zuerst. Configs werden nur ueberschrieben, wenn sie besser
+sind; last_optimizer_run.json wird am Ende atomar geschrieben.
+
 Gespeicherte Config-Datei: src/mbot/strategy/configs/config_BTCUSDTUSDT_6h_mers.json
 """
 
@@ -29,29 +48,41 @@ import json
 import optuna
 import argparse
 import logging
-from datetime import datetime as _dt
+import time
+from datetime import datetime as _dt, timedelta
+
+import numpy as np
+import pandas as pd
 
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
 sys.path.append(os.path.join(PROJECT_ROOT, 'src'))
 
-from mbot.analysis.backtester import load_data, run_backtest
+from mbot.analysis.backtester import (
+    load_data,
+    run_backtest,
+    run_backtest_batch,
+    build_entropy_cube,
+    save_entropy_cube,
+    load_entropy_cube,
+    dataset_hash,
+    FEATURE_CACHE,
+)
 from mbot.utils.exchange import Exchange
+from mbot.utils.ohlcv_resample import RESAMPLE_TARGETS, RESAMPLE_BASES
+from mbot.utils.shm_arrays import SharedArrays, attach_arrays
+from mbot.utils.task_scheduler import TaskScheduler
 
 optuna.logging.set_verbosity(optuna.logging.WARNING)
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-# Globale State fuer Optuna-Objective
-HISTORICAL_DATA         = None
-CURRENT_SYMBOL          = None
-CURRENT_TIMEFRAME       = None
-RISK_CONFIG             = {}
-START_CAPITAL           = 1000.0
-MAX_DRAWDOWN_CONSTRAINT = 0.30
-MIN_WIN_RATE_CONSTRAINT = 50.0
-MIN_PNL_CONSTRAINT      = 0.0
-MIN_TRADES_CONSTRAINT   = 20
-OPTIM_MODE              = 'strict'
+# Suchraum fuer entropy_window (auch Zeilen des Entropy-Cubes)
+ENTROPY_WINDOW_MIN = 10
+ENTROPY_WINDOW_MAX = 60
+
+# Rueckblick in Tagen fuer --history_days auto (wie run_pipeline.sh)
+HISTORY_DAYS_AUTO = {'5m': 90, '15m': 90, '30m': 365, '1h': 365,
+                     '2h': 730, '4h': 730, '6h': 1095, '1d': 1095}
 
 RESULTS_FILE = os.path.join(PROJECT_ROOT, 'artifacts', 'results', 'last_optimizer_run.json')
 
@@ -60,25 +91,241 @@ def create_safe_filename(symbol: str, timeframe: str) -> str:
     return f"{symbol.replace('/', '').replace(':', '')}_{timeframe}"
 
 
-def objective(trial):
-    """Optuna-Zielfunktion: maximiert PnL% unter den konfigurierten Constraints."""
-    # --- Kern-MERS Parameter ---
-    entropy_window   = trial.suggest_int(  'entropy_window',       10,  60)
+def _prepare_entropy_cube(df, db_dir: str, safe_name: str, persist: bool) -> dict:
+    """
+    Entropy-Cube fuer alle entropy_window-Werte des Suchraums.
+    Mit persist wird er als artifacts/db/entropy_cube_<name>_<hash>.npz
+    neben der Optuna-DB abgelegt und bei gleichem Datensatz wiedergeladen.
+    """
+    windows   = range(ENTROPY_WINDOW_MIN, ENTROPY_WINDOW_MAX + 1)
+    cube_file = os.path.join(db_dir, f'entropy_cube_{safe_name}_{dataset_hash(df)[:16]}.npz')
+    if persist and os.path.exists(cube_file):
+        cube = load_entropy_cube(cube_file)
+        if cube is not None and list(cube['windows']) == list(windows):
+            print(f"  Entropy-Cube geladen: {os.path.basename(cube_file)}")
+            return cube
+
+    t0   = time.time()
+    cube = build_entropy_cube(df, windows)
+    print(f"  Entropy-Cube berechnet: {len(windows)} Fenster x {len(df)} Kerzen "
+          f"({cube['values'].nbytes / 1024 / 1024:.1f} MB) in {time.time() - t0:.1f}s")
+    if persist:
+        save_entropy_cube(cube_file, cube)
+    return cube
+
+
+def _make_pruner():
+    return optuna.pruners.MedianPruner(n_startup_trials=20, n_warmup_steps=1)
+
+
+class MersObjective:
+    """
+    Optuna-Zielfunktion fuer ein Symbol/Timeframe-Paar: maximiert PnL%
+    unter den konfigurierten Constraints.
+
+    Haelt den gesamten Zustand (Datensatz, Risiko-Config, Constraints,
+    Entropy-Cube) und ist picklebar. Nach share() liegen OHLCV-Daten und
+    Cube in Shared Memory; an Worker-Prozesse wird dann nur der kleine
+    Deskriptor uebertragen, die Worker haengen sich beim ersten Zugriff an.
+    """
+
+    def __init__(self, df: pd.DataFrame, symbol: str, risk_config: dict,
+                 start_capital: float = 1000.0, mode: str = 'strict',
+                 max_drawdown: float = 0.30, min_win_rate: float = 50.0,
+                 min_pnl: float = 0.0, min_trades: int = 20,
+                 entropy_cube: dict = None):
+        self.symbol        = symbol
+        self.risk_config   = risk_config
+        self.start_capital = start_capital
+        self.mode          = mode
+        self.max_drawdown  = max_drawdown
+        self.min_win_rate  = min_win_rate
+        self.min_pnl       = min_pnl
+        self.min_trades    = min_trades
+        self._df           = df
+        self._cube         = entropy_cube
+        self._shared       = None
+        self._shared_meta  = None
+        self._descriptor   = None
+        self._handles      = None
+
+    # --- Shared Memory ---
+
+    def share(self):
+        """Legt OHLCV-Daten und Entropy-Cube in Shared Memory ab (Eigentuemer-Prozess)."""
+        if self._shared is not None:
+            return
+        df     = self._df
+        arrays = {
+            'ohlcv': np.ascontiguousarray(df.to_numpy(dtype=np.float64).T),
+            'index': df.index.values,
+        }
+        meta = {'columns': list(df.columns), 'index_name': df.index.name,
+                'tz': str(df.index.tz) if getattr(df.index, 'tz', None) is not None else None,
+                'cube_dataset': None}
+        if self._cube is not None:
+            arrays['cube_values']  = self._cube['values']
+            arrays['cube_windows'] = self._cube['windows']
+            meta['cube_dataset']   = self._cube['dataset']
+        self._shared      = SharedArrays.create(arrays)
+        self._shared_meta = meta
+
+    def release(self):
+        """Gibt den Shared Memory frei (nach Ende aller Worker)."""
+        if self._shared is not None:
+            self._shared.close()
+            self._shared.unlink()
+            self._shared = None
+
+    def detach(self):
+        """Loest die Views eines Workers vom Shared Memory (Eigentuemer: release())."""
+        if self._handles is None:
+            return
+        self._df, self._cube = None, None
+        for shm in self._handles:
+            try:
+                shm.close()
+            except BufferError:
+                # Noch referenzierte Views - Mapping wird mit dem letzten View frei
+                pass
+        self._handles = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_handles'] = None
+        if self._shared is not None:
+            # Nur der Deskriptor geht an die Worker, nicht die Daten
+            state['_shared']     = None
+            state['_descriptor'] = self._shared.descriptor
+            state['_df']         = None
+            state['_cube']       = None
+        return state
+
+    def _attach(self):
+        self._handles, arrays = attach_arrays(self._descriptor)
+        meta  = self._shared_meta
+        index = pd.DatetimeIndex(arrays['index'], name=meta['index_name'])
+        if meta['tz'] is not None:
+            index = index.tz_localize('UTC').tz_convert(meta['tz'])
+        # 2D-Block ohne Kopie: die Spalten zeigen direkt in den Shared Memory
+        self._df = pd.DataFrame(arrays['ohlcv'].T, index=index, columns=meta['columns'], copy=False)
+        if 'cube_values' in arrays:
+            self._cube = {'dataset': meta['cube_dataset'],
+                          'windows': arrays['cube_windows'],
+                          'values':  arrays['cube_values']}
+
+    @property
+    def df(self) -> pd.DataFrame:
+        if self._df is None:
+            self._attach()
+        return self._df
+
+    @property
+    def entropy_cube(self) -> dict:
+        if self._df is None:
+            self._attach()
+        return self._cube
+
+    # --- Bewertung ---
+
+    def __call__(self, trial):
+        result = run_backtest(
+            self.df,
+            suggest_signal_config(trial),
+            self.risk_config,
+            start_capital=self.start_capital,
+            symbol=self.symbol,
+            trial=trial,
+            entropy_cube=self.entropy_cube,
+        )
+        score = self.score(result)
+        if score is None:
+            raise optuna.exceptions.TrialPruned()
+        return score
+
+    def score(self, result) -> float:
+        """PnL% des Backtests, oder None wenn die Constraints verletzt sind (Trial pruned)."""
+        pnl      = result.get('total_pnl_pct', -9999.0)
+        drawdown = result.get('max_drawdown',  100.0)
+        win_rate = result.get('win_rate',        0.0)
+        trades   = result.get('total_trades',      0)
+
+        if self.mode == 'strict':
+            if (drawdown > self.max_drawdown * 100
+                    or win_rate < self.min_win_rate
+                    or pnl < self.min_pnl
+                    or trades < self.min_trades):
+                return None
+        elif self.mode == 'best_profit':
+            if trades < self.min_trades or drawdown > self.max_drawdown * 100:
+                return None
+            return pnl
+
+        return pnl
+
+    def optimize_batched(self, study, n_trials: int, batch_size: int):
+        """
+        Ask/Tell-Variante von study.optimize(): fragt batch_size Trials auf
+        einmal ab und bewertet sie gemeinsam mit run_backtest_batch().
+        Ohne Zwischenstaende (kein Pruning waehrend des Backtests).
+        """
+        done = 0
+        while done < n_trials:
+            trials  = [study.ask() for _ in range(min(batch_size, n_trials - done))]
+            configs = [suggest_signal_config(t) for t in trials]
+            table   = run_backtest_batch(self.df, configs, self.risk_config,
+                                         start_capital=self.start_capital,
+                                         entropy_cube=self.entropy_cube)
+            for t, row in zip(trials, table.to_dict('records')):
+                score = self.score(row)
+                if score is None:
+                    study.tell(t, state=optuna.trial.TrialState.PRUNED)
+                else:
+                    study.tell(t, score)
+            done += len(trials)
+
+    def optimize(self, study, n_trials: int, batch_size: int = 1,
+                 n_jobs: int = 1, show_progress_bar: bool = False):
+        if batch_size > 1:
+            self.optimize_batched(study, n_trials, batch_size)
+        else:
+            study.optimize(self, n_trials=n_trials, n_jobs=n_jobs,
+                           show_progress_bar=show_progress_bar)
+
+
+def suggest_signal_config(trial) -> dict:
+    """
+    Zieht eine Signal-Config aus dem Suchraum.
+
+    Reihenfolge des Suchraums: zuerst alle Parameter der Entry-Stufe
+    (Indikatoren, Schwellen, Regime, MTF), danach Exit (SL/TP) und
+    Positionsgroesse. Trials mit gleicher Entry-Stufe nutzen die gecachte
+    Entry-Maske des Backtesters und rechnen nur die Trade-Simulation neu.
+    """
+    # --- Kern-MERS Parameter (Entry-Stufe) ---
+    entropy_window   = trial.suggest_int(  'entropy_window',       ENTROPY_WINDOW_MIN, ENTROPY_WINDOW_MAX)
     entropy_lookback = trial.suggest_int(  'entropy_lookback',      3,  25)
     energy_lookback  = trial.suggest_int(  'energy_lookback',       3,  25)
     min_entropy_drop = trial.suggest_float('min_entropy_drop_pct', 0.01, 0.35, step=0.01)
     min_energy_rise  = trial.suggest_float('min_energy_rise_pct',  0.05, 1.50, step=0.05)
     atr_period       = trial.suggest_int(  'atr_period',            7,  28)
-    atr_sl_mult      = trial.suggest_float('atr_sl_mult',          0.5,  3.0, step=0.25)
-    # TP muss groesser als SL sein (sonst kein positives R:R)
-    atr_tp_mult      = trial.suggest_float('atr_tp_mult',
-                                            max(atr_sl_mult + 0.5, 1.0), 6.0, step=0.25)
 
     # --- MDEF Regime-Check Parameter ---
     use_regime_filter = trial.suggest_int('use_regime_filter', 0, 1)
     regime_window     = trial.suggest_int('regime_window',     10, 40)
     allow_range_trade = trial.suggest_int('allow_range_trade',  0,  1)
 
+    # --- MDEF Multi-Timeframe Parameter ---
+    use_multitf_filter = trial.suggest_int('use_multitf_filter', 0, 1)
+    meso_tf_mult       = trial.suggest_int('meso_tf_mult',       2, 8)
+    macro_tf_mult      = trial.suggest_int('macro_tf_mult',      max(2 * meso_tf_mult, 8), 32)
+
+    # --- Exit (ATR-basiertes SL/TP) ---
+    atr_sl_mult      = trial.suggest_float('atr_sl_mult',          0.5,  3.0, step=0.25)
+    # TP muss groesser als SL sein (sonst kein positives R:R)
+    atr_tp_mult      = trial.suggest_float('atr_tp_mult',
+                                            max(atr_sl_mult + 0.5, 1.0), 6.0, step=0.25)
+
     # --- Risiko ---
     leverage         = trial.suggest_int(  'leverage',          5,   20)
     risk_per_trade   = trial.suggest_float('risk_per_trade_pct', 0.5, 3.0, step=0.25)
@@ -97,54 +344,206 @@ def objective(trial):
         'use_regime_filter':    use_regime_filter,
         'regime_window':        regime_window,
         'allow_range_trade':    allow_range_trade,
-        'use_multitf_filter':   0,
+        'use_multitf_filter':   use_multitf_filter,
+        'meso_tf_mult':         meso_tf_mult,
+        'macro_tf_mult':        macro_tf_mult,
+    }
+    return signal_config
+
+
+def _optimize_worker(objective: MersObjective, storage_url: str, study_name: str,
+                     n_trials: int, batch_size: int = 1, n_jobs: int = 1) -> dict:
+    """
+    Worker-Prozess: eigene Verbindung zur Optuna-DB, Trials gegen dieselbe Study.
+    Returns die Feature-Cache-Zaehler dieses Jobs (Pool-Prozesse laufen weiter).
+    """
+    hits, misses = FEATURE_CACHE.hits, FEATURE_CACHE.misses
+    study = optuna.load_study(study_name=study_name, storage=storage_url, pruner=_make_pruner())
+    try:
+        objective.optimize(study, n_trials, batch_size, n_jobs=n_jobs)
+    finally:
+        objective.detach()
+    return {'hits': FEATURE_CACHE.hits - hits, 'misses': FEATURE_CACHE.misses - misses}
+
+
+def _split_trials(n_trials: int, parts: int) -> list:
+    parts = max(1, min(parts, n_trials))
+    return [n_trials // parts + (i < n_trials % parts) for i in range(parts)]
+
+
+def _task_dates(timeframe: str, args) -> tuple:
+    """(start_date, end_date) eines Tasks: explizit oder per --history_days."""
+    if args.start_date:
+        return args.start_date, args.end_date or _dt.now().strftime('%Y-%m-%d')
+    days = HISTORY_DAYS_AUTO.get(timeframe, 730) if args.history_days == 'auto' else int(args.history_days)
+    end  = _dt.now()
+    return (end - timedelta(days=days)).strftime('%Y-%m-%d'), end.strftime('%Y-%m-%d')
+
+
+def _write_json_atomic(path: str, data: dict, indent: int = 4):
+    """Schreibt erst eine Temp-Datei und ersetzt dann atomar (keine halben Dateien)."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=indent, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def _save_if_better(task: dict, study, data, entropy_cube: dict, args,
+                    risk_config: dict, configs_dir: str, run_results: dict):
+    """Beste Trial-Config als config_*_mers.json - nur wenn besser als die bestehende."""
+    symbol, timeframe = task['symbol'], task['timeframe']
+    safe_name         = create_safe_filename(symbol, timeframe)
+
+    # --- Trial-Statistiken ---
+    all_trials     = study.trials
+    completed      = [t for t in all_trials if t.state == optuna.trial.TrialState.COMPLETE]
+    pruned         = [t for t in all_trials if t.state == optuna.trial.TrialState.PRUNED]
+    print(f"  Trials: {len(all_trials)} gesamt | "
+          f"{len(completed)} abgeschlossen | "
+          f"{len(pruned)} pruned")
+
+    valid_trials = completed
+    if not valid_trials:
+        hint = ""
+        if args.mode == 'strict':
+            hint = (f"  Tipp: MaxDD ({args.max_drawdown}%) oder MinWR ({args.min_win_rate}%) "
+                    f"zu streng, oder zu wenig Trades (min={args.min_trades}). "
+                    f"Modus 2 (best_profit) versuchen oder Constraints lockern.")
+        else:
+            hint = (f"  Tipp: MERS generiert keine Signale fuer {symbol} ({timeframe}). "
+                    f"Kuerzeren Timeframe (z.B. 4h statt 1d) oder mehr Trials versuchen.")
+        print(f"  Keine gueltigen Trials gefunden (alle pruned).")
+        print(hint)
+        run_results['failed'].append({
+            'symbol': symbol, 'timeframe': timeframe,
+            'reason': 'no_valid_trials',
+        })
+        return
+
+    best_trial  = max(valid_trials, key=lambda t: t.value)
+    best_params = best_trial.params
+    best_pnl    = best_trial.value
+
+    best_signal_config = {
+        'risk_per_trade_pct':   round(best_params['risk_per_trade_pct'], 2),
+        'leverage':             best_params['leverage'],
+        'entropy_window':       best_params['entropy_window'],
+        'entropy_lookback':     best_params['entropy_lookback'],
+        'energy_lookback':      best_params['energy_lookback'],
+        'min_entropy_drop_pct': best_params['min_entropy_drop_pct'],
+        'min_energy_rise_pct':  best_params['min_energy_rise_pct'],
+        'atr_period':           best_params['atr_period'],
+        'atr_sl_mult':          best_params['atr_sl_mult'],
+        'atr_tp_mult':          best_params['atr_tp_mult'],
+        'use_regime_filter':    best_params['use_regime_filter'],
+        'regime_window':        best_params['regime_window'],
+        'allow_range_trade':    best_params['allow_range_trade'],
+        # Trials aus Studien vor dem MTF-Filter haben diese Parameter nicht (Standard: aus)
+        'use_multitf_filter':   best_params.get('use_multitf_filter', 0),
+        'meso_tf_mult':         best_params.get('meso_tf_mult', 4),
+        'macro_tf_mult':        best_params.get('macro_tf_mult', 16),
     }
 
-    result = run_backtest(
-        HISTORICAL_DATA,
-        signal_config,
-        RISK_CONFIG,
-        start_capital=START_CAPITAL,
-        symbol=CURRENT_SYMBOL,
-        trial=trial,
+    final_result = run_backtest(
+        data, best_signal_config, risk_config,
+        start_capital=args.start_capital, symbol=symbol,
+        entropy_cube=entropy_cube,
     )
 
-    pnl      = result.get('total_pnl_pct', -9999.0)
-    drawdown = result.get('max_drawdown',  100.0)
-    win_rate = result.get('win_rate',        0.0)
-    trades   = result.get('total_trades',      0)
-
-    if OPTIM_MODE == 'strict':
-        if (drawdown > MAX_DRAWDOWN_CONSTRAINT * 100
-                or win_rate < MIN_WIN_RATE_CONSTRAINT
-                or pnl < MIN_PNL_CONSTRAINT
-                or trades < MIN_TRADES_CONSTRAINT):
-            raise optuna.exceptions.TrialPruned()
-    elif OPTIM_MODE == 'best_profit':
-        if trades < MIN_TRADES_CONSTRAINT or drawdown > MAX_DRAWDOWN_CONSTRAINT * 100:
-            raise optuna.exceptions.TrialPruned()
-        return pnl
+    # Nur speichern wenn besser als bestehende Config
+    config_file  = os.path.join(configs_dir, f'config_{safe_name}_mers.json')
+    existing_pnl = None
+    if os.path.exists(config_file):
+        try:
+            with open(config_file) as cf:
+                existing_cfg = json.load(cf)
+            existing_pnl = existing_cfg.get('_meta', {}).get('pnl_pct')
+        except Exception:
+            pass
+
+    if existing_pnl is not None and best_pnl <= existing_pnl:
+        print(f"  Bestehende Config besser ({existing_pnl:.2f}% vs {best_pnl:.2f}%) - wird nicht ueberschrieben.")
+        run_results['failed'].append({
+            'symbol': symbol, 'timeframe': timeframe,
+            'reason': f'existing_better_{existing_pnl:.2f}pct',
+        })
+        return
+
+    config_output = {
+        'market': {
+            'symbol':    symbol,
+            'timeframe': timeframe,
+        },
+        'signal': best_signal_config,
+        '_meta': {
+            'strategy':      'MDEF-MERS',
+            'pnl_pct':       round(best_pnl, 2),
+            'win_rate':      final_result.get('win_rate', 0.0),
+            'total_trades':  final_result.get('total_trades', 0),
+            'max_drawdown':  final_result.get('max_drawdown', 0.0),
+            'start_capital': args.start_capital,
+            'end_capital':   final_result.get('end_capital', args.start_capital),
+            'optimized_at':  _dt.now().isoformat(timespec='seconds'),
+            'mode':          args.mode,
+            'start_date':    task['start_date'],
+            'end_date':      task['end_date'],
+            'fee_rate_pct':  risk_config.get('fee_rate_pct', 0.06),
+        },
+    }
 
-    return pnl
+    _write_json_atomic(config_file, config_output)
+
+    print(f"\n  [OK] Beste MERS Config gespeichert: config_{safe_name}_mers.json")
+    print(f"       PnL: {best_pnl:.2f}% | WR: {final_result.get('win_rate')}% "
+          f"| Trades: {final_result.get('total_trades')} "
+          f"| MaxDD: {final_result.get('max_drawdown')}%")
+    print(f"       leverage={best_params['leverage']}x | risk_per_trade={best_params['risk_per_trade_pct']:.2f}% "
+          f"entropy_window={best_params['entropy_window']} "
+          f"entropy_lookback={best_params['entropy_lookback']} "
+          f"energy_lookback={best_params['energy_lookback']}")
+    print(f"       min_entropy_drop={best_params['min_entropy_drop_pct']:.2f} "
+          f"min_energy_rise={best_params['min_energy_rise_pct']:.2f} "
+          f"atr_period={best_params['atr_period']}")
+    print(f"       atr_sl_mult={best_params['atr_sl_mult']:.2f} "
+          f"atr_tp_mult={best_params['atr_tp_mult']:.2f} "
+          f"(R:R = 1:{best_params['atr_tp_mult']/best_params['atr_sl_mult']:.1f})")
+    print(f"       regime_filter={bool(best_params['use_regime_filter'])} "
+          f"regime_window={best_params['regime_window']} "
+          f"allow_range={bool(best_params['allow_range_trade'])}")
+    print(f"       multitf_filter={bool(best_signal_config['use_multitf_filter'])} "
+          f"meso_tf_mult={best_signal_config['meso_tf_mult']} "
+          f"macro_tf_mult={best_signal_config['macro_tf_mult']}")
+
+    run_results['saved'].append({
+        'symbol':      symbol,
+        'timeframe':   timeframe,
+        'pnl_pct':     round(best_pnl, 2),
+        'config_file': f'config_{safe_name}_mers.json',
+    })
 
 
 def main():
-    global HISTORICAL_DATA, CURRENT_SYMBOL, CURRENT_TIMEFRAME, RISK_CONFIG
-    global START_CAPITAL
-    global MAX_DRAWDOWN_CONSTRAINT, MIN_WIN_RATE_CONSTRAINT
-    global MIN_PNL_CONSTRAINT, MIN_TRADES_CONSTRAINT, OPTIM_MODE
-
     parser = argparse.ArgumentParser(description='mbot MERS Parameter Optimizer')
     parser.add_argument('--symbols',       type=str, required=True,
                         help='Space-getrennte Coins, z.B. "BTC ETH"')
     parser.add_argument('--timeframes',    type=str, required=True,
                         help='Space-getrennte Timeframes, z.B. "15m 1h"')
-    parser.add_argument('--start_date',    type=str, required=True)
-    parser.add_argument('--end_date',      type=str, required=True)
+    parser.add_argument('--start_date',    type=str, default=None,
+                        help='Startdatum (YYYY-MM-DD); ohne Angabe gilt --history_days')
+    parser.add_argument('--end_date',      type=str, default=None)
+    parser.add_argument('--history_days',  type=str, default='auto',
+                        help="Rueckblick in Tagen oder 'auto' (nach Timeframe), wenn --start_date fehlt")
     parser.add_argument('--start_capital',      type=float, default=1000.0)
     parser.add_argument('--trials',        type=int,   default=200)
     parser.add_argument('--jobs',          type=int,   default=1,
-                        help='Parallele Optuna-Jobs')
+                        help='Optuna-Threads pro Worker-Prozess')
+    parser.add_argument('--workers',       type=int,   default=1,
+                        help='Max. Worker-Prozesse pro Task (Shared Memory + gemeinsame Optuna-DB)')
+    parser.add_argument('--cpu_budget',    type=int,   default=None,
+                        help='Worker-Prozesse gesamt ueber alle Tasks (Standard: --workers)')
+    parser.add_argument('--download_threads', type=int, default=2,
+                        help='Parallele Downloads (laufen waehrend der Optimierung weiter)')
     parser.add_argument('--max_drawdown',  type=float, default=30.0,
                         help='Maximaler Drawdown in % (z.B. 30)')
     parser.add_argument('--min_win_rate',  type=float, default=50.0,
@@ -155,21 +554,26 @@ def main():
                         help='Minimale Anzahl Trades fuer gueltigen Trial (z.B. 20)')
     parser.add_argument('--mode',          type=str,   default='strict',
                         choices=['strict', 'best_profit'])
+    parser.add_argument('--feature_cache_mb', type=float, default=None,
+                        help='Speicherlimit des Feature-Caches in MB (Standard: MBOT_FEATURE_CACHE_MB bzw. 256)')
+    parser.add_argument('--batch_size',    type=int,   default=1,
+                        help='Trials pro Batch (>1: Ask/Tell mit run_backtest_batch, ohne Pruning)')
+    parser.add_argument('--persist_entropy_cube', action='store_true',
+                        help='Entropy-Cube neben der Optuna-DB speichern und wiederverwenden')
     args = parser.parse_args()
 
-    MAX_DRAWDOWN_CONSTRAINT = args.max_drawdown / 100.0
-    MIN_WIN_RATE_CONSTRAINT = args.min_win_rate
-    MIN_PNL_CONSTRAINT      = args.min_pnl
-    MIN_TRADES_CONSTRAINT   = args.min_trades
-    START_CAPITAL           = args.start_capital
-    OPTIM_MODE              = args.mode
+    cpu_budget = args.cpu_budget or args.workers
+    if args.feature_cache_mb is not None:
+        FEATURE_CACHE.max_bytes = int(args.feature_cache_mb * 1024 * 1024)
+        # Worker-Prozesse lesen das Limit beim Import des Backtesters
+        os.environ['MBOT_FEATURE_CACHE_MB'] = str(args.feature_cache_mb)
 
     with open(os.path.join(PROJECT_ROOT, 'settings.json'), 'r') as f:
         settings = json.load(f)
     with open(os.path.join(PROJECT_ROOT, 'secret.json'), 'r') as f:
         secrets = json.load(f)
 
-    RISK_CONFIG = settings.get('risk', {})
+    risk_config = settings.get('risk', {})
 
     accounts = secrets.get('mbot', [])
     if not accounts:
@@ -183,201 +587,123 @@ def main():
 
     symbols    = args.symbols.split()
     timeframes = args.timeframes.split()
-    tasks      = [
-        {'symbol': f"{s}/USDT:USDT" if '/' not in s else s, 'timeframe': tf}
-        for s in symbols for tf in timeframes
-    ]
+    tasks      = []
+    for s in dict.fromkeys(symbols):
+        for tf in dict.fromkeys(timeframes):
+            start_date, end_date = _task_dates(tf, args)
+            tasks.append({'symbol': f"{s}/USDT:USDT" if '/' not in s else s, 'timeframe': tf,
+                          'start_date': start_date, 'end_date': end_date})
 
     run_results = {
         'run_start': _dt.now().isoformat(timespec='seconds'),
         'run_end':   None,
         'saved':     [],
         'failed':    [],
+        'feature_cache': {'hits': 0, 'misses': 0},
     }
 
     configs_dir = os.path.join(PROJECT_ROOT, 'src', 'mbot', 'strategy', 'configs')
     os.makedirs(configs_dir, exist_ok=True)
     db_dir = os.path.join(PROJECT_ROOT, 'artifacts', 'db')
     os.makedirs(db_dir, exist_ok=True)
-
-    for task in tasks:
-        CURRENT_SYMBOL    = task['symbol']
-        CURRENT_TIMEFRAME = task['timeframe']
-        safe_name         = create_safe_filename(CURRENT_SYMBOL, CURRENT_TIMEFRAME)
-
-        print(f"\n===== MERS Optimierung: {CURRENT_SYMBOL} ({CURRENT_TIMEFRAME}) =====")
-        print(f"  Modus: {OPTIM_MODE} | Trials: {args.trials} | Kapital: {START_CAPITAL} USDT")
-        print(f"  Constraints: MaxDD={args.max_drawdown}% | MinWR={args.min_win_rate}% | MinPnL={args.min_pnl}%")
-        print(f"  Gebuehren: {RISK_CONFIG.get('fee_rate_pct', 0.06)}% pro Leg ({RISK_CONFIG.get('fee_rate_pct', 0.06) * 2:.2f}% Round-Trip) — in PnL eingerechnet")
-
-        HISTORICAL_DATA = load_data(exchange, CURRENT_SYMBOL, CURRENT_TIMEFRAME,
-                                     args.start_date, args.end_date)
-        if HISTORICAL_DATA is None or HISTORICAL_DATA.empty:
-            logger.warning(f"  Keine Daten fuer {CURRENT_SYMBOL} ({CURRENT_TIMEFRAME}). Ueberspringe.")
-            run_results['failed'].append({
-                'symbol': CURRENT_SYMBOL, 'timeframe': CURRENT_TIMEFRAME,
-                'reason': 'no_data',
-            })
-            continue
-
-        print(f"  {len(HISTORICAL_DATA)} Kerzen geladen.")
-
-        db_file     = os.path.join(db_dir, 'optuna_studies_mbot.db')
-        storage_url = f"sqlite:///{db_file}?timeout=60"
-        study_name  = f"mers_{safe_name}_{OPTIM_MODE}_mt{MIN_TRADES_CONSTRAINT}_lv"
-
+    db_file     = os.path.join(db_dir, 'optuna_studies_mbot.db')
+    storage_url = f"sqlite:///{db_file}?timeout=60"
+
+    print(f"\n===== MERS Optimierung: {len(tasks)} Task(s) =====")
+    print(f"  Modus: {args.mode} | Trials: {args.trials} | Kapital: {args.start_capital} USDT")
+    print(f"  Constraints: MaxDD={args.max_drawdown}% | MinWR={args.min_win_rate}% | MinPnL={args.min_pnl}%")
+    print(f"  Gebuehren: {risk_config.get('fee_rate_pct', 0.06)}% pro Leg ({risk_config.get('fee_rate_pct', 0.06) * 2:.2f}% Round-Trip) — in PnL eingerechnet")
+    print(f"  CPU-Budget: {cpu_budget} Prozess(e) | max. {args.workers} pro Task | "
+          f"{args.download_threads} Download-Thread(s)")
+
+    def estimate(task):
+        # Erwartete Laufzeit ~ Kerzen x Trials (Kerzen aus dem Datumsbereich geschaetzt)
+        span = (_dt.fromisoformat(task['end_date']) - _dt.fromisoformat(task['start_date'])).total_seconds() + 86400
+        return span / exchange.exchange.parse_timeframe(task['timeframe']) * args.trials
+
+    def resample_base(task):
+        # Hoehere Timeframes aus 1h/15m desselben Laufs bilden, wenn deren Zeitraum reicht
+        if task['timeframe'] not in RESAMPLE_TARGETS:
+            return None
+        for base in RESAMPLE_BASES:
+            if any(t['symbol'] == task['symbol'] and t['timeframe'] == base
+                   and t['start_date'] <= task['start_date'] for t in tasks):
+                return base
+        return None
+
+    def load(task):
+        safe_name = create_safe_filename(task['symbol'], task['timeframe'])
+        data      = load_data(exchange, task['symbol'], task['timeframe'],
+                              task['start_date'], task['end_date'],
+                              resample_from=resample_base(task))
+        if data is None or data.empty:
+            return None
+        return {'data': data, 'cube': _prepare_entropy_cube(data, db_dir, safe_name,
+                                                            args.persist_entropy_cube)}
+
+    def plan(task, payload):
+        data      = payload['data']
+        safe_name = create_safe_filename(task['symbol'], task['timeframe'])
+        print(f"\n  -> {task['symbol']} ({task['timeframe']}): {len(data)} Kerzen geladen "
+              f"| {task['start_date']} -> {task['end_date']}")
+
+        objective = MersObjective(
+            data, task['symbol'], risk_config,
+            start_capital=args.start_capital,
+            mode=args.mode,
+            max_drawdown=args.max_drawdown / 100.0,
+            min_win_rate=args.min_win_rate,
+            min_pnl=args.min_pnl,
+            min_trades=args.min_trades,
+            entropy_cube=payload['cube'],
+        )
+        study_name = f"mers_{safe_name}_{args.mode}_mt{args.min_trades}_lv"
         study = optuna.create_study(
             storage=storage_url,
             study_name=study_name,
             direction='maximize',
             load_if_exists=True,
-            pruner=optuna.pruners.MedianPruner(n_startup_trials=20, n_warmup_steps=1),
+            pruner=_make_pruner(),
         )
-
-        try:
-            study.optimize(
-                objective,
-                n_trials=args.trials,
-                n_jobs=args.jobs,
-                show_progress_bar=True,
-            )
-        except Exception as e:
-            logger.error(f"Optimizer-Fehler fuer {CURRENT_SYMBOL}: {e}")
-            run_results['failed'].append({
-                'symbol': CURRENT_SYMBOL, 'timeframe': CURRENT_TIMEFRAME,
-                'reason': str(e)[:80],
-            })
-            continue
-
-        # --- Trial-Statistiken ---
-        all_trials     = study.trials
-        completed      = [t for t in all_trials if t.state == optuna.trial.TrialState.COMPLETE]
-        pruned         = [t for t in all_trials if t.state == optuna.trial.TrialState.PRUNED]
-        print(f"  Trials: {len(all_trials)} gesamt | "
-              f"{len(completed)} abgeschlossen | "
-              f"{len(pruned)} pruned")
-
-        valid_trials = completed
-        if not valid_trials:
-            hint = ""
-            if OPTIM_MODE == 'strict':
-                hint = (f"  Tipp: MaxDD ({args.max_drawdown}%) oder MinWR ({args.min_win_rate}%) "
-                        f"zu streng, oder zu wenig Trades (min={args.min_trades}). "
-                        f"Modus 2 (best_profit) versuchen oder Constraints lockern.")
+        objective.share()
+        payload.update(objective=objective, study=study, t0=time.time())
+        jobs = [(_optimize_worker, (objective, storage_url, study_name, n, args.batch_size, args.jobs))
+                for n in _split_trials(args.trials, min(args.workers, cpu_budget))]
+        return len(data) * args.trials, jobs
+
+    def finish(task, payload, results, error):
+        symbol, timeframe = task['symbol'], task['timeframe']
+        if payload is not None and 'objective' in payload:
+            payload['objective'].release()
+        print(f"\n===== MERS Ergebnis: {symbol} ({timeframe}) =====")
+        if payload is None or error is not None:
+            reason = 'no_data' if error is None else str(error)[:80]
+            if error is None:
+                logger.warning(f"  Keine Daten fuer {symbol} ({timeframe}). Ueberspringe.")
             else:
-                hint = (f"  Tipp: MERS generiert keine Signale fuer {CURRENT_SYMBOL} ({CURRENT_TIMEFRAME}). "
-                        f"Kuerzeren Timeframe (z.B. 4h statt 1d) oder mehr Trials versuchen.")
-            print(f"  Keine gueltigen Trials gefunden (alle pruned).")
-            print(hint)
-            run_results['failed'].append({
-                'symbol': CURRENT_SYMBOL, 'timeframe': CURRENT_TIMEFRAME,
-                'reason': 'no_valid_trials',
-            })
-            continue
-
-        best_trial  = max(valid_trials, key=lambda t: t.value)
-        best_params = best_trial.params
-        best_pnl    = best_trial.value
-
-        best_signal_config = {
-            'risk_per_trade_pct':   round(best_params['risk_per_trade_pct'], 2),
-            'leverage':             best_params['leverage'],
-            'entropy_window':       best_params['entropy_window'],
-            'entropy_lookback':     best_params['entropy_lookback'],
-            'energy_lookback':      best_params['energy_lookback'],
-            'min_entropy_drop_pct': best_params['min_entropy_drop_pct'],
-            'min_energy_rise_pct':  best_params['min_energy_rise_pct'],
-            'atr_period':           best_params['atr_period'],
-            'atr_sl_mult':          best_params['atr_sl_mult'],
-            'atr_tp_mult':          best_params['atr_tp_mult'],
-            'use_regime_filter':    best_params['use_regime_filter'],
-            'regime_window':        best_params['regime_window'],
-            'allow_range_trade':    best_params['allow_range_trade'],
-            'use_multitf_filter':   0,
-        }
-
-        final_result = run_backtest(
-            HISTORICAL_DATA, best_signal_config, RISK_CONFIG,
-            start_capital=START_CAPITAL, symbol=CURRENT_SYMBOL,
-        )
-
-        # Nur speichern wenn besser als bestehende Config
-        config_file  = os.path.join(configs_dir, f'config_{safe_name}_mers.json')
-        existing_pnl = None
-        if os.path.exists(config_file):
-            try:
-                with open(config_file) as cf:
-                    existing_cfg = json.load(cf)
-                existing_pnl = existing_cfg.get('_meta', {}).get('pnl_pct')
-            except Exception:
-                pass
-
-        if existing_pnl is not None and best_pnl <= existing_pnl:
-            print(f"  Bestehende Config besser ({existing_pnl:.2f}% vs {best_pnl:.2f}%) - wird nicht ueberschrieben.")
-            run_results['failed'].append({
-                'symbol': CURRENT_SYMBOL, 'timeframe': CURRENT_TIMEFRAME,
-                'reason': f'existing_better_{existing_pnl:.2f}pct',
-            })
-            continue
-
-        config_output = {
-            'market': {
-                'symbol':    CURRENT_SYMBOL,
-                'timeframe': CURRENT_TIMEFRAME,
-            },
-            'signal': best_signal_config,
-            '_meta': {
-                'strategy':      'MDEF-MERS',
-                'pnl_pct':       round(best_pnl, 2),
-                'win_rate':      final_result.get('win_rate', 0.0),
-                'total_trades':  final_result.get('total_trades', 0),
-                'max_drawdown':  final_result.get('max_drawdown', 0.0),
-                'start_capital': START_CAPITAL,
-                'end_capital':   final_result.get('end_capital', START_CAPITAL),
-                'optimized_at':  _dt.now().isoformat(timespec='seconds'),
-                'mode':          OPTIM_MODE,
-                'start_date':    args.start_date,
-                'end_date':      args.end_date,
-                'fee_rate_pct':  RISK_CONFIG.get('fee_rate_pct', 0.06),
-            },
-        }
-
-        with open(config_file, 'w') as f:
-            json.dump(config_output, f, indent=4)
-
-        print(f"\n  [OK] Beste MERS Config gespeichert: config_{safe_name}_mers.json")
-        print(f"       PnL: {best_pnl:.2f}% | WR: {final_result.get('win_rate')}% "
-              f"| Trades: {final_result.get('total_trades')} "
-              f"| MaxDD: {final_result.get('max_drawdown')}%")
-        print(f"       leverage={best_params['leverage']}x | risk_per_trade={best_params['risk_per_trade_pct']:.2f}% "
-              f"entropy_window={best_params['entropy_window']} "
-              f"entropy_lookback={best_params['entropy_lookback']} "
-              f"energy_lookback={best_params['energy_lookback']}")
-        print(f"       min_entropy_drop={best_params['min_entropy_drop_pct']:.2f} "
-              f"min_energy_rise={best_params['min_energy_rise_pct']:.2f} "
-              f"atr_period={best_params['atr_period']}")
-        print(f"       atr_sl_mult={best_params['atr_sl_mult']:.2f} "
-              f"atr_tp_mult={best_params['atr_tp_mult']:.2f} "
-              f"(R:R = 1:{best_params['atr_tp_mult']/best_params['atr_sl_mult']:.1f})")
-        print(f"       regime_filter={bool(best_params['use_regime_filter'])} "
-              f"regime_window={best_params['regime_window']} "
-              f"allow_range={bool(best_params['allow_range_trade'])}")
-        print(f"       multitf_filter=False (deaktiviert)")
-
-        run_results['saved'].append({
-            'symbol':      CURRENT_SYMBOL,
-            'timeframe':   CURRENT_TIMEFRAME,
-            'pnl_pct':     round(best_pnl, 2),
-            'config_file': f'config_{safe_name}_mers.json',
-        })
+                logger.error(f"Optimizer-Fehler fuer {symbol}: {error}")
+            run_results['failed'].append({'symbol': symbol, 'timeframe': timeframe, 'reason': reason})
+            return
+
+        hits   = sum(r['hits']   for r in results)
+        misses = sum(r['misses'] for r in results)
+        run_results['feature_cache']['hits']   += hits
+        run_results['feature_cache']['misses'] += misses
+        print(f"  Dauer: {time.time() - payload['t0']:.1f}s | Feature-Cache: {hits} Hits | {misses} Misses "
+              f"({round(100.0 * hits / max(hits + misses, 1), 1)}% Trefferquote)")
+        _save_if_better(task, payload['study'], payload['data'], payload['cube'], args,
+                        risk_config, configs_dir, run_results)
+
+    scheduler = TaskScheduler(cpu_budget=cpu_budget, download_threads=args.download_threads)
+    scheduler.run(tasks, load, plan, finish, estimate=estimate)
 
     run_results['run_end'] = _dt.now().isoformat(timespec='seconds')
-    os.makedirs(os.path.dirname(RESULTS_FILE), exist_ok=True)
-    with open(RESULTS_FILE, 'w', encoding='utf-8') as f:
-        json.dump(run_results, f, indent=2, ensure_ascii=False)
+    _write_json_atomic(RESULTS_FILE, run_results, indent=2)
 
     print(f"\n===== MERS Optimierung abgeschlossen =====")
     print(f"  Gespeichert: {len(run_results['saved'])}  |  Fehlgeschlagen: {len(run_results['failed'])}")
+    print(f"  Feature-Cache: {run_results['feature_cache']['hits']} Hits | "
+          f"{run_results['feature_cache']['misses']} Misses")
 
 
 if __name__ == '__main__':
@@ -0,0 +1,255 @@
+# src/mbot/strategy/concurrent_signals.py
+"""
+Gleichzeitige Signal-Auswertung aller freien Strategien (asyncio).
+
+Bisher laeuft pro Strategie nacheinander OHLCV laden -> Signal -> evtl.
+Trade; bei 8-30 Strategien wird die letzte erst Sekunden nach dem
+Kerzen-Schluss bewertet. Hier in drei Phasen:
+
+  fetch  : OHLCV aller Strategien gleichzeitig ueber den async ccxt-Client
+           (Exchange.fetch_recent_ohlcv_async, Delta ueber den Ringpuffer)
+  signal : MERS-Signal im Worker-Pool, sobald die Daten einer Strategie da
+           sind (Prozess-Pool; bei einem Worker ein Thread, damit die
+           Event-Loop weiter Antworten annimmt)
+  decide : Orders nacheinander in fester Prioritaetsreihenfolge
+           (priority absteigend, dann Reihenfolge in active_strategies);
+           max_open_positions wird vor jeder Order neu geprueft
+
+Pro Durchlauf entsteht ein Latenz-Report relativ zum Kerzen-Schluss jeder
+Strategie (Daten da / Signal berechnet / Entscheidung) und gesamt
+Kerzen-Schluss -> letzte Entscheidung. Zeiten laufen auf der Uhr des
+Exchanges (bei FakeBitget die simulierte Uhr plus gemessene Dauer).
+
+Einstieg: run_signal_checks() (synchron, fuer master_runner und Daemon).
+Konfiguration: MBOT_SIGNAL_WORKERS (Standard: Anzahl CPUs).
+"""
+
+import os
+import sys
+import time
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+sys.path.append(os.path.join(PROJECT_ROOT, 'src'))
+
+from mbot.utils.trade_manager import (
+    is_strategy_free,
+    is_candle_cooldown_active,
+    execute_signal_trade,
+    read_active_positions,
+)
+from mbot.strategy.mers_signal import get_mers_signal, required_candles
+
+logger = logging.getLogger(__name__)
+
+SIGNAL_WORKERS = int(os.environ.get('MBOT_SIGNAL_WORKERS', os.cpu_count() or 1))
+
+STATUS_TEXT = {
+    'in_trade':   'bereits in Trade',
+    'cooldown':   'Candle-Cooldown',
+    'no_data':    'keine Daten',
+    'error':      'Fehler',
+    'no_signal':  'kein Signal',
+    'max_open':   'Max. Positionen belegt',
+    'taken':      'parallel belegt',
+    'traded':     'Trade platziert',
+    'not_placed': 'Trade nicht platziert',
+}
+
+
+def priority_order(strategies: list) -> list:
+    """Deterministische Reihenfolge: priority absteigend, dann Position in active_strategies."""
+    indexed = sorted(enumerate(strategies), key=lambda x: (-float(x[1].get('priority', 0)), x[0]))
+    return [s for _, s in indexed]
+
+
+def compute_signal(df, signal_config: dict) -> dict:
+    """Worker-Funktion (picklebar): Signal nur auf geschlossenen Kerzen (letzte Zeile laeuft noch)."""
+    return get_mers_signal(df.iloc[:-1], signal_config)
+
+
+def _warmup():
+    return True
+
+
+def make_signal_pool(workers: int = SIGNAL_WORKERS):
+    """Prozess-Pool fuer die Signal-Berechnung; bei einem Worker ein Thread (kein Spawn-Overhead)."""
+    if workers > 1:
+        return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+    return ThreadPoolExecutor(max_workers=1, thread_name_prefix='mers-signal')
+
+
+def _open_keys(active_keys: set = None) -> set:
+    keys = {(p.get('symbol'), p.get('timeframe')) for p in read_active_positions()}
+    return keys & active_keys if active_keys is not None else keys
+
+
+async def evaluate_strategies(exchange, client, strategies: list, configs: dict, max_open: int,
+                              telegram_config: dict, get_logger, pool,
+                              active_keys: set = None) -> dict:
+    """
+    Ein Durchlauf fuer strategies (Dicts mit symbol/timeframe[/priority]).
+    configs: (symbol, timeframe) -> (signal_config, risk_config).
+    Returns den Latenz-Report (siehe format_latency_report).
+    """
+    started = time.perf_counter()
+    base_ms = exchange.exchange.milliseconds()
+
+    def clock_ms() -> float:
+        return base_ms + (time.perf_counter() - started) * 1000
+
+    # Pool-Worker schon waehrend der Fetch-Phase starten
+    warmup = [pool.submit(_warmup) for _ in range(getattr(pool, '_max_workers', 1))]
+
+    records, pending = [], []
+    open_keys = _open_keys(active_keys)
+    for strat in priority_order(strategies):
+        symbol, timeframe = strat['symbol'], strat['timeframe']
+        tf_ms = exchange.exchange.parse_timeframe(timeframe) * 1000
+        rec   = {
+            'symbol':     symbol,
+            'timeframe':  timeframe,
+            'close_ms':   base_ms // tf_ms * tf_ms,
+            'fetched_ms': None,
+            'signal_ms':  None,
+            'decided_ms': None,
+            'side':       None,
+            'status':     None,
+        }
+        records.append(rec)
+        if (symbol, timeframe) in open_keys or not is_strategy_free(symbol, timeframe):
+            rec['status'] = 'in_trade'
+        elif is_candle_cooldown_active(symbol, timeframe):
+            rec['status'] = 'cooldown'
+        elif len(open_keys) >= max_open:
+            rec['status'] = 'max_open'
+        else:
+            pending.append(rec)
+        if rec['status']:
+            rec['decided_ms'] = clock_ms()
+
+    loop = asyncio.get_running_loop()
+
+    async def fetch_and_signal(rec):
+        key           = (rec['symbol'], rec['timeframe'])
+        strat_logger  = get_logger(*key)
+        signal_config = configs[key][0]
+        try:
+            df = await exchange.fetch_recent_ohlcv_async(
+                client, rec['symbol'], rec['timeframe'], limit=required_candles(signal_config) + 1)
+            rec['fetched_ms'] = clock_ms()
+            if df.empty:
+                strat_logger.warning(f"Keine OHLCV-Daten fuer {rec['symbol']}. Ueberspringe.")
+                rec['status'] = 'no_data'
+                return
+            signal = await loop.run_in_executor(pool, compute_signal, df, signal_config)
+        except Exception as e:
+            strat_logger.error(f"Signal-Check {rec['symbol']} ({rec['timeframe']}) fehlgeschlagen: {e}")
+            rec['status'] = 'error'
+            return
+        finally:
+            if rec['status']:
+                rec['decided_ms'] = clock_ms()
+        rec['signal_ms'] = clock_ms()
+        rec['signal']    = signal
+        rec['side']      = signal['side']
+        strat_logger.info(
+            f"MERS-Signal {rec['symbol']}: side={signal['side']} | "
+            f"Entropy-Drop={signal['entropy_drop']} | "
+            f"Energie-Rise={signal['energy_rise']} | "
+            f"Acc={signal['acceleration']} | "
+            f"Grund: {signal['reason']}"
+        )
+        if signal['side'] is None:
+            rec['status']     = 'no_signal'
+            rec['decided_ms'] = rec['signal_ms']
+
+    await asyncio.gather(*(fetch_and_signal(rec) for rec in pending))
+    for fut in warmup:
+        fut.cancel()
+    signals_done = clock_ms()
+
+    # Orders strikt nacheinander in Prioritaetsreihenfolge
+    for rec in pending:
+        if rec['status']:
+            continue
+        key          = (rec['symbol'], rec['timeframe'])
+        strat_logger = get_logger(*key)
+        if len(_open_keys(active_keys)) >= max_open:
+            strat_logger.info(f"Max. Positionen ({max_open}) belegt. Kein Trade fuer {rec['symbol']}.")
+            rec['status'] = 'max_open'
+        elif not is_strategy_free(*key):
+            strat_logger.info(f"Strategie {rec['symbol']} ({rec['timeframe']}) wurde parallel belegt, ueberspringe.")
+            rec['status'] = 'taken'
+        else:
+            success = execute_signal_trade(exchange, rec['symbol'], rec['timeframe'], rec['signal'],
+                                           configs[key][1], telegram_config, strat_logger)
+            rec['status'] = 'traded' if success else 'not_placed'
+            strat_logger.info(f"MERS Trade fuer {rec['symbol']} "
+                              f"{'erfolgreich platziert' if success else 'nicht platziert'}.")
+        rec['decided_ms'] = clock_ms()
+
+    for rec in records:
+        rec.pop('signal', None)
+    decided = [r for r in records if r['decided_ms'] is not None]
+    last    = max(decided, key=lambda r: r['decided_ms'] - r['close_ms']) if decided else None
+    return {
+        'strategies':                records,
+        'evaluated':                 len(pending),
+        'traded':                    sum(r['status'] == 'traded' for r in records),
+        'signals_phase_ms':          signals_done - base_ms,
+        'orders_phase_ms':           clock_ms() - signals_done,
+        'close_to_last_decision_ms': last['decided_ms'] - last['close_ms'] if last else None,
+    }
+
+
+def format_latency_report(report: dict) -> str:
+    """Mehrzeiliger Text: pro Strategie Kerzen-Schluss -> Daten / Signal / Entscheidung."""
+    def fmt(rec, key):
+        return f"{rec[key] - rec['close_ms']:+8.0f} ms" if rec[key] is not None else f"{'-':>11}"
+
+    lines = [f"Latenz-Report (ab Kerzen-Schluss), {len(report['strategies'])} Strategie(n), "
+             f"{report['evaluated']} ausgewertet, {report['traded']} Trade(s):"]
+    for rec in report['strategies']:
+        lines.append(f"  {rec['symbol']:<20} {rec['timeframe']:>4} | daten {fmt(rec, 'fetched_ms')} "
+                     f"| signal {fmt(rec, 'signal_ms')} | entscheidung {fmt(rec, 'decided_ms')} "
+                     f"| {STATUS_TEXT.get(rec['status'], rec['status'])}"
+                     f"{' (' + rec['side'] + ')' if rec['side'] else ''}")
+    if report['close_to_last_decision_ms'] is not None:
+        lines.append(f"  Kerzen-Schluss -> letzte Entscheidung: {report['close_to_last_decision_ms']:.0f} ms "
+                     f"(Fetch+Signale {report['signals_phase_ms']:.0f} ms, "
+                     f"Orders {report['orders_phase_ms']:.0f} ms)")
+    return '\n'.join(lines)
+
+
+async def _run(exchange, strategies, configs, max_open, telegram_config, get_logger, pool, active_keys):
+    client = exchange.open_async_client()
+    try:
+        return await evaluate_strategies(exchange, client, strategies, configs, max_open,
+                                         telegram_config, get_logger, pool, active_keys)
+    finally:
+        await client.close()
+
+
+def run_signal_checks(exchange, strategies: list, configs: dict, max_open: int,
+                      telegram_config: dict, get_logger=None, pool=None,
+                      active_keys: set = None) -> dict:
+    """
+    Synchroner Einstieg: ein asyncio-Durchlauf fuer strategies, Report wird geloggt.
+    pool=None: eigener Worker-Pool fuer diesen Aufruf (der Daemon haelt einen dauerhaft).
+    """
+    if get_logger is None:
+        from mbot.strategy.run import setup_logging as get_logger
+    own_pool = pool is None
+    pool     = pool or make_signal_pool()
+    try:
+        report = asyncio.run(_run(exchange, strategies, configs, max_open, telegram_config,
+                                  get_logger, pool, active_keys))
+    finally:
+        if own_pool:
+            pool.shutdown(wait=True, cancel_futures=True)
+    logger.info(format_latency_report(report))
+    return report
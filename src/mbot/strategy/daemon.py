@@ -0,0 +1,246 @@
+# src/mbot/strategy/daemon.py
+"""
+mbot Master-Daemon (Alternative zum Cronjob + run.py-Subprozess pro Strategie)
+
+Ein langlaufender Prozess statt eines Python-Starts pro Strategie und Lauf:
+  - eine Exchange-Instanz pro Account (Maerkte werden einmal geladen)
+  - settings.json, secret.json und die Strategie-Configs bleiben im
+    Speicher und werden nur bei geaenderter Datei (mtime) neu gelesen
+  - Aufwachen genau an den Kerzen-Grenzen (UTC-Raster wie Bitget) der
+    Timeframes aus active_strategies, plus close_delay Sekunden, damit die
+    geschlossene Kerze beim Exchange vorliegt
+  - alle faelligen Strategien laufen im selben Prozess
+    (run.process_strategy, identisch zum Cron-Pfad)
+
+Positions-Checks laufen bei jedem Aufwachen, mindestens alle
+check_interval Sekunden (wie der bisherige Cron-Takt), als eine
+Reconciliation pro Tick (trade_manager.reconcile_positions: ein Snapshot
+aller Positionen + Trigger-Orders statt eines Checks pro Position). Signal-Checks nur
+fuer Strategien, deren Kerze gerade geschlossen hat - mit async_signals
+gleichzeitig (mbot.strategy.concurrent_signals, dauerhafter Worker-Pool)
+statt nacheinander.
+
+Start: python master_runner.py --daemon
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import threading
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+sys.path.append(os.path.join(PROJECT_ROOT, 'src'))
+
+from mbot.utils.exchange import Exchange
+from mbot.utils.trade_manager import read_active_positions, reconcile_positions
+from mbot.strategy.run import setup_logging, load_strategy_config, process_strategy, config_path_for
+from mbot.strategy.concurrent_signals import make_signal_pool, run_signal_checks
+
+logger = logging.getLogger(__name__)
+
+SETTINGS_PATH = os.path.join(PROJECT_ROOT, 'settings.json')
+SECRET_PATH   = os.path.join(PROJECT_ROOT, 'secret.json')
+
+
+def next_boundary(now: float, tf_seconds: int) -> float:
+    """Naechste Kerzen-Grenze (Sekunden seit Epoch, UTC) strikt nach now."""
+    return (int(now) // tf_seconds + 1) * tf_seconds
+
+
+class MasterDaemon:
+    """Haelt Exchange, Settings und Configs im Speicher und taktet nach Kerzen-Grenzen."""
+
+    def __init__(self, settings_path: str = SETTINGS_PATH, secret_path: str = SECRET_PATH,
+                 check_interval: float = 300.0, close_delay: float = 2.0,
+                 exchange_factory=Exchange, clock=time.time, on_wake=None,
+                 async_signals: bool = False):
+        self.settings_path    = settings_path
+        self.secret_path      = secret_path
+        self.check_interval   = float(check_interval)
+        self.close_delay      = float(close_delay)
+        self.exchange_factory = exchange_factory
+        self.clock            = clock
+        self.on_wake          = on_wake
+        self.async_signals    = async_signals
+        self.stop_event       = threading.Event()
+
+        self.settings   = {}
+        self.telegram   = {}
+        self.exchanges  = {}
+        self._mtimes    = {}
+        self._configs   = {}
+        self._last_check = None
+        self._pool       = None
+        self.last_report = None
+
+    # ------------------------------------------------------------------
+    # Zustand (nur bei Aenderung neu laden)
+    # ------------------------------------------------------------------
+
+    def _changed(self, path: str) -> bool:
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        if self._mtimes.get(path, -1) == mtime:
+            return False
+        self._mtimes[path] = mtime
+        return True
+
+    def reload(self):
+        """Liest settings.json / secret.json neu, wenn sie sich geaendert haben."""
+        if self._changed(self.settings_path):
+            with open(self.settings_path, 'r') as f:
+                self.settings = json.load(f)
+            self._configs.clear()
+            logger.info("Daemon: settings.json geladen.")
+        if self._changed(self.secret_path):
+            with open(self.secret_path, 'r') as f:
+                secrets = json.load(f)
+            accounts = secrets.get('mbot', [])
+            if not accounts:
+                raise RuntimeError("Keine 'mbot'-Accounts in secret.json gefunden.")
+            self.telegram  = secrets.get('telegram', {})
+            # Eine Exchange-Instanz pro Account; gehandelt wird wie im Cron-Pfad auf dem ersten
+            self.exchanges = {i: self.exchange_factory(acc) for i, acc in enumerate(accounts)}
+            logger.info(f"Daemon: {len(self.exchanges)} Account(s) verbunden.")
+
+    @property
+    def exchange(self):
+        return self.exchanges[0]
+
+    @property
+    def live_settings(self) -> dict:
+        return self.settings.get('live_trading_settings', {})
+
+    def active_strategies(self) -> list:
+        return [s for s in self.live_settings.get('active_strategies', [])
+                if isinstance(s, dict) and s.get('active') and s.get('symbol') and s.get('timeframe')]
+
+    def strategy_config(self, symbol: str, timeframe: str, strat_logger: logging.Logger) -> tuple:
+        """(signal_config, risk_config) aus dem Speicher, neu gelesen bei geaenderter Config-Datei."""
+        path = config_path_for(symbol, timeframe)
+        key  = (symbol, timeframe)
+        if self._changed(path) or key not in self._configs:
+            self._configs[key] = load_strategy_config(symbol, timeframe, self.settings, strat_logger)
+        return self._configs[key]
+
+    # ------------------------------------------------------------------
+    # Takt
+    # ------------------------------------------------------------------
+
+    def _tf_seconds(self, timeframe: str) -> int:
+        return int(self.exchange.exchange.parse_timeframe(timeframe))
+
+    def next_wake(self, now: float) -> tuple:
+        """
+        Returns (wake_time, due): naechster Zeitpunkt (Kerzen-Grenze + close_delay
+        oder faelliger Positions-Check) und die dann faelligen Strategien.
+        """
+        boundaries = {}
+        for strat in self.active_strategies():
+            tf_secs = self._tf_seconds(strat['timeframe'])
+            t       = next_boundary(now - self.close_delay, tf_secs) + self.close_delay
+            boundaries.setdefault(t, []).append(strat)
+        check_at = (self._last_check or now) + self.check_interval
+        if not boundaries or check_at < min(boundaries):
+            return check_at, []
+        wake = min(boundaries)
+        return wake, boundaries[wake]
+
+    def tick(self, due: list):
+        """Positions-Checks fuer alle getrackten Trades, dann Signal-Checks fuer due."""
+        started     = time.perf_counter()
+        strategies  = self.active_strategies()
+        active_keys = {(s['symbol'], s['timeframe']) for s in strategies}
+        max_open    = int(self.live_settings.get('max_open_positions', 10))
+
+        if self.live_settings.get('batched_reconciliation', True):
+            # Ein Account-Snapshot statt eines Checks pro Position
+            reconcile_positions(self.exchange, self.telegram, logger, active_keys)
+        else:
+            for pos in read_active_positions():
+                key = (pos.get('symbol'), pos.get('timeframe'))
+                if key in active_keys:
+                    self._run(key[0], key[1], 'check')
+        self._last_check = self.clock()
+
+        checked   = 0
+        open_keys = {(p.get('symbol'), p.get('timeframe')) for p in read_active_positions()} & active_keys
+        if self.async_signals or self.live_settings.get('async_signal_checks'):
+            free = [s for s in due if (s['symbol'], s['timeframe']) not in open_keys]
+            if free and len(open_keys) < max_open:
+                checked = self._run_concurrent(free, max_open, active_keys)
+            due = []
+            open_keys = {(p.get('symbol'), p.get('timeframe')) for p in read_active_positions()} & active_keys
+        for strat in due:
+            if len(open_keys) >= max_open:
+                logger.info(f"Daemon: Max. Positionen ({max_open}) belegt. Kein weiterer Signal-Check.")
+                break
+            key = (strat['symbol'], strat['timeframe'])
+            if key in open_keys:
+                continue
+            self._run(key[0], key[1], 'signal')
+            checked  += 1
+            open_keys = {(p.get('symbol'), p.get('timeframe')) for p in read_active_positions()} & active_keys
+
+        logger.info(f"Daemon-Tick: {checked} Signal-Check(s), {len(open_keys)} offene Trade(s) "
+                    f"in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+    def _run(self, symbol: str, timeframe: str, mode: str):
+        strat_logger = setup_logging(symbol, timeframe)
+        try:
+            signal_config, risk_config = self.strategy_config(symbol, timeframe, strat_logger)
+            process_strategy(self.exchange, symbol, timeframe, mode, signal_config, risk_config,
+                             self.telegram, strat_logger)
+        except Exception as e:
+            # Eine fehlerhafte Strategie darf den Daemon nicht beenden
+            strat_logger.error(f"Fehler im Daemon-Lauf {symbol} ({timeframe}, {mode}): {e}", exc_info=True)
+
+    def _run_concurrent(self, strategies: list, max_open: int, active_keys: set) -> int:
+        """
+        Signal-Checks aller freien faelligen Strategien in einem asyncio-Durchlauf.
+        Returns die Anzahl uebergebener Strategien (mit lesbarer Config).
+        """
+        configs = {}
+        for strat in strategies:
+            key = (strat['symbol'], strat['timeframe'])
+            try:
+                configs[key] = self.strategy_config(key[0], key[1], setup_logging(*key))
+            except Exception as e:
+                logger.error(f"Config fuer {key[0]} ({key[1]}) nicht lesbar: {e}")
+        strategies = [s for s in strategies if (s['symbol'], s['timeframe']) in configs]
+        if self._pool is None:
+            self._pool = make_signal_pool()
+        try:
+            self.last_report = run_signal_checks(self.exchange, strategies, configs, max_open,
+                                                 self.telegram, setup_logging, self._pool, active_keys)
+        except Exception as e:
+            logger.error(f"Gleichzeitige Signal-Checks fehlgeschlagen: {e}", exc_info=True)
+        return len(strategies)
+
+    def run(self):
+        """Hauptschleife bis stop() (oder SIGTERM/SIGINT ueber master_runner)."""
+        self.reload()
+        logger.info(f"Daemon gestartet: {len(self.active_strategies())} aktive Strategie(n), "
+                    f"Check-Intervall {self.check_interval:.0f}s")
+        self.tick([])
+        while not self.stop_event.is_set():
+            wake, due = self.next_wake(self.clock())
+            if self.stop_event.wait(max(0.0, wake - self.clock())):
+                break
+            try:
+                self.reload()
+                if self.on_wake:
+                    self.on_wake()
+                self.tick(due)
+            except Exception as e:
+                logger.error(f"Daemon-Tick fehlgeschlagen: {e}", exc_info=True)
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+        logger.info("Daemon beendet.")
+
+    def stop(self):
+        self.stop_event.set()
@@ -7,6 +7,7 @@ Kern-Berechnungen fuer die MDEF-MERS Strategie:
 LAYER 1 - Signalverarbeitung:
   calc_log_returns()        - Logarithmische Renditen
   calc_rolling_entropy()    - Rolling Shannon Entropy (Ordnung vs. Chaos)
+  calc_entropy_cube()       - Rolling Entropy fuer viele Fenstergroessen (float32-Matrix)
   calc_velocity()           - Erste Ableitung (Momentum)
   calc_acceleration()       - Zweite Ableitung (Momentumwechsel)
   calc_energy()             - Kinetische Energie (v^2)
@@ -16,10 +17,14 @@ LAYER 2 - Phasenraum-Analyse (MDEF-Kern):
   classify_phase_regime()   - Klassifiziert Markt als 'trend' / 'range' / 'chaos'
                               Basiert auf Phasenraum-Trajektorie (v, a)
                               Chaos-Filter: kein Trading wenn Regime = 'chaos'
+  classify_phase_regime_series()
+                            - Regime fuer jede Kerze (int8-Codes, vektorisiert)
 
 LAYER 3 - Multi-Timeframe Resonanz:
   calc_multitf_alignment()  - Prueft ob Mikro/Meso/Makro-Trends ausgerichtet sind
                               Handelssignal nur bei vollstaendiger Resonanz
+  calc_multitf_alignment_series()
+                            - MTF-Ausrichtung fuer jede Kerze (vektorisiert)
 
 LAYER 4 - Frequenzanalyse (informativ):
   calc_dominant_period()    - Dominante Zyklusperiode via FFT
@@ -37,6 +42,8 @@ Mathematik:
 import numpy as np
 import pandas as pd
 
+from mbot.utils.jit import njit, NUMBA_ENABLED
+
 
 # ============================================================
 # LAYER 1: Signalverarbeitung
@@ -55,17 +62,275 @@ def calc_rolling_entropy(returns: pd.Series, window: int = 20, bins: int = 10) -
 
     Hohe Entropy  = chaotisch / unstrukturiert
     Niedrige Entropy = geordnet / trendend (Signal zum Handeln)
+
+    Vektorisiert: alle Fenster werden als Strided-View verarbeitet, die
+    Bin-Zuordnung erfolgt blockweise fuer viele Fenster gleichzeitig.
+    Ergebnis ist bitidentisch zu rolling(window).apply(np.histogram ...),
+    inkl. Min/Max-Bin-Kanten pro Fenster, leerer Bins und bfill am Anfang.
+    Fenster mit NaN/inf liefern NaN.
+
+    Mit aktivem Numba-Backend (siehe mbot.utils.jit) laeuft die Berechnung
+    als kompilierte Schleife pro Fenster; Abweichungen zur NumPy-Variante
+    liegen hoechstens im Bereich der log()-Rundung.
+    """
+    values = returns.to_numpy(dtype=np.float64)
+    result = np.full(len(values), np.nan)
+    if window >= 1 and len(values) >= window:
+        result[window - 1:] = _rolling_entropy_values(values, window, bins)
+    return pd.Series(result, index=returns.index, name=returns.name).bfill()
+
+
+# Fenster pro Block (begrenzt den Speicherbedarf bei langen Serien)
+_ENTROPY_BLOCK = 8192
+
+
+def _rolling_entropy_values(values: np.ndarray, window: int, bins: int) -> np.ndarray:
+    """Entropy fuer jedes vollstaendige Fenster (Laenge len(values) - window + 1)."""
+    if NUMBA_ENABLED and bins <= _PAIRWISE_BLOCK:
+        return _rolling_entropy_jit(values, window, bins)
+    windows = np.lib.stride_tricks.sliding_window_view(values, window)
+    out = np.empty(len(windows))
+    for start in range(0, len(windows), _ENTROPY_BLOCK):
+        block = windows[start:start + _ENTROPY_BLOCK]
+        out[start:start + len(block)] = _entropy_block(block, bins)
+    return out
+
+
+def _entropy_block(win: np.ndarray, bins: int) -> np.ndarray:
+    """
+    Shannon Entropy fuer einen Block von Fenstern (m x window).
+
+    Bildet np.histogram(x, bins) Schritt fuer Schritt nach (gleiche Kanten,
+    gleiche Index-Korrektur an den Bin-Grenzen), damit das Ergebnis
+    bitidentisch zur Einzelberechnung ist.
+    """
+    m = len(win)
+    finite = np.isfinite(win).all(axis=1)
+    if not finite.all():
+        win = np.where(finite[:, None], win, 0.0)
+
+    # Aeussere Kanten wie np.histogram: [min, max], leerer Bereich -> +/- 0.5
+    lo = win.min(axis=1)
+    hi = win.max(axis=1)
+    same = lo == hi
+    lo = np.where(same, lo - 0.5, lo)
+    hi = np.where(same, hi + 0.5, hi)
+    delta = hi - lo
+
+    # Bin-Kanten wie np.linspace(lo, hi, bins + 1)
+    steps = np.arange(bins + 1, dtype=np.float64)
+    step = delta / bins
+    edges = steps[None, :] * step[:, None]
+    zero_step = step == 0
+    if zero_step.any():
+        edges[zero_step] = (steps / bins)[None, :] * delta[zero_step, None]
+    edges += lo[:, None]
+    edges[:, -1] = hi
+
+    # Bin-Zuordnung (gleiche Formel + Korrektur wie np.histogram)
+    rows = np.arange(m)[:, None]
+    idx = (((win - lo[:, None]) / delta[:, None]) * bins).astype(np.intp)
+    idx[idx == bins] -= 1
+    idx[win < edges[rows, idx]] -= 1
+    idx[(win >= edges[rows, idx + 1]) & (idx != bins - 1)] += 1
+
+    counts = np.bincount((idx + rows * bins).ravel(), minlength=m * bins).reshape(m, bins)
+
+    # Entropy nur ueber belegte Bins; belegte Bins nach vorne schieben,
+    # damit np.sum dieselbe (paarweise) Summationsreihenfolge nutzt.
+    occupied = counts > 0
+    n_occupied = occupied.sum(axis=1)
+    order = np.argsort(~occupied, axis=1, kind='stable')
+    counts = np.take_along_axis(counts, order, axis=1)
+    p = counts / counts.sum(axis=1, keepdims=True)
+
+    out = np.zeros(m)
+    for k in np.unique(n_occupied):
+        if k == 0:
+            continue
+        sel = n_occupied == k
+        pk = np.ascontiguousarray(p[sel, :k])
+        out[sel] = -np.sum(pk * np.log(pk + 1e-12), axis=1)
+
+    out[~finite] = np.nan
+    return out
+
+
+# numpy summiert bis zu dieser Laenge ohne Rekursion (PW_BLOCKSIZE)
+_PAIRWISE_BLOCK = 128
+
+
+@njit
+def _rolling_entropy_jit(values, window, bins):
     """
-    def _entropy(x: np.ndarray) -> float:
-        counts, _ = np.histogram(x, bins=bins)
-        counts = counts[counts > 0]
-        if len(counts) == 0:
-            return 0.0
-        p = counts / counts.sum()
-        return float(-np.sum(p * np.log(p + 1e-12)))
+    Kompilierte Variante von _rolling_entropy_values (Numba-Backend).
 
-    result = returns.rolling(window).apply(_entropy, raw=True)
-    return result.bfill()
+    Gleiche Kanten, Bin-Korrektur und Summationsreihenfolge (paarweise,
+    8 Akkumulatoren wie np.sum) wie _entropy_block, aber ohne Zwischen-
+    Arrays pro Block. Voraussetzung: bins <= _PAIRWISE_BLOCK.
+    """
+    m      = len(values) - window + 1
+    out    = np.empty(m)
+    edges  = np.empty(bins + 1)
+    counts = np.zeros(bins, dtype=np.int64)
+    terms  = np.empty(bins)
+
+    for s in range(m):
+        lo = values[s]
+        hi = values[s]
+        finite = True
+        for j in range(window):
+            x = values[s + j]
+            if not np.isfinite(x):
+                finite = False
+                break
+            if x < lo:
+                lo = x
+            if x > hi:
+                hi = x
+        if finite:
+            out[s] = _window_entropy_jit(values, s, window, lo, hi, bins, edges, counts, terms)
+        else:
+            out[s] = np.nan
+
+    return out
+
+
+@njit
+def _entropy_cube_jit(values, windows, bins, out):
+    """
+    Entropy fuer alle Fenstergroessen (aufsteigend sortiert) in einem Durchlauf.
+
+    Pro End-Kerze wird das Fenster rueckwaerts erweitert; Min/Max werden
+    dabei fortgeschrieben und fuer jede Fenstergroesse wiederverwendet.
+    out[r, i] = Entropy des Fensters der Laenge windows[r], das bei i endet.
+    """
+    n      = len(values)
+    n_w    = len(windows)
+    w_max  = windows[n_w - 1]
+    edges  = np.empty(bins + 1)
+    counts = np.zeros(bins, dtype=np.int64)
+    terms  = np.empty(bins)
+
+    for i in range(n):
+        lo = values[i]
+        hi = values[i]
+        finite = True
+        r = 0
+        for length in range(1, min(w_max, i + 1) + 1):
+            x = values[i - length + 1]
+            if not np.isfinite(x):
+                finite = False
+            elif x < lo:
+                lo = x
+            elif x > hi:
+                hi = x
+            while r < n_w and windows[r] == length:
+                if finite:
+                    out[r, i] = _window_entropy_jit(values, i - length + 1, length, lo, hi,
+                                                    bins, edges, counts, terms)
+                else:
+                    out[r, i] = np.nan
+                r += 1
+
+
+@njit
+def _window_entropy_jit(values, start, window, lo, hi, bins, edges, counts, terms):
+    """Entropy eines Fensters mit bekanntem Min/Max (Arbeits-Arrays werden wiederverwendet)."""
+    if lo == hi:
+        lo = lo - 0.5
+        hi = hi + 0.5
+    delta = hi - lo
+    step  = delta / bins
+    for b in range(bins + 1):
+        if step == 0:
+            edges[b] = (b / bins) * delta + lo
+        else:
+            edges[b] = b * step + lo
+    edges[bins] = hi
+
+    counts[:] = 0
+    for j in range(window):
+        x = values[start + j]
+        k = int(((x - lo) / delta) * bins)
+        if k == bins:
+            k -= 1
+        if x < edges[k]:
+            k -= 1
+        if x >= edges[k + 1] and k != bins - 1:
+            k += 1
+        counts[k] += 1
+
+    n_terms = 0
+    for b in range(bins):
+        if counts[b] > 0:
+            p = counts[b] / window
+            terms[n_terms] = p * np.log(p + 1e-12)
+            n_terms += 1
+
+    if n_terms < 8:
+        total = 0.0
+        for t in range(n_terms):
+            total += terms[t]
+    else:
+        r0, r1, r2, r3 = terms[0], terms[1], terms[2], terms[3]
+        r4, r5, r6, r7 = terms[4], terms[5], terms[6], terms[7]
+        t = 8
+        while t < n_terms - n_terms % 8:
+            r0 += terms[t]
+            r1 += terms[t + 1]
+            r2 += terms[t + 2]
+            r3 += terms[t + 3]
+            r4 += terms[t + 4]
+            r5 += terms[t + 5]
+            r6 += terms[t + 6]
+            r7 += terms[t + 7]
+            t += 8
+        total = ((r0 + r1) + (r2 + r3)) + ((r4 + r5) + (r6 + r7))
+        while t < n_terms:
+            total += terms[t]
+            t += 1
+    return -total
+
+
+def calc_entropy_cube(returns: pd.Series, windows, bins: int = 10,
+                      dtype=np.float32) -> np.ndarray:
+    """
+    Rolling Entropy fuer viele Fenstergroessen auf einmal (z.B. range(10, 61)).
+
+    Returns: Matrix (len(windows) x len(returns)) im Format dtype (Standard
+    float32, halber Speicher). Zeile r entspricht
+    calc_rolling_entropy(returns, window=windows[r], bins) inkl. bfill,
+    gerundet auf dtype.
+
+    Mit Numba-Backend werden alle Fenster in einem Durchlauf ueber die Daten
+    berechnet (gemeinsames Min/Max pro End-Kerze). Eine Akkumulation ueber
+    kumulative Bin-Counts ist nicht moeglich, da die Bin-Kanten von Min/Max
+    jedes einzelnen Fensters abhaengen.
+    """
+    values  = returns.to_numpy(dtype=np.float64)
+    windows = np.asarray(windows, dtype=np.int64)
+    n       = len(values)
+    cube    = np.full((len(windows), n), np.nan)
+
+    valid = windows >= 1
+    if NUMBA_ENABLED and bins <= _PAIRWISE_BLOCK and valid.any():
+        rows = np.flatnonzero(valid)[np.argsort(windows[valid], kind='stable')]
+        sorted_windows = windows[rows]
+        # doppelte Fenstergroessen werden einmal berechnet und kopiert
+        uniq = np.unique(sorted_windows)
+        tmp  = np.full((len(uniq), n), np.nan)
+        _entropy_cube_jit(values, uniq, bins, tmp)
+        for r, w in zip(rows, sorted_windows):
+            cube[r] = tmp[np.searchsorted(uniq, w)]
+    else:
+        for r, w in enumerate(windows):
+            if w >= 1 and n >= w:
+                cube[r, w - 1:] = _rolling_entropy_values(values, int(w), bins)
+
+    # bfill pro Zeile wie calc_rolling_entropy()
+    filled = pd.DataFrame(cube.T).bfill().to_numpy().T
+    return np.ascontiguousarray(filled, dtype=dtype)
 
 
 def calc_velocity(price: pd.Series) -> pd.Series:
@@ -114,6 +379,26 @@ def calc_atr(df: pd.DataFrame, period: int = 14) -> pd.Series:
 # LAYER 2: Phasenraum-Regime-Klassifikation (MDEF-Kern)
 # ============================================================
 
+# Schwellen der Regime-Regeln (gemeinsam fuer Einzel- und Serien-Klassifikation)
+CHAOS_RATIO_THRESHOLD       = 1.8
+TREND_CONSISTENCY_THRESHOLD = 0.35
+
+# Regime-Codes fuer classify_phase_regime_series()
+REGIME_NONE  = -1
+REGIME_RANGE = 0
+REGIME_TREND = 1
+REGIME_CHAOS = 2
+REGIME_NAMES = {
+    REGIME_NONE:  'neutral',
+    REGIME_RANGE: 'range',
+    REGIME_TREND: 'trend',
+    REGIME_CHAOS: 'chaos',
+}
+
+# Fenster pro Block fuer die Serien-Klassifikation
+_REGIME_BLOCK = 16384
+
+
 def classify_phase_regime(velocity: pd.Series, acceleration: pd.Series,
                            window: int = 20) -> str:
     """
@@ -134,12 +419,20 @@ def classify_phase_regime(velocity: pd.Series, acceleration: pd.Series,
       'range'  -> Cluster/Schleifen          -> Mean-Reversion (MERS schlaeft)
       'chaos'  -> Chaotische Streuung        -> KEIN TRADING
     """
-    vel_win = velocity.iloc[-window:]
-    acc_win = acceleration.iloc[-window:]
+    vel_win = velocity.iloc[-window:].to_numpy(dtype=np.float64)
+    acc_win = acceleration.iloc[-window:].to_numpy(dtype=np.float64)
+    return _classify_regime_values(vel_win, acc_win)
+
 
-    vel_std     = float(vel_win.std())
-    acc_std     = float(acc_win.std())
-    vel_mean_abs = float(vel_win.abs().mean())
+def _classify_regime_values(vel_win: np.ndarray, acc_win: np.ndarray) -> str:
+    """
+    Regime-Regeln auf einem bereits ausgeschnittenen Fenster (NumPy-Arrays).
+    Rechnet wie pandas std/mean (ddof=1), damit Series- und Stream-Pfad
+    identische Ergebnisse liefern.
+    """
+    vel_std      = _sample_std(vel_win)
+    acc_std      = _sample_std(acc_win)
+    vel_mean     = float(vel_win.sum() / len(vel_win)) if len(vel_win) else np.nan
 
     eps = 1e-10
 
@@ -147,16 +440,72 @@ def classify_phase_regime(velocity: pd.Series, acceleration: pd.Series,
     chaos_ratio = acc_std / (vel_std + eps)
 
     # Trend-Indikator: konsistente Richtung der Geschwindigkeit
-    vel_consistency = abs(float(vel_win.mean())) / (vel_std + eps)
+    vel_consistency = abs(vel_mean) / (vel_std + eps)
 
     # Regime-Regeln (aus Phasenraum-Theorie)
-    if chaos_ratio > 1.8:
+    if chaos_ratio > CHAOS_RATIO_THRESHOLD:
         return 'chaos'
-    if vel_consistency > 0.35:
+    if vel_consistency > TREND_CONSISTENCY_THRESHOLD:
         return 'trend'
     return 'range'
 
 
+def _sample_std(x: np.ndarray) -> float:
+    """Standardabweichung mit ddof=1 (wie pandas Series.std), NaN bei < 2 Werten."""
+    n = len(x)
+    if n < 2:
+        return np.nan
+    avg = x.sum() / n
+    return float(np.sqrt(((avg - x) ** 2).sum() / (n - 1)))
+
+
+def classify_phase_regime_series(velocity: pd.Series, acceleration: pd.Series,
+                                 window: int = 20) -> np.ndarray:
+    """
+    Regime fuer jede Kerze in einem Durchlauf (vektorisiert).
+
+    Kerze i wird mit dem Fenster [i-window+1, i] klassifiziert - dieselben
+    Regeln und Schwellen wie classify_phase_regime() auf den Daten bis i.
+    Mittelwert/Std werden wie dort zweistufig pro Fenster gerechnet
+    (Strided-View, blockweise), damit Backtest und Live-Signal identisch
+    klassifizieren.
+
+    Returns: int8-Array (Laenge len(velocity)) mit
+      REGIME_RANGE / REGIME_TREND / REGIME_CHAOS,
+      REGIME_NONE fuer Kerzen vor dem ersten vollstaendigen Fenster.
+    """
+    vel = velocity.to_numpy(dtype=np.float64)
+    acc = acceleration.to_numpy(dtype=np.float64)
+    n   = len(vel)
+    out = np.full(n, REGIME_NONE, dtype=np.int8)
+    if window < 1 or n < window:
+        return out
+
+    vel_win = np.lib.stride_tricks.sliding_window_view(vel, window)
+    acc_win = np.lib.stride_tricks.sliding_window_view(acc, window)
+    eps = 1e-10
+
+    for start in range(0, len(vel_win), _REGIME_BLOCK):
+        v = vel_win[start:start + _REGIME_BLOCK]
+        a = acc_win[start:start + _REGIME_BLOCK]
+        vel_mean = v.sum(axis=1) / window
+        with np.errstate(invalid='ignore', divide='ignore'):
+            vel_std = np.sqrt(((vel_mean[:, None] - v) ** 2).sum(axis=1) / (window - 1))
+            acc_std = np.sqrt(((a.sum(axis=1)[:, None] / window - a) ** 2).sum(axis=1) / (window - 1))
+        if window < 2:
+            vel_std[:] = np.nan
+            acc_std[:] = np.nan
+
+        chaos_ratio     = acc_std / (vel_std + eps)
+        vel_consistency = np.abs(vel_mean) / (vel_std + eps)
+
+        codes = np.where(vel_consistency > TREND_CONSISTENCY_THRESHOLD, REGIME_TREND, REGIME_RANGE)
+        codes = np.where(chaos_ratio > CHAOS_RATIO_THRESHOLD, REGIME_CHAOS, codes)
+        out[window - 1 + start:window - 1 + start + len(v)] = codes
+
+    return out
+
+
 # ============================================================
 # LAYER 3: Multi-Timeframe Resonanz
 # ============================================================
@@ -216,6 +565,50 @@ def calc_multitf_alignment(df: pd.DataFrame,
     }
 
 
+def calc_multitf_alignment_series(df: pd.DataFrame,
+                                  meso_mult: int = 4,
+                                  macro_mult: int = 16,
+                                  window: int = None) -> pd.DataFrame:
+    """
+    calc_multitf_alignment() fuer jede Kerze in einem Durchlauf (vektorisiert).
+
+    Zeile i entspricht calc_multitf_alignment(df.iloc[max(0, i-window+1):i+1]),
+    bzw. df.iloc[:i+1] wenn window=None - inkl. derselben Stride-Phase:
+    iloc[::mult] beginnt an der ersten Kerze des Fensters, der letzte
+    Meso/Makro-Punkt liegt also (L-1) % mult Kerzen vor i (L = Fensterlaenge).
+
+    Returns DataFrame (Index wie df) mit Spalten
+      micro_trend, meso_trend, macro_trend, aligned, direction
+    """
+    close = df['close'].to_numpy(dtype=np.float64)
+    n     = len(close)
+    pos   = np.arange(n)
+    span  = pos if window is None else np.minimum(pos, window - 1)   # L - 1
+
+    valid = np.ones(n, dtype=bool)
+    trends = []
+    for mult, lookback in [(1, 5), (meso_mult, 4), (macro_mult, 3)]:
+        ok   = span // mult >= lookback
+        last = pos - span % mult
+        prev = last - lookback * mult
+        trend = np.zeros(n)
+        trend[ok] = np.sign(close[last[ok]] - close[prev[ok]])
+        valid &= ok
+        trends.append(trend)
+
+    micro_trend, meso_trend, macro_trend = (np.where(valid, t, 0.0) for t in trends)
+    aligned   = valid & (micro_trend == meso_trend) & (meso_trend == macro_trend) & (micro_trend != 0)
+    direction = np.where(aligned, micro_trend, 0.0)
+
+    return pd.DataFrame({
+        'micro_trend': micro_trend,
+        'meso_trend':  meso_trend,
+        'macro_trend': macro_trend,
+        'aligned':     aligned,
+        'direction':   direction,
+    }, index=df.index)
+
+
 def _no_alignment() -> dict:
     return {
         'micro_trend': 0.0,
@@ -248,7 +641,7 @@ def calc_dominant_period(price: pd.Series, window: int = 64) -> float:
     if n < 8:
         return 0.0
 
-    data = price.iloc[-n:].values.astype(float)
+    data = np.asarray(price, dtype=float)[-n:]
     # Linear-Detrend (entfernt Trend-Komponente vor FFT)
     trend = np.linspace(data[0], data[-1], n)
     data  = data - trend
@@ -42,8 +42,15 @@ Signal-Config Parameter (alle optimierbar via Optuna):
   MDEF Multi-Timeframe:
     use_multitf_filter (0/1), meso_tf_mult, macro_tf_mult
     allow_range_trade (0/1): ob Range-Regime erlaubt ist
+
+Stream-Betrieb (MersStreamState):
+  Inkrementeller Zustand pro Symbol/Timeframe fuer langlaufende Prozesse.
+  update() pro geschlossener Kerze, signal() liefert dasselbe Dict wie
+  get_mers_signal() - ohne die gesamte Historie neu zu berechnen.
 """
 
+from collections import deque
+
 import numpy as np
 import pandas as pd
 
@@ -57,6 +64,9 @@ from mbot.strategy.mdef_analysis import (
     classify_phase_regime,
     calc_multitf_alignment,
     calc_dominant_period,
+    _classify_regime_values,
+    _entropy_block,
+    _no_alignment,
 )
 
 
@@ -87,30 +97,10 @@ def get_mers_signal(df: pd.DataFrame, signal_config: dict) -> dict:
       mtf_aligned:      bool
       reason:           str
     """
-    # --- Kern-MERS Parameter ---
-    entropy_window   = int(signal_config.get('entropy_window',       20))
-    entropy_lookback = int(signal_config.get('entropy_lookback',     10))
-    energy_lookback  = int(signal_config.get('energy_lookback',       5))
-    min_entropy_drop = float(signal_config.get('min_entropy_drop_pct', 0.05))
-    min_energy_rise  = float(signal_config.get('min_energy_rise_pct',  0.20))
-    atr_period       = int(signal_config.get('atr_period',            14))
-    atr_sl_mult      = float(signal_config.get('atr_sl_mult',          1.5))
-    atr_tp_mult      = float(signal_config.get('atr_tp_mult',          3.0))
-
-    # --- MDEF Regime-Check Parameter ---
-    use_regime_filter = bool(int(signal_config.get('use_regime_filter', 1)))
-    regime_window     = int(signal_config.get('regime_window',         20))
-    allow_range_trade = bool(int(signal_config.get('allow_range_trade',  0)))
-
-    # --- MDEF Multi-Timeframe Parameter ---
-    use_multitf_filter = bool(int(signal_config.get('use_multitf_filter', 0)))
-    meso_tf_mult       = int(signal_config.get('meso_tf_mult',           4))
-    macro_tf_mult      = int(signal_config.get('macro_tf_mult',          16))
+    p = _signal_params(signal_config)
 
     # --- Mindest-Kerzen ---
-    min_required = (entropy_window + max(entropy_lookback, energy_lookback)
-                    + atr_period + max(regime_window, 5) + 5)
-    if len(df) < min_required:
+    if len(df) < p['min_required']:
         return _no_signal('zu wenig Daten', regime='n/a')
 
     # -------------------------------------------------------
@@ -118,41 +108,111 @@ def get_mers_signal(df: pd.DataFrame, signal_config: dict) -> dict:
     # -------------------------------------------------------
     price    = df['close']
     returns  = calc_log_returns(price)
-    entropy  = calc_rolling_entropy(returns, window=entropy_window)
+    entropy  = calc_rolling_entropy(returns, window=p['entropy_window'])
     velocity = calc_velocity(price)
     acc      = calc_acceleration(velocity)
     energy   = calc_energy(velocity)
-    atr_ser  = calc_atr(df, period=atr_period)
+    atr_ser  = calc_atr(df, period=p['atr_period'])
+
+    return _evaluate_mers(
+        p,
+        cur_entropy=entropy.iloc[-1],
+        prev_entropy=entropy.iloc[-(1 + p['entropy_lookback'])],
+        cur_energy=energy.iloc[-1],
+        prev_energy=energy.iloc[-(1 + p['energy_lookback'])],
+        cur_acc=acc.iloc[-1],
+        cur_atr=atr_ser.iloc[-1],
+        entry_price=float(price.iloc[-1]),
+        regime_fn=lambda: classify_phase_regime(velocity, acc, window=p['regime_window']),
+        dominant_period_fn=lambda: calc_dominant_period(price, window=min(64, len(price))),
+        mtf_fn=lambda: calc_multitf_alignment(df, meso_mult=p['meso_tf_mult'],
+                                              macro_mult=p['macro_tf_mult']),
+    )
+
+
+def _signal_params(signal_config: dict) -> dict:
+    """Liest die Signal-Parameter (mit Defaults) und die Mindest-Kerzenzahl."""
+    p = {
+        # --- Kern-MERS Parameter ---
+        'entropy_window':     int(signal_config.get('entropy_window',       20)),
+        'entropy_lookback':   int(signal_config.get('entropy_lookback',     10)),
+        'energy_lookback':    int(signal_config.get('energy_lookback',       5)),
+        'min_entropy_drop':   float(signal_config.get('min_entropy_drop_pct', 0.05)),
+        'min_energy_rise':    float(signal_config.get('min_energy_rise_pct',  0.20)),
+        'atr_period':         int(signal_config.get('atr_period',            14)),
+        'atr_sl_mult':        float(signal_config.get('atr_sl_mult',          1.5)),
+        'atr_tp_mult':        float(signal_config.get('atr_tp_mult',          3.0)),
+
+        # --- MDEF Regime-Check Parameter ---
+        'use_regime_filter':  bool(int(signal_config.get('use_regime_filter', 1))),
+        'regime_window':      int(signal_config.get('regime_window',         20)),
+        'allow_range_trade':  bool(int(signal_config.get('allow_range_trade',  0))),
+
+        # --- MDEF Multi-Timeframe Parameter ---
+        'use_multitf_filter': bool(int(signal_config.get('use_multitf_filter', 0))),
+        'meso_tf_mult':       int(signal_config.get('meso_tf_mult',           4)),
+        'macro_tf_mult':      int(signal_config.get('macro_tf_mult',          16)),
+    }
+    p['min_required'] = (p['entropy_window'] + max(p['entropy_lookback'], p['energy_lookback'])
+                         + p['atr_period'] + max(p['regime_window'], 5) + 5)
+    return p
+
+
+# EMA-ATR (span=atr_period): der Startwert wirkt mit (1 - 2/(span+1))^n nach,
+# nach 5 Perioden Vorlauf < 0.1 % - ATR/SL/TP wie mit voller Historie
+ATR_WARMUP_PERIODS = 5
+
+
+def required_candles(signal_config: dict) -> int:
+    """
+    Geschlossene Kerzen, die get_mers_signal() fuer signal_config braucht:
+    min_required plus ATR_WARMUP_PERIODS * atr_period Vorlauf fuer die
+    EMA-ATR, bei aktivem MTF-Filter mindestens 3 Makro-Schritte.
+    Bestimmt die Abruflaenge im Live-Pfad (run.py) statt fester 200.
+    """
+    p = _signal_params(signal_config)
+    n = p['min_required'] + ATR_WARMUP_PERIODS * p['atr_period']
+    if p['use_multitf_filter']:
+        n = max(n, 4 * p['meso_tf_mult'] + 1, 3 * p['macro_tf_mult'] + 1)
+    return n
 
-    cur_entropy  = entropy.iloc[-1]
-    prev_entropy = entropy.iloc[-(1 + entropy_lookback)]
-    cur_energy   = energy.iloc[-1]
-    prev_energy  = energy.iloc[-(1 + energy_lookback)]
-    cur_acc      = acc.iloc[-1]
-    cur_atr      = atr_ser.iloc[-1]
-    entry_price  = float(price.iloc[-1])
 
+def _evaluate_mers(p: dict, cur_entropy, prev_entropy, cur_energy, prev_energy,
+                   cur_acc, cur_atr, entry_price: float,
+                   regime_fn, dominant_period_fn, mtf_fn) -> dict:
+    """
+    Entscheidungslogik auf den aktuellen Feature-Werten.
+
+    Gemeinsam fuer get_mers_signal() (Batch) und MersStreamState (Stream).
+    Regime, FFT und MTF werden als Callables uebergeben und nur berechnet,
+    wenn die Pruefung bis dorthin kommt.
+    """
     if any(np.isnan(v) for v in [cur_entropy, prev_entropy, cur_energy, prev_energy, cur_acc, cur_atr]):
         return _no_signal('NaN in Berechnungen', regime='n/a')
     if cur_atr <= 0 or entry_price <= 0:
         return _no_signal('ATR oder Preis <= 0', regime='n/a')
 
+    min_entropy_drop   = p['min_entropy_drop']
+    min_energy_rise    = p['min_energy_rise']
+    atr_sl_mult        = p['atr_sl_mult']
+    atr_tp_mult        = p['atr_tp_mult']
+    use_multitf_filter = p['use_multitf_filter']
+
     # -------------------------------------------------------
     # LAYER 2: Phasenraum Regime-Check (MDEF)
     # -------------------------------------------------------
-    regime = classify_phase_regime(velocity, acc, window=regime_window)
+    regime = regime_fn()
 
-    if use_regime_filter:
+    if p['use_regime_filter']:
         if regime == 'chaos':
             return _no_signal(f'Regime=chaos (Phasenraum instabil)', regime=regime)
-        if regime == 'range' and not allow_range_trade:
+        if regime == 'range' and not p['allow_range_trade']:
             return _no_signal(f'Regime=range (kein Momentum)', regime=regime)
 
     # -------------------------------------------------------
     # LAYER 4: FFT - Dominante Periode (informativ, kein Filter)
     # -------------------------------------------------------
-    fft_window     = min(64, len(price))
-    dominant_period = calc_dominant_period(price, window=fft_window)
+    dominant_period = dominant_period_fn()
 
     # -------------------------------------------------------
     # LAYER 1 (Fortsetzung): MERS Entry-Bedingungen
@@ -189,7 +249,7 @@ def get_mers_signal(df: pd.DataFrame, signal_config: dict) -> dict:
     # -------------------------------------------------------
     # LAYER 3: Multi-Timeframe Resonanz (MDEF)
     # -------------------------------------------------------
-    mtf = calc_multitf_alignment(df, meso_mult=meso_tf_mult, macro_mult=macro_tf_mult)
+    mtf = mtf_fn()
 
     if use_multitf_filter:
         if not mtf['aligned']:
@@ -254,6 +314,161 @@ def get_mers_signal(df: pd.DataFrame, signal_config: dict) -> dict:
     }
 
 
+class MersStreamState:
+    """
+    Inkrementeller MERS-Zustand fuer langlaufende Prozesse.
+
+    Nimmt geschlossene Kerzen einzeln entgegen (update()) und haelt nur die
+    Ringpuffer, die das Signal braucht: Rendite-Fenster fuer die Entropy,
+    EMA-ATR, letzte Geschwindigkeit/Beschleunigung (Regime-Fenster),
+    Entropy-/Energie-Lookback und die Schlusskurse fuer FFT und MTF.
+    Kosten pro Kerze: O(entropy_window + regime_window), unabhaengig von
+    der Historienlaenge.
+
+    signal() liefert dasselbe Dict wie get_mers_signal() auf einem DataFrame
+    mit denselben Kerzen (gleicher erster Kerze, da EMA-ATR und MTF-Phase
+    ab der ersten Kerze laufen).
+    """
+
+    def __init__(self, signal_config: dict):
+        self.signal_config = signal_config
+        self.params        = _signal_params(signal_config)
+        p = self.params
+
+        self.count         = 0
+        self.last_ts       = None
+        self._prev_close   = None
+        self._prev_vel     = 0.0
+        self._atr          = np.nan
+        # alpha wie pandas ewm(span=...): com = (span - 1) / 2, alpha = 1 / (1 + com)
+        self._atr_alpha    = 1.0 / (1.0 + (p['atr_period'] - 1) / 2.0)
+
+        self._returns  = deque(maxlen=p['entropy_window'])
+        self._entropy  = deque(maxlen=p['entropy_lookback'] + 1)
+        self._energy   = deque(maxlen=p['energy_lookback'] + 1)
+        self._velocity = deque(maxlen=p['regime_window'])
+        self._acc      = deque(maxlen=p['regime_window'])
+        self._closes   = deque(maxlen=max(64, 6,
+                                          5 * p['meso_tf_mult'],
+                                          4 * p['macro_tf_mult']))
+
+    @classmethod
+    def from_df(cls, df: pd.DataFrame, signal_config: dict) -> 'MersStreamState':
+        """Erzeugt den Zustand aus historischen (geschlossenen) Kerzen."""
+        state = cls(signal_config)
+        timestamps = df.index if isinstance(df.index, pd.DatetimeIndex) else [None] * len(df)
+        for ts, hi, lo, cl in zip(timestamps, df['high'].to_numpy(dtype=np.float64),
+                                  df['low'].to_numpy(dtype=np.float64),
+                                  df['close'].to_numpy(dtype=np.float64)):
+            state.update(hi, lo, cl, timestamp=ts)
+        return state
+
+    def update(self, high: float, low: float, close: float, timestamp=None) -> bool:
+        """
+        Verarbeitet eine geschlossene Kerze.
+        Kerzen mit timestamp <= letztem timestamp werden ignoriert (Returns False).
+        """
+        if timestamp is not None:
+            if self.last_ts is not None and timestamp <= self.last_ts:
+                return False
+            self.last_ts = timestamp
+
+        high, low, close = float(high), float(low), float(close)
+        prev_close = self._prev_close
+
+        # Rendite, Geschwindigkeit, Beschleunigung, Energie (wie diff().fillna(0))
+        if prev_close is None:
+            ret = 0.0
+            vel = 0.0
+            tr  = high - low
+        else:
+            ret = float(np.log(np.float64(close) / prev_close))
+            vel = close - prev_close
+            tr  = max(high - low, abs(high - prev_close), abs(low - prev_close))
+        if np.isnan(ret):
+            ret = 0.0
+        acc = vel - self._prev_vel
+
+        # EMA-ATR (wie pandas ewm(adjust=False).mean())
+        if np.isnan(self._atr):
+            self._atr = tr
+        elif not np.isnan(tr) and self._atr != tr:
+            old_wt = 1.0 - self._atr_alpha
+            self._atr = (old_wt * self._atr + self._atr_alpha * tr) / (old_wt + self._atr_alpha)
+
+        self._returns.append(ret)
+        if len(self._returns) == self._returns.maxlen:
+            window = np.fromiter(self._returns, dtype=np.float64, count=len(self._returns))
+            self._entropy.append(float(_entropy_block(window[None, :], 10)[0]))
+        else:
+            self._entropy.append(np.nan)
+
+        self._energy.append(vel ** 2)
+        self._velocity.append(vel)
+        self._acc.append(acc)
+        self._closes.append(close)
+
+        self._prev_close = close
+        self._prev_vel   = vel
+        self.count      += 1
+        return True
+
+    def signal(self) -> dict:
+        """MERS-Signal fuer die zuletzt verarbeitete Kerze (Format wie get_mers_signal)."""
+        p = self.params
+        if self.count < p['min_required']:
+            return _no_signal('zu wenig Daten', regime='n/a')
+
+        closes = np.fromiter(self._closes, dtype=np.float64, count=len(self._closes))
+        return _evaluate_mers(
+            p,
+            cur_entropy=self._entropy[-1],
+            prev_entropy=self._entropy[0],
+            cur_energy=self._energy[-1],
+            prev_energy=self._energy[0],
+            cur_acc=self._acc[-1],
+            cur_atr=self._atr,
+            entry_price=float(closes[-1]),
+            regime_fn=lambda: _classify_regime_values(
+                np.fromiter(self._velocity, dtype=np.float64, count=len(self._velocity)),
+                np.fromiter(self._acc, dtype=np.float64, count=len(self._acc)),
+            ),
+            dominant_period_fn=lambda: calc_dominant_period(closes, window=min(64, self.count)),
+            mtf_fn=lambda: self._multitf_alignment(closes),
+        )
+
+    def _multitf_alignment(self, closes: np.ndarray) -> dict:
+        """calc_multitf_alignment() auf dem Schlusskurs-Ringpuffer (Stride-Phase ab Kerze 0)."""
+        p      = self.params
+        n      = self.count
+        offset = n - len(closes)
+
+        def _trend(mult: int, lookback: int):
+            last = (n - 1) // mult * mult
+            if last // mult < lookback:
+                return None
+            return float(np.sign(closes[last - offset] - closes[last - lookback * mult - offset]))
+
+        micro_trend = _trend(1, 5)
+        if micro_trend is None:
+            return _no_alignment()
+        meso_trend = _trend(p['meso_tf_mult'], 4)
+        if meso_trend is None:
+            return _no_alignment()
+        macro_trend = _trend(p['macro_tf_mult'], 3)
+        if macro_trend is None:
+            return _no_alignment()
+
+        aligned = (micro_trend == meso_trend == macro_trend) and (micro_trend != 0)
+        return {
+            'micro_trend': micro_trend,
+            'meso_trend':  meso_trend,
+            'macro_trend': macro_trend,
+            'aligned':     aligned,
+            'direction':   micro_trend if aligned else 0.0,
+        }
+
+
 def check_mers_exit(df: pd.DataFrame, signal_config: dict, entry_side: str) -> bool:
     """
     State-basierter Exit (zusaetzlich zu hartem SL/TP via Bitget Trigger).
@@ -39,7 +39,7 @@ from mbot.utils.trade_manager import (
     clear_position,
     read_active_positions,
 )
-from mbot.strategy.mers_signal import get_mers_signal
+from mbot.strategy.mers_signal import get_mers_signal, required_candles
 
 
 # ============================================================
@@ -48,7 +48,7 @@ from mbot.strategy.mers_signal import get_mers_signal
 
 def setup_logging(symbol: str, timeframe: str) -> logging.Logger:
     safe_name = f"{symbol.replace('/', '').replace(':', '')}_{timeframe}"
-    log_dir   = os.path.join(PROJECT_ROOT, 'logs')
+    log_dir   = os.environ.get('MBOT_LOG_DIR', os.path.join(PROJECT_ROOT, 'logs'))
     os.makedirs(log_dir, exist_ok=True)
     log_file  = os.path.join(log_dir, f'mbot_{safe_name}.log')
 
@@ -74,26 +74,20 @@ def setup_logging(symbol: str, timeframe: str) -> logging.Logger:
 # Dekorierte Ausfuehrungs-Funktion
 # ============================================================
 
-@guardian_decorator
-def run_for_account(account: dict, telegram_config: dict,
-                     symbol: str, timeframe: str,
-                     mode: str, settings: dict, logger: logging.Logger):
+def config_path_for(symbol: str, timeframe: str) -> str:
+    safe_name = f"{symbol.replace('/', '').replace(':', '')}_{timeframe}"
+    return os.path.join(PROJECT_ROOT, 'src', 'mbot', 'strategy', 'configs',
+                        f'config_{safe_name}_mers.json')
+
+
+def load_strategy_config(symbol: str, timeframe: str, settings: dict,
+                         logger: logging.Logger) -> tuple:
     """
-    Hauptausfuehrung fuer einen Account.
-    mode='signal': MERS-Signal pruefen und Trade platzieren
-    mode='check':  Offene Position pruefen, state-basierten Exit auswerten
+    MERS Signal-Parameter aus der generierten Config-Datei (Fallback: settings.json).
+    Returns (signal_config, risk_config) - optimierte Risiko-Werte haben Vorrang.
     """
-    logger.info(f"=== mbot MERS Start | {symbol} ({timeframe}) | Modus: {mode} ===")
-
-    exchange    = Exchange(account)
     risk_config = settings.get('risk', {})
-
-    # MERS Signal-Parameter aus generierter Config-Datei laden
-    safe_name   = f"{symbol.replace('/', '').replace(':', '')}_{timeframe}"
-    config_path = os.path.join(
-        PROJECT_ROOT, 'src', 'mbot', 'strategy', 'configs',
-        f'config_{safe_name}_mers.json'
-    )
+    config_path = config_path_for(symbol, timeframe)
     if os.path.exists(config_path):
         with open(config_path, 'r') as cf:
             loaded_cfg = json.load(cf)
@@ -104,7 +98,7 @@ def run_for_account(account: dict, telegram_config: dict,
             risk_config['risk_per_trade_pct'] = signal_config['risk_per_trade_pct']
         if 'leverage' in signal_config:
             risk_config['leverage'] = signal_config['leverage']
-        logger.info(f"Config geladen: config_{safe_name}_mers.json "
+        logger.info(f"Config geladen: {os.path.basename(config_path)} "
                     f"(PnL: {loaded_cfg.get('_meta', {}).get('pnl_pct', '?')}% | "
                     f"Hebel: {risk_config.get('leverage', 5)}x | "
                     f"Risk/Trade: {risk_config.get('risk_per_trade_pct', 1.0):.1f}%)")
@@ -113,7 +107,16 @@ def run_for_account(account: dict, telegram_config: dict,
         logger.warning(f"Keine MERS-Config gefunden fuer {symbol} ({timeframe}). "
                        f"Verwende Defaults aus settings.json. "
                        f"Bitte zuerst run_pipeline.sh ausfuehren.")
+    return signal_config, risk_config
+
 
+def process_strategy(exchange, symbol: str, timeframe: str, mode: str,
+                     signal_config: dict, risk_config: dict,
+                     telegram_config: dict, logger: logging.Logger):
+    """
+    Ein Durchlauf fuer eine Strategie auf einer bestehenden Exchange-Instanz.
+    Gemeinsam fuer den Cron-Pfad (run_for_account) und den Daemon (mbot.strategy.daemon).
+    """
     if mode == 'check':
         # State-basierter Exit deaktiviert — Exit nur via hartem SL/TP (wie Backtester)
         # --- Positions-Check: Ist der Trade noch offen? ---
@@ -134,8 +137,8 @@ def run_for_account(account: dict, telegram_config: dict,
             )
             return
 
-        # OHLCV-Daten laden (mehr Kerzen benoetigt fuer Entropy-Berechnung)
-        df = exchange.fetch_recent_ohlcv(symbol, timeframe, limit=200)
+        # OHLCV-Daten laden: benoetigte geschlossene Kerzen + laufende (Delta ueber den Ringpuffer)
+        df = exchange.fetch_recent_ohlcv(symbol, timeframe, limit=required_candles(signal_config) + 1)
         if df.empty:
             logger.warning(f"Keine OHLCV-Daten fuer {symbol}. Ueberspringe.")
             return
@@ -173,6 +176,23 @@ def run_for_account(account: dict, telegram_config: dict,
         else:
             logger.info(f"MERS Trade fuer {symbol} nicht platziert.")
 
+
+@guardian_decorator
+def run_for_account(account: dict, telegram_config: dict,
+                     symbol: str, timeframe: str,
+                     mode: str, settings: dict, logger: logging.Logger):
+    """
+    Hauptausfuehrung fuer einen Account.
+    mode='signal': MERS-Signal pruefen und Trade platzieren
+    mode='check':  Offene Position pruefen, state-basierten Exit auswerten
+    """
+    logger.info(f"=== mbot MERS Start | {symbol} ({timeframe}) | Modus: {mode} ===")
+
+    exchange = Exchange(account)
+    signal_config, risk_config = load_strategy_config(symbol, timeframe, settings, logger)
+    process_strategy(exchange, symbol, timeframe, mode, signal_config, risk_config,
+                     telegram_config, logger)
+
     logger.info(f"=== mbot MERS Ende | {symbol} ({timeframe}) | Modus: {mode} ===")
 
 
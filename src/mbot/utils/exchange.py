@@ -1,66 +1,194 @@
 # src/mbot/utils/exchange.py
 import ccxt
+import ccxt.async_support as ccxt_async
 import pandas as pd
 from datetime import datetime, timezone
+import asyncio
 import logging
-import time
 from typing import Optional
 
+from mbot.utils import ohlcv_cache
+from mbot.utils.ohlcv_cache import LIVE_OHLCV_BUFFER
+from mbot.utils.markets_cache import MARKETS_CACHE
+from mbot.utils.order_confirm import poll_until
+from mbot.utils.ohlcv_downloader import PAGE_LIMIT, download_ohlcv
+
 logger = logging.getLogger(__name__)
 
+# Mindestgroesse des Live-Ringpuffers (Kerzen pro Symbol/Timeframe)
+LIVE_BUFFER_ROWS = 300
+
+
+def _is_open_position(p: dict) -> bool:
+    try:
+        contracts = p.get('contracts') or p.get('contractSize')
+        return contracts is not None and abs(float(contracts)) > 1e-9
+    except (ValueError, TypeError):
+        return False
+
+
+def _is_final_order(order: Optional[dict]) -> bool:
+    return bool(order) and order.get('status') in ('closed', 'canceled', 'rejected', 'expired')
+
 
 class Exchange:
-    def __init__(self, account_config):
+    def __init__(self, account_config, client=None, markets_cache=MARKETS_CACHE):
+        # client: fertige ccxt-kompatible Instanz (z.B. mbot.utils.fake_exchange.FakeBitget)
         self.account = account_config
-        self.exchange = ccxt.bitget({
+        self.exchange = client or ccxt.bitget({
             'apiKey': self.account.get('apiKey'),
             'secret': self.account.get('secret'),
             'password': self.account.get('password'),
             'options': {'defaultType': 'swap'},
             'enableRateLimit': True,
         })
+        # Markets-Cache nur fuer echte ccxt-Instanzen (set_markets)
+        self.markets_cache = markets_cache if hasattr(self.exchange, 'set_markets') else None
+        self.markets       = self._load_markets()
+
+    def _load_markets(self) -> dict:
+        """Markets aus dem Cache (sofort, bei Ablauf Erneuerung im Hintergrund) oder vom Exchange."""
+        cache = self.markets_cache
+        entry = cache.read(self.exchange.id) if cache is not None else None
+        if entry is not None:
+            try:
+                self.exchange.set_markets(entry['markets'])
+                if cache.is_stale(entry):
+                    cache.refresh_async(self.exchange, on_done=self._set_markets)
+                logger.info(f"Maerkte aus Cache geladen ({len(self.exchange.markets)}).")
+                return self.exchange.markets
+            except Exception as e:
+                logger.warning(f"Markets-Cache unbrauchbar ({e}) - lade vom Exchange.")
         try:
-            self.markets = self.exchange.load_markets()
+            markets = cache.refresh(self.exchange) if cache is not None else self.exchange.load_markets()
             logger.info("Maerkte erfolgreich geladen.")
+            return markets
         except Exception as e:
             logger.critical(f"Maerkte konnten nicht geladen werden: {e}")
-            self.markets = {}
+            return {}
+
+    def _set_markets(self, markets: dict):
+        self.markets = markets
 
     # --- OHLCV ---
 
-    def fetch_recent_ohlcv(self, symbol, timeframe, limit=200):
+    def fetch_recent_ohlcv(self, symbol, timeframe, limit=200, buffer=LIVE_OHLCV_BUFFER):
+        """
+        Die letzten limit Kerzen (inkl. der laufenden als letzte Zeile).
+
+        Abgeschlossene Kerzen liegen im Ringpuffer buffer (mbot.utils.ohlcv_cache);
+        geladen wird nur ab der letzten gespeicherten Kerze - im Normalfall ein
+        Request mit 2-3 Kerzen (letzte gespeicherte zur Kontrolle, neu
+        geschlossene, laufende). buffer=None: alles direkt vom Exchange.
+        """
         if not self.markets:
             return pd.DataFrame()
-        timeframe_ms = self.exchange.parse_timeframe(timeframe) * 1000
-        since = self.exchange.milliseconds() - timeframe_ms * limit
-        all_ohlcv = []
+        plan = self._recent_plan(symbol, timeframe, limit, buffer)
+
+        if buffer is None:
+            all_ohlcv, _ = download_ohlcv(self.exchange, symbol, timeframe, plan['since'], plan['now'])
+            if not all_ohlcv:
+                return pd.DataFrame()
+            df = pd.DataFrame(all_ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
+            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms', utc=True)
+            df.set_index('timestamp', inplace=True)
+            return df.iloc[-limit:]
 
-        while since < self.exchange.milliseconds():
+        rows, _ = download_ohlcv(self.exchange, symbol, timeframe, plan['since'], plan['now'],
+                                 limit=plan['page_limit'])
+        return self._recent_frame(plan, rows, symbol, timeframe, limit, buffer)
+
+    async def fetch_recent_ohlcv_async(self, client, symbol, timeframe, limit=200,
+                                       buffer=LIVE_OHLCV_BUFFER, max_retries=3):
+        """
+        Wie fetch_recent_ohlcv, aber ueber einen asynchronen ccxt-Client
+        (siehe open_async_client), damit viele Symbole gleichzeitig laden.
+
+        Das Delta seit der letzten gepufferten Kerze ist ein einzelner
+        Request; nur ein leerer/veralteter Puffer (mehrere Seiten) laeuft
+        ueber den synchronen Downloader in einem Thread.
+        """
+        if not self.markets:
+            return pd.DataFrame()
+        plan = self._recent_plan(symbol, timeframe, limit, buffer)
+        if buffer is None or plan['pages'] > 1:
+            return await asyncio.to_thread(self.fetch_recent_ohlcv, symbol, timeframe, limit, buffer)
+
+        for attempt in range(max_retries + 1):
             try:
-                ohlcv = self.exchange.fetch_ohlcv(symbol, timeframe, since, 200)
-                if not ohlcv:
-                    break
-                all_ohlcv.extend(ohlcv)
-                since = ohlcv[-1][0] + timeframe_ms
-                time.sleep(self.exchange.rateLimit / 1000)
-            except ccxt.RateLimitExceeded:
-                logger.warning("Rate limit - warte 5s...")
-                time.sleep(5)
-            except Exception as e:
-                logger.error(f"Fehler beim OHLCV-Abruf: {e}")
+                rows = await client.fetch_ohlcv(symbol, timeframe, plan['since'], plan['page_limit'])
                 break
+            except ccxt.NetworkError as e:
+                if attempt == max_retries:
+                    raise
+                delay = 0.5 * 2 ** attempt
+                logger.warning(f"OHLCV {symbol} ({timeframe}): {type(e).__name__} - "
+                               f"Retry {attempt + 1}/{max_retries} in {delay:.2f}s")
+                await asyncio.sleep(delay)
+        rows = [r for r in rows or [] if plan['since'] <= r[0] <= plan['now']]
+        return self._recent_frame(plan, rows, symbol, timeframe, limit, buffer)
 
-        if not all_ohlcv:
-            return pd.DataFrame()
+    def _recent_plan(self, symbol, timeframe, limit, buffer) -> dict:
+        """Zeitfenster und Request-Groesse fuer fetch_recent_ohlcv(_async)."""
+        timeframe_ms = self.exchange.parse_timeframe(timeframe) * 1000
+        now          = self.exchange.milliseconds()
+        since        = now - timeframe_ms * limit
+        # Kerzen mit Start <= last_closed sind abgeschlossen (Bitget: UTC-Raster)
+        last_closed  = now // timeframe_ms * timeframe_ms - timeframe_ms
+        data         = buffer.read(symbol, timeframe) if buffer is not None else None
+        # Delta nur, wenn der Puffer das ganze Fenster abdeckt (sonst z.B. nach
+        # groesserem limit dauerhaft zu wenig Historie) - andernfalls volles Fenster
+        first_needed = since + (-since % timeframe_ms)
+        if data is not None and len(data['timestamp']) and data['timestamp'][0] <= first_needed \
+                and data['timestamp'][-1] >= since - timeframe_ms:
+            since = int(data['timestamp'][-1])
+        delta = (now - since) // timeframe_ms + 1
+        return {
+            'now':         now,
+            'since':       since,
+            'tf_ms':       timeframe_ms,
+            'last_closed': last_closed,
+            'data':        data,
+            'page_limit':  int(min(PAGE_LIMIT, max(2, delta))),
+            'pages':       -(-int(delta) // PAGE_LIMIT),
+        }
+
+    def _recent_frame(self, plan, rows, symbol, timeframe, limit, buffer) -> pd.DataFrame:
+        """Neue Kerzen in den Ringpuffer, DataFrame aus Puffer + laufender Kerze."""
+        data      = plan['data']
+        closed    = [r for r in rows if r[0] <= plan['last_closed']]
+        open_rows = [r for r in rows if r[0] > plan['last_closed']]
+        if closed:
+            data = buffer.update(symbol, timeframe, closed, max_rows=max(limit, LIVE_BUFFER_ROWS))
+        logger.info(f"OHLCV {symbol} ({timeframe}): {len(rows)} Kerze(n) geladen, "
+                    f"Rest aus dem Puffer.")
+        if data is None:
+            data = ohlcv_cache.empty_data()
 
-        df = pd.DataFrame(all_ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
-        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms', utc=True)
-        df.set_index('timestamp', inplace=True)
-        df.sort_index(inplace=True)
-        df = df[~df.index.duplicated(keep='last')]
-        if len(df) > limit:
-            df = df.iloc[-limit:]
-        return df
+        df = ohlcv_cache.to_dataframe(data, plan['now'] - plan['tf_ms'] * limit, plan['last_closed'])
+        if open_rows:
+            df = pd.concat([df, ohlcv_cache.to_dataframe(ohlcv_cache.rows_to_data(open_rows))])
+        return df.iloc[-limit:]
+
+    def open_async_client(self):
+        """
+        Asynchroner ccxt-Client (ccxt.async_support) mit denselben Zugangsdaten
+        und den bereits geladenen Markets (kein zweites load_markets()).
+        Aufrufer schliesst ihn mit await client.close().
+        Injizierte Clients liefern ihren Adapter ueber async_client().
+        """
+        if hasattr(self.exchange, 'async_client'):
+            return self.exchange.async_client()
+        client = getattr(ccxt_async, self.exchange.id)({
+            'apiKey': self.account.get('apiKey'),
+            'secret': self.account.get('secret'),
+            'password': self.account.get('password'),
+            'options': {'defaultType': 'swap'},
+            'enableRateLimit': True,
+        })
+        if self.exchange.markets:
+            client.set_markets(self.exchange.markets)
+        return client
 
     # --- Balance ---
 
@@ -89,7 +217,7 @@ class Exchange:
             logger.error(f"Fehler beim Abrufen des Guthabens: {e}", exc_info=True)
             return 0.0
 
-    # --- Precision helpers ---
+    # --- Precision helpers (aus den gecachten Markets, ohne Request) ---
 
     def amount_to_precision(self, symbol: str, amount: float) -> str:
         try:
@@ -106,7 +234,9 @@ class Exchange:
     def fetch_min_amount_tradable(self, symbol: str) -> float:
         try:
             if symbol not in self.markets:
-                self.markets = self.exchange.load_markets()
+                # Neues Symbol seit dem letzten Cache-Stand -> sofort neu laden
+                self.markets = (self.markets_cache.refresh(self.exchange) if self.markets_cache is not None
+                                else self.exchange.load_markets())
             min_amount = self.markets[symbol].get('limits', {}).get('amount', {}).get('min')
             return float(min_amount) if min_amount is not None else 0.0
         except Exception:
@@ -120,19 +250,37 @@ class Exchange:
         try:
             params = {'productType': 'USDT-FUTURES', 'marginCoin': 'USDT'}
             positions = self.exchange.fetch_positions([symbol], params=params)
-            open_pos = []
-            for p in positions:
-                try:
-                    contracts = p.get('contracts') or p.get('contractSize')
-                    if contracts is not None and abs(float(contracts)) > 1e-9:
-                        open_pos.append(p)
-                except (ValueError, TypeError):
-                    continue
-            return open_pos
+            return [p for p in positions if _is_open_position(p)]
         except Exception as e:
             logger.error(f"Fehler beim Abrufen offener Positionen fuer {symbol}: {e}", exc_info=True)
             return []
 
+    # --- Account-Snapshot (Reconciliation, ein Request statt einer pro Symbol) ---
+
+    def fetch_all_open_positions(self) -> list:
+        """
+        Alle offenen Positionen des Accounts in einem Request.
+        Wirft bei Fehlern (statt [] wie fetch_open_positions) - ein
+        fehlgeschlagener Abruf darf nicht als 'alles geschlossen' gelten.
+        """
+        params    = {'productType': 'USDT-FUTURES', 'marginCoin': 'USDT'}
+        positions = self.exchange.fetch_positions(None, params=params)
+        return [p for p in positions if _is_open_position(p)]
+
+    def fetch_all_open_trigger_orders(self) -> list:
+        """Alle offenen Trigger-Orders (TP/SL) des Accounts in einem Request. Wirft bei Fehlern."""
+        return self.exchange.fetch_open_orders(None, params={'productType': 'USDT-FUTURES', 'stop': True})
+
+    def cancel_trigger_orders_for_symbol(self, symbol: str):
+        """Storniert nur die Trigger-Orders eines Symbols (ein Request, ohne Pause)."""
+        try:
+            self.exchange.cancel_all_orders(symbol, params={'productType': 'USDT-FUTURES', 'stop': True})
+        except ccxt.ExchangeError as e:
+            if not any(x in str(e) for x in ['Order not found', 'no order to cancel', '22001']):
+                logger.error(f"Fehler beim Stornieren der Trigger-Orders fuer {symbol}: {e}")
+        except Exception as e:
+            logger.error(f"Fehler beim Stornieren: {e}")
+
     # --- Margin / Leverage ---
 
     def set_margin_mode(self, symbol: str, margin_mode: str = 'isolated'):
@@ -183,6 +331,33 @@ class Exchange:
             logger.error(f"Fehler bei Market Order: {e}", exc_info=True)
             raise
 
+    def place_market_order_with_tpsl(self, symbol: str, side: str, amount: float,
+                                     sl_price: float, tp_price: float, margin_mode: str = 'isolated'):
+        """
+        Entry-Market-Order mit Bitget-Preset-SL/TP (presetStopLossPrice /
+        presetStopSurplusPrice, ccxt-Params stopLoss/takeProfit): ein Request,
+        die Position ist ab dem Fill geschuetzt. Wirft bei Ablehnung - der
+        Aufrufer faellt dann auf separate Trigger-Orders zurueck.
+        """
+        amount_str = self.amount_to_precision(symbol, amount)
+        sl_str     = self.price_to_precision(symbol, sl_price)
+        tp_str     = self.price_to_precision(symbol, tp_price)
+        params = {
+            'productType': 'USDT-FUTURES',
+            'marginCoin':  'USDT',
+            'marginMode':  margin_mode,
+            'hedged':      True,
+            'reduceOnly':  False,
+            'stopLoss':    {'triggerPrice': float(sl_str)},
+            'takeProfit':  {'triggerPrice': float(tp_str)},
+        }
+        logger.info(f"Market Order mit TP/SL: {side.upper()} {amount_str} {symbol} | SL {sl_str} | TP {tp_str}")
+        try:
+            return self.exchange.create_order(symbol, 'market', side, float(amount_str), params=params)
+        except Exception as e:
+            logger.warning(f"Market Order mit TP/SL fuer {symbol} fehlgeschlagen: {e}")
+            raise
+
     def place_trigger_market_order(self, symbol: str, side: str, amount: float,
                                     trigger_price: float, reduce: bool = False,
                                     hold_side: Optional[str] = None):
@@ -205,14 +380,16 @@ class Exchange:
             logger.error(f"Fehler bei Trigger Order: {e}", exc_info=True)
             raise
 
-    def cancel_all_orders_for_symbol(self, symbol: str):
-        """Storniert alle offenen Orders (normal + trigger)."""
+    def cancel_all_orders_for_symbol(self, symbol: str, timeout: float = None) -> bool:
+        """
+        Storniert alle offenen Orders (normal + trigger) und wartet per Polling,
+        bis keine mehr offen sind (statt fester Pause). Returns True wenn bestaetigt.
+        """
         for stop_flag in [False, True]:
             try:
                 self.exchange.cancel_all_orders(
                     symbol, params={'productType': 'USDT-FUTURES', 'stop': stop_flag}
                 )
-                time.sleep(0.5)
             except ccxt.ExchangeError as e:
                 if any(x in str(e) for x in ['Order not found', 'no order to cancel', '22001']):
                     pass
@@ -220,6 +397,56 @@ class Exchange:
                     logger.error(f"Fehler beim Stornieren von Orders (stop={stop_flag}): {e}")
             except Exception as e:
                 logger.error(f"Fehler beim Stornieren: {e}")
+        return self.wait_for_no_open_orders(symbol, timeout)
+
+    # --- Bestaetigung per Polling (siehe mbot.utils.order_confirm) ---
+
+    def wait_for_order_fill(self, symbol: str, order: dict, timeout: float = None) -> Optional[dict]:
+        """
+        Wartet, bis die Order einen Endzustand hat (closed/canceled/rejected/expired).
+        Meldet schon die Antwort von create_order den Fill, ohne weiteren Request.
+        Returns die Order im Endzustand oder None (Deadline abgelaufen).
+        """
+        if _is_final_order(order):
+            return order
+        order_id = order.get('id') if order else None
+        if not order_id:
+            return None
+
+        def check():
+            current = self.exchange.fetch_order(order_id, symbol, params={'productType': 'USDT-FUTURES'})
+            return current if _is_final_order(current) else None
+
+        result, polls = poll_until(check, timeout, what=f"Fill von Order {order_id} ({symbol})")
+        if result is not None:
+            logger.info(f"Order {order_id} {result['status']} nach {polls} Abfrage(n).")
+        return result
+
+    def wait_for_no_open_orders(self, symbol: str, timeout: float = None) -> bool:
+        """Wartet, bis fuer symbol keine normale und keine Trigger-Order mehr offen ist."""
+        def check():
+            return all(not self.exchange.fetch_open_orders(
+                           symbol, params={'productType': 'USDT-FUTURES', 'stop': stop_flag})
+                       for stop_flag in [False, True])
+
+        result, _ = poll_until(check, timeout, what=f"Storno der Orders fuer {symbol}")
+        return bool(result)
+
+    def wait_for_position_closed(self, symbol: str, side: Optional[str] = None,
+                                 timeout: float = None) -> bool:
+        """
+        Wartet, bis keine Position (bzw. keine Position mit side) fuer symbol offen ist.
+        Fehlgeschlagene Abrufe zaehlen nicht als geschlossen.
+        """
+        params = {'productType': 'USDT-FUTURES', 'marginCoin': 'USDT'}
+
+        def check():
+            positions = self.exchange.fetch_positions([symbol], params=params)
+            return not any(_is_open_position(p) and (side is None or p.get('side') == side)
+                           for p in positions)
+
+        result, _ = poll_until(check, timeout, what=f"Schliessen der Position {symbol}")
+        return bool(result)
 
     def close_position(self, symbol: str):
         """Schliesst eine offene Position via Market Order."""
@@ -0,0 +1,577 @@
+# src/mbot/utils/fake_exchange.py
+"""
+Lokaler Bitget-Ersatz (in-process) fuer Offline-Tests und Soak-Laeufe.
+
+Implementiert den Teil der ccxt-API, den mbot.utils.exchange.Exchange nutzt:
+  load_markets, fetch_ohlcv, fetch_balance, fetch_positions,
+  set_margin_mode, set_leverage, create_order (Market + Trigger, Market mit
+  Preset-SL/TP ueber params stopLoss/takeProfit),
+  cancel_all_orders, fetch_open_orders, fetch_order, Precision-Helfer
+
+Kerzen kommen aus dem OHLCV-Store (mbot.utils.ohlcv_cache). Die Uhr ist
+simuliert: advance() spielt die Kerzen des Replay-Timeframes ab und prueft
+dabei die Trigger-Orders (Matching-Engine). Market-Orders fuellen zum
+aktuellen Kurs (Open der laufenden Kerze), Trigger zum Triggerpreis.
+Loesen in einer Kerze mehrere Trigger aus, gewinnt der naeher am Open.
+
+Preset-SL/TP werden wie bei Bitget vor dem Fill gegen den Kurs geprueft
+(ungueltig -> InvalidOrder, preset_tpsl=False -> BadRequest), als
+Trigger-Orders mit planType profit_loss angelegt (fetch_open_orders mit
+params planType) und verfallen, sobald die Position geschlossen ist.
+
+Bestaetigung von Market-Orders wie bei Bitget:
+  ack_only     : create_order liefert nur die Order-ID (Status/Fill offen)
+  pending_polls: fetch_order meldet eine Market-Order die ersten N Male
+                 noch als 'open' (Verarbeitung beim Exchange)
+
+Positionen im Hedge-Modus (eine Long- und eine Short-Position pro Symbol),
+isolierte Margin = Notional / Hebel, Gebuehr fee_rate pro Fill.
+
+Latenz und Fehler lassen sich pro Aufruf einspielen:
+  latency     : Sekunden oder Callable(methode) -> Sekunden
+  error_rate  : Wahrscheinlichkeit fuer ccxt.RequestTimeout (vor der Wirkung)
+  error_methods: nur diese Methoden stoeren (None = alle)
+  fail_next() : gezielt die naechsten Aufrufe einer Methode scheitern lassen
+
+async_client() liefert einen asynchronen Adapter (AsyncFakeBitget) fuer
+Exchange.open_async_client / mbot.strategy.concurrent_signals.
+
+Nutzung:
+  fake     = FakeBitget(cache, timeframe='15m', start_ts=..., balance=1000.0)
+  exchange = Exchange({}, client=fake)
+"""
+
+import os
+import glob
+import asyncio
+import json
+import time
+import math
+import random
+import logging
+import threading
+from collections import Counter, defaultdict, deque
+
+import ccxt
+import numpy as np
+
+from mbot.utils.ohlcv_cache import OHLCV_CACHE, INDEX_FILE
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MARKET = {
+    'amount_decimals': 4,
+    'price_decimals':  6,
+    'min_amount':      0.001,
+}
+
+
+class FakeBitget:
+    """ccxt.bitget-Ersatz mit simulierter Uhr und Matching-Engine."""
+
+    id = 'fakebitget'
+
+    def __init__(self, cache=OHLCV_CACHE, timeframe: str = '15m', start_ts: int = None,
+                 balance: float = 1000.0, fee_rate: float = 0.0006, symbols: list = None,
+                 markets: dict = None, latency=0.0, error_rate: float = 0.0,
+                 error_methods=None, seed: int = 0, sleep=time.sleep, preset_tpsl: bool = True,
+                 ack_only: bool = False, pending_polls: int = 0):
+        self.cache         = cache
+        self.timeframe     = timeframe
+        self.tf_ms         = self.parse_timeframe(timeframe) * 1000
+        self.fee_rate      = float(fee_rate)
+        self.latency       = latency
+        self.error_rate    = float(error_rate)
+        self.error_methods = set(error_methods) if error_methods else None
+        self.preset_tpsl   = preset_tpsl
+        self.ack_only      = ack_only
+        self.pending_polls = int(pending_polls)
+        self.calls         = Counter()
+
+        self._rng        = random.Random(seed)
+        self._sleep      = sleep
+        self._lock       = threading.RLock()
+        self._local      = threading.local()
+        self._failures   = defaultdict(deque)
+        self._candles    = {}
+        self._cash       = float(balance)
+        self._positions  = {}          # (symbol, 'long'|'short') -> dict
+        self._leverage   = {}
+        self._orders     = {}
+        self._order_seq  = 0
+        self._markets    = self._build_markets(symbols, markets or {})
+
+        if start_ts is None:
+            firsts   = [int(self._series(s)[0][0]) for s in self._markets if len(self._series(s)[0])]
+            start_ts = max(firsts) if firsts else 0
+        self.now_ms = int(start_ts)
+
+    # ------------------------------------------------------------------
+    # Stoerungen
+    # ------------------------------------------------------------------
+
+    def fail_next(self, method: str, error: Exception = None, times: int = 1):
+        """Die naechsten times Aufrufe von method werfen error (Standard: RequestTimeout)."""
+        for _ in range(times):
+            self._failures[method].append(error or ccxt.RequestTimeout(f'fake {method}: timeout'))
+
+    def _delay(self, method: str) -> float:
+        return self.latency(method) if callable(self.latency) else self.latency
+
+    def _call(self, method: str):
+        self.calls[method] += 1
+        delay = self._delay(method)
+        # Im Async-Adapter wurde die Latenz bereits per asyncio.sleep abgewartet
+        if delay and not getattr(self._local, 'awaited', False):
+            self._sleep(delay)
+        with self._lock:
+            if self._failures[method]:
+                raise self._failures[method].popleft()
+            if self.error_rate and (self.error_methods is None or method in self.error_methods) \
+                    and self._rng.random() < self.error_rate:
+                raise ccxt.RequestTimeout(f'fake {method}: injizierter Fehler')
+
+    def async_client(self) -> 'AsyncFakeBitget':
+        """Gegenstueck zu ccxt.async_support (siehe Exchange.open_async_client)."""
+        return AsyncFakeBitget(self)
+
+    # ------------------------------------------------------------------
+    # Maerkte / Uhr / Precision
+    # ------------------------------------------------------------------
+
+    def _build_markets(self, symbols, overrides: dict) -> dict:
+        if symbols is None:
+            symbols = self._cached_symbols()
+        markets = {}
+        for symbol in list(symbols) + [s for s in overrides if s not in symbols]:
+            spec = dict(DEFAULT_MARKET, **overrides.get(symbol, {}))
+            base, quote = symbol.split(':')[0].split('/')
+            markets[symbol] = {
+                'id':           symbol.replace('/', '').replace(':USDT', ''),
+                'symbol':       symbol,
+                'base':         base,
+                'quote':        quote,
+                'settle':       'USDT',
+                'type':         'swap',
+                'swap':         True,
+                'contract':     True,
+                'linear':       True,
+                'contractSize': 1.0,
+                'active':       True,
+                'precision':    {'amount': 10.0 ** -spec['amount_decimals'],
+                                 'price':  10.0 ** -spec['price_decimals']},
+                'limits':       {'amount': {'min': spec['min_amount'], 'max': None}},
+                '_spec':        spec,
+            }
+        return markets
+
+    def _cached_symbols(self) -> list:
+        """Alle Symbole, fuer die der Store Kerzen im Replay-Timeframe hat."""
+        if self.cache is None:
+            return []
+        symbols = []
+        for path in sorted(glob.glob(os.path.join(self.cache.cache_dir, f'*_{self.timeframe}', INDEX_FILE))):
+            try:
+                with open(path) as f:
+                    symbols.append(json.load(f)['symbol'])
+            except (OSError, ValueError, KeyError):
+                continue
+        return symbols
+
+    def load_markets(self, reload: bool = False) -> dict:
+        self._call('load_markets')
+        return self._markets
+
+    @property
+    def markets(self) -> dict:
+        return self._markets
+
+    def market(self, symbol: str) -> dict:
+        if symbol not in self._markets:
+            raise ccxt.BadSymbol(f'fake bitget does not have market symbol {symbol}')
+        return self._markets[symbol]
+
+    def milliseconds(self) -> int:
+        return self.now_ms
+
+    @staticmethod
+    def parse8601(text):
+        return ccxt.Exchange.parse8601(text)
+
+    @staticmethod
+    def iso8601(ts):
+        return ccxt.Exchange.iso8601(ts)
+
+    @staticmethod
+    def parse_timeframe(timeframe):
+        return ccxt.Exchange.parse_timeframe(timeframe)
+
+    def amount_to_precision(self, symbol: str, amount: float) -> str:
+        decimals = self.market(symbol)['_spec']['amount_decimals']
+        step     = 10 ** decimals
+        # Bitget/ccxt: Menge wird abgeschnitten, nicht gerundet
+        return f'{math.floor(float(amount) * step + 1e-9) / step:.{decimals}f}'
+
+    def price_to_precision(self, symbol: str, price: float) -> str:
+        decimals = self.market(symbol)['_spec']['price_decimals']
+        return f'{round(float(price), decimals):.{decimals}f}'
+
+    # ------------------------------------------------------------------
+    # Kerzen
+    # ------------------------------------------------------------------
+
+    def _series(self, symbol: str, timeframe: str = None) -> tuple:
+        timeframe = timeframe or self.timeframe
+        key = (symbol, timeframe)
+        if key not in self._candles:
+            data = self.cache.read(symbol, timeframe) if self.cache is not None else None
+            if data is None:
+                self._candles[key] = (np.empty(0, dtype=np.int64), np.empty((5, 0)))
+            else:
+                self._candles[key] = (np.asarray(data['timestamp']), np.asarray(data['ohlcv']))
+        return self._candles[key]
+
+    def _current_candle(self, symbol: str):
+        """(Index, ts, ohlcv) der Replay-Kerze, die now_ms enthaelt (oder die letzte davor)."""
+        ts, ohlcv = self._series(symbol)
+        i = int(np.searchsorted(ts, self.now_ms, side='right')) - 1
+        if i < 0:
+            raise ccxt.ExchangeError(f'fake bitget: keine Kerzen fuer {symbol} vor {self.now_ms}')
+        return i, ts, ohlcv
+
+    def price(self, symbol: str) -> float:
+        """Aktueller Kurs: Open der laufenden Kerze (Close, wenn keine neuere existiert)."""
+        i, ts, ohlcv = self._current_candle(symbol)
+        return float(ohlcv[0, i] if ts[i] + self.tf_ms > self.now_ms else ohlcv[3, i])
+
+    def fetch_ohlcv(self, symbol: str, timeframe: str = '1m', since: int = None,
+                    limit: int = None, params: dict = None) -> list:
+        self._call('fetch_ohlcv')
+        self.market(symbol)
+        ts, ohlcv = self._series(symbol, timeframe)
+        hi = int(np.searchsorted(ts, self.now_ms, side='right'))
+        lo = 0 if since is None else int(np.searchsorted(ts, since, side='left'))
+        if limit:
+            hi = min(hi, lo + int(limit)) if since is not None else hi
+            lo = max(lo, hi - int(limit))
+        rows = [[int(ts[i]), *map(float, ohlcv[:, i])] for i in range(lo, hi)]
+        # Laufende Kerze: bis zum aktuellen Zeitpunkt nur der Open bekannt
+        tf_ms = self.parse_timeframe(timeframe) * 1000
+        if rows and rows[-1][0] + tf_ms > self.now_ms:
+            o = rows[-1][1]
+            rows[-1] = [rows[-1][0], o, o, o, o, 0.0]
+        return rows
+
+    # ------------------------------------------------------------------
+    # Konto / Positionen
+    # ------------------------------------------------------------------
+
+    def _used_margin(self) -> float:
+        return sum(p['margin'] for p in self._positions.values())
+
+    def _unrealized(self, pos: dict) -> float:
+        mark = self.price(pos['symbol'])
+        sign = 1.0 if pos['side'] == 'long' else -1.0
+        return sign * (mark - pos['entry']) * pos['contracts']
+
+    def fetch_balance(self, params: dict = None) -> dict:
+        self._call('fetch_balance')
+        with self._lock:
+            used  = self._used_margin()
+            upnl  = sum(self._unrealized(p) for p in self._positions.values())
+            free  = self._cash - used
+            total = self._cash + upnl
+        return {
+            'USDT':  {'free': free, 'used': used, 'total': total},
+            'free':  {'USDT': free},
+            'used':  {'USDT': used},
+            'total': {'USDT': total},
+            'info':  [{'marginCoin': 'USDT', 'available': str(free), 'equity': str(total)}],
+        }
+
+    def set_margin_mode(self, margin_mode: str, symbol: str = None, params: dict = None):
+        self._call('set_margin_mode')
+        self.market(symbol)
+        if margin_mode.lower() != 'isolated':
+            raise ccxt.NotSupported('fake bitget: nur isolated')
+        return {'info': {'marginMode': margin_mode}}
+
+    def set_leverage(self, leverage: int, symbol: str = None, params: dict = None):
+        self._call('set_leverage')
+        self.market(symbol)
+        with self._lock:
+            self._leverage[symbol] = int(leverage)
+        return {'info': {'leverage': str(leverage)}}
+
+    def fetch_positions(self, symbols: list = None, params: dict = None) -> list:
+        self._call('fetch_positions')
+        with self._lock:
+            out = []
+            for (symbol, side), pos in sorted(self._positions.items()):
+                if symbols and symbol not in symbols:
+                    continue
+                mark = self.price(symbol)
+                out.append({
+                    'symbol':        symbol,
+                    'side':          side,
+                    'contracts':     pos['contracts'],
+                    'contractSize':  1.0,
+                    'entryPrice':    pos['entry'],
+                    'markPrice':     mark,
+                    'notional':      pos['contracts'] * mark,
+                    'leverage':      pos['leverage'],
+                    'collateral':    pos['margin'],
+                    'initialMargin': pos['margin'],
+                    'unrealizedPnl': self._unrealized(pos),
+                    'marginMode':    'isolated',
+                    'hedged':        True,
+                    'timestamp':     pos['timestamp'],
+                    'info':          {'symbol': symbol, 'holdSide': side, 'total': str(pos['contracts'])},
+                })
+            return out
+
+    # ------------------------------------------------------------------
+    # Orders
+    # ------------------------------------------------------------------
+
+    def create_order(self, symbol: str, type: str, side: str, amount: float,
+                     price: float = None, params: dict = None) -> dict:
+        self._call('create_order')
+        params = params or {}
+        market = self.market(symbol)
+        amount = float(self.amount_to_precision(symbol, amount))
+        if amount < market['limits']['amount']['min']:
+            raise ccxt.InvalidOrder(f'fake bitget: Menge {amount} < Minimum {market["limits"]["amount"]["min"]}')
+        if type != 'market':
+            raise ccxt.NotSupported('fake bitget: nur Market- und Trigger-Market-Orders')
+
+        with self._lock:
+            order   = self._new_order(symbol, side, amount, params)
+            trigger = params.get('triggerPrice') or params.get('stopPrice')
+            if trigger is not None:
+                order['triggerPrice'] = float(trigger)
+                # Ausloeserichtung relativ zum Kurs bei Platzierung
+                order['_above']        = order['triggerPrice'] >= self.price(symbol)
+                self._orders[order['id']] = order
+                return _public(order)
+
+            presets = self._presets(symbol, side, params)
+            self._fill(order, self.price(symbol))
+            self._orders[order['id']] = order
+            # Preset-SL/TP (Bitget: planType profit_loss, an die Position gebunden)
+            hold_side = 'long' if side == 'buy' else 'short'
+            for trigger in presets:
+                child = self._new_order(symbol, 'sell' if side == 'buy' else 'buy', order['filled'],
+                                        {'reduceOnly': True, 'holdSide': hold_side})
+                child['triggerPrice']     = trigger
+                child['_above']           = trigger >= order['average']
+                child['_plan']            = 'profit_loss'
+                child['info']['planType'] = 'profit_loss'
+                self._orders[child['id']] = child
+            order['_pending'] = self.pending_polls
+            return _ack(order) if self.ack_only else _public(order)
+
+    def _new_order(self, symbol: str, side: str, amount: float, params: dict) -> dict:
+        self._order_seq += 1
+        return {
+            'id':           f'fake-{self._order_seq}',
+            'clientOrderId': params.get('clientOid'),
+            'symbol':       symbol,
+            'type':         'market',
+            'side':         side,
+            'amount':       amount,
+            'filled':       0.0,
+            'remaining':    amount,
+            'price':        None,
+            'average':      None,
+            'status':       'open',
+            'reduceOnly':   bool(params.get('reduceOnly')),
+            'triggerPrice': None,
+            'timestamp':    self.now_ms,
+            'datetime':     self.iso8601(self.now_ms),
+            'fee':          None,
+            'info':         {'holdSide': params.get('holdSide')},
+        }
+
+    def _presets(self, symbol: str, side: str, params: dict) -> list:
+        """Preset-Triggerpreise (stopLoss/takeProfit) pruefen - wie Bitget vor dem Fill."""
+        presets = [float(params[k]['triggerPrice']) for k in ('stopLoss', 'takeProfit') if params.get(k)]
+        if not presets:
+            return []
+        if not self.preset_tpsl:
+            raise ccxt.BadRequest('fake bitget: preset TP/SL nicht unterstuetzt')
+        price    = self.price(symbol)
+        sl, tp   = params.get('stopLoss'), params.get('takeProfit')
+        sign     = 1.0 if side == 'buy' else -1.0
+        if (sl and sign * (float(sl['triggerPrice']) - price) >= 0) or \
+                (tp and sign * (float(tp['triggerPrice']) - price) <= 0):
+            raise ccxt.InvalidOrder(f'fake bitget: 40917 preset TP/SL ungueltig zum Kurs {price}')
+        return presets
+
+    def _fill(self, order: dict, price: float):
+        """Fuehrt eine Market-Order aus (Hedge-Modus). Reduce ohne Position: storniert."""
+        symbol, amount = order['symbol'], order['amount']
+        if order['reduceOnly']:
+            # sell reduziert Long, buy reduziert Short
+            pos_side = 'long' if order['side'] == 'sell' else 'short'
+            pos      = self._positions.get((symbol, pos_side))
+            if pos is None:
+                order['status'] = 'canceled'
+                return
+            qty  = min(amount, pos['contracts'])
+            sign = 1.0 if pos_side == 'long' else -1.0
+            pnl  = sign * (price - pos['entry']) * qty
+            fee  = qty * price * self.fee_rate
+            self._cash += pnl - fee
+            if qty >= pos['contracts'] - 1e-12:
+                del self._positions[(symbol, pos_side)]
+                # Wie Bitget: Preset-TP/SL verfallen mit der Position
+                for other in self._orders.values():
+                    if other.get('_plan') == 'profit_loss' and other['status'] == 'open' \
+                            and other['symbol'] == symbol and other['info'].get('holdSide') == pos_side:
+                        other['status'] = 'canceled'
+            else:
+                pos['margin']   *= (pos['contracts'] - qty) / pos['contracts']
+                pos['contracts'] -= qty
+        else:
+            pos_side = 'long' if order['side'] == 'buy' else 'short'
+            leverage = self._leverage.get(symbol, 10)
+            margin   = amount * price / leverage
+            fee      = amount * price * self.fee_rate
+            if margin + fee > self._cash - self._used_margin():
+                order['status'] = 'rejected'
+                raise ccxt.InsufficientFunds(
+                    f'fake bitget: Margin {margin:.2f} USDT > frei {self._cash - self._used_margin():.2f} USDT')
+            self._cash -= fee
+            pos = self._positions.get((symbol, pos_side))
+            if pos is None:
+                self._positions[(symbol, pos_side)] = {
+                    'symbol': symbol, 'side': pos_side, 'contracts': amount, 'entry': price,
+                    'margin': margin, 'leverage': leverage, 'timestamp': self.now_ms}
+            else:
+                total        = pos['contracts'] + amount
+                pos['entry'] = (pos['entry'] * pos['contracts'] + price * amount) / total
+                pos['contracts'], pos['margin'] = total, pos['margin'] + margin
+            qty = amount
+
+        order.update(filled=qty, remaining=order['amount'] - qty, price=price, average=price,
+                     status='closed', fee={'currency': 'USDT', 'cost': fee})
+
+    def cancel_all_orders(self, symbol: str = None, params: dict = None) -> list:
+        self._call('cancel_all_orders')
+        stop = bool((params or {}).get('stop') or (params or {}).get('trigger'))
+        with self._lock:
+            canceled = []
+            for order in self._orders.values():
+                if order['status'] != 'open' or (symbol and order['symbol'] != symbol):
+                    continue
+                if (order['triggerPrice'] is not None) == stop:
+                    order['status'] = 'canceled'
+                    canceled.append(_public(order))
+            if not canceled:
+                # Wie Bitget: leere Stornierung ist ein Fehler (Exchange.cancel_all_orders_for_symbol ignoriert ihn)
+                raise ccxt.OrderNotFound('fake bitget: 22001 No order to cancel')
+            return canceled
+
+    def fetch_open_orders(self, symbol: str = None, since: int = None, limit: int = None,
+                          params: dict = None) -> list:
+        self._call('fetch_open_orders')
+        stop = (params or {}).get('stop') or (params or {}).get('trigger')
+        # Trigger-Orders wie Bitget nach planType (Standard normal_plan, Presets: profit_loss)
+        plan = (params or {}).get('planType', 'normal_plan')
+        with self._lock:
+            return [_public(o) for o in self._orders.values()
+                    if o['status'] == 'open' and (symbol is None or o['symbol'] == symbol)
+                    and (stop is None or (o['triggerPrice'] is not None) == bool(stop))
+                    and (not stop or o.get('_plan', 'normal_plan') == plan)]
+
+    def fetch_order(self, id: str, symbol: str = None, params: dict = None) -> dict:
+        self._call('fetch_order')
+        with self._lock:
+            if id not in self._orders:
+                raise ccxt.OrderNotFound(f'fake bitget: Order {id} unbekannt')
+            order = self._orders[id]
+            if order.get('_pending'):
+                order['_pending'] -= 1
+                return dict(_public(order), status='open', filled=0.0, remaining=order['amount'],
+                            price=None, average=None)
+            return _public(order)
+
+    # ------------------------------------------------------------------
+    # Replay / Matching-Engine
+    # ------------------------------------------------------------------
+
+    def advance(self, ms: int = None):
+        """Uhr um ms (Standard: eine Replay-Kerze) vorstellen und Trigger abgleichen."""
+        self.advance_to(self.now_ms + (self.tf_ms if ms is None else int(ms)))
+
+    def advance_to(self, ts: int):
+        with self._lock:
+            start = self.now_ms
+            for symbol in sorted({o['symbol'] for o in self._orders.values() if o['status'] == 'open'}):
+                self._match(symbol, start, ts)
+            self.now_ms = int(ts)
+
+    def _match(self, symbol: str, start: int, end: int):
+        """Trigger gegen alle Replay-Kerzen, die in (start, end] abgeschlossen werden."""
+        ts, ohlcv = self._series(symbol)
+        lo = int(np.searchsorted(ts, start - self.tf_ms, side='right'))
+        hi = int(np.searchsorted(ts, end - self.tf_ms, side='right'))
+        for i in range(lo, hi):
+            o, h, l = ohlcv[0, i], ohlcv[1, i], ohlcv[2, i]
+            hits = [order for order in self._orders.values()
+                    if order['symbol'] == symbol and order['status'] == 'open'
+                    and order['triggerPrice'] is not None
+                    and (h >= order['triggerPrice'] if order['_above'] else l <= order['triggerPrice'])]
+            for order in sorted(hits, key=lambda x: (abs(x['triggerPrice'] - o), x['id'])):
+                if order['status'] != 'open':
+                    continue
+                self.now_ms = int(ts[i])
+                self._fill(order, order['triggerPrice'])
+                logger.debug(f"Fake-Trigger {order['id']} {symbol} @ {order['triggerPrice']}: {order['status']}")
+
+
+class AsyncFakeBitget:
+    """
+    Asynchroner Adapter um eine FakeBitget-Instanz (wie ccxt.async_support):
+    die Latenz wird per asyncio.sleep abgewartet, gleichzeitige Requests
+    ueberlappen sich also wie beim echten async-Client.
+    """
+
+    def __init__(self, fake: FakeBitget):
+        self.fake = fake
+        self.id   = fake.id
+
+    @property
+    def markets(self) -> dict:
+        return self.fake.markets
+
+    async def _run(self, method: str, *args, **kwargs):
+        delay = self.fake._delay(method)
+        if delay:
+            await asyncio.sleep(delay)
+        self.fake._local.awaited = True
+        try:
+            return getattr(self.fake, method)(*args, **kwargs)
+        finally:
+            self.fake._local.awaited = False
+
+    async def fetch_ohlcv(self, symbol: str, timeframe: str = '1m', since: int = None,
+                          limit: int = None, params: dict = None) -> list:
+        return await self._run('fetch_ohlcv', symbol, timeframe, since, limit, params)
+
+    async def close(self):
+        pass
+
+
+def _public(order: dict) -> dict:
+    """Order-Kopie ohne interne Felder (wie von ccxt geliefert)."""
+    return {k: v for k, v in order.items() if not k.startswith('_')}
+
+
+def _ack(order: dict) -> dict:
+    """Antwort von Bitget auf place-order: nur orderId/clientOid, alles andere None."""
+    ack = {k: None for k in _public(order)}
+    ack.update(id=order['id'], clientOrderId=order['clientOrderId'], symbol=order['symbol'],
+               info={'orderId': order['id'], 'clientOid': order['clientOrderId']})
+    return ack
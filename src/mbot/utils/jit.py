@@ -0,0 +1,54 @@
+# src/mbot/utils/jit.py
+"""
+Optionales Numba-JIT Backend fuer die rechenintensiven Kernel
+(Rolling Entropy, Trade-Simulation im Backtester).
+
+Auswahl ueber die Umgebungsvariable MBOT_JIT:
+  auto  (Standard) - Numba wenn importierbar, sonst NumPy
+  numba            - Numba erzwingen (ImportError wenn nicht installiert)
+  numpy            - reine NumPy-Pfade erzwingen
+
+Kompilierte Kernel werden auf Disk gecacht (cache=True), damit per Cron
+gestartete Prozesse die Kompilierung nicht bei jedem Start bezahlen.
+Cache-Verzeichnis: NUMBA_CACHE_DIR, Standard artifacts/numba_cache.
+"""
+
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+
+JIT_MODE = os.environ.get('MBOT_JIT', 'auto').strip().lower()
+if JIT_MODE not in ('auto', 'numba', 'numpy'):
+    logger.warning(f"Unbekannter MBOT_JIT-Wert '{JIT_MODE}' - verwende 'auto'.")
+    JIT_MODE = 'auto'
+
+NUMBA_ENABLED = False
+if JIT_MODE != 'numpy':
+    # Muss vor dem Numba-Import gesetzt sein
+    os.environ.setdefault('NUMBA_CACHE_DIR', os.path.join(PROJECT_ROOT, 'artifacts', 'numba_cache'))
+    try:
+        import numba
+        NUMBA_ENABLED = True
+    except ImportError:
+        if JIT_MODE == 'numba':
+            raise ImportError("MBOT_JIT=numba gesetzt, aber numba ist nicht installiert.")
+        logger.debug("numba nicht installiert - verwende NumPy-Pfade.")
+
+
+def njit(func):
+    """
+    Kompiliert func mit numba.njit(cache=True), falls das Backend aktiv ist.
+    Ohne Numba bleibt func eine normale Python-Funktion (gleiche Semantik,
+    wird von den Aufrufern dann aber nicht im Hot Path verwendet).
+    """
+    if NUMBA_ENABLED:
+        return numba.njit(cache=True)(func)
+    return func
+
+
+def backend_name() -> str:
+    """'numba' oder 'numpy' (fuer Logging / Benchmark-Ausgaben)."""
+    return 'numba' if NUMBA_ENABLED else 'numpy'
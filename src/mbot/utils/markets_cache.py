@@ -0,0 +1,122 @@
+# src/mbot/utils/markets_cache.py
+"""
+Markets-Cache auf der Platte fuer Exchange.__init__.
+
+load_markets() bei Bitget laedt mehrere MB und dauert Sekunden - bisher in
+jedem run.py-Prozess, im Optimizer, Portfolio-Optimizer und show_results.
+Stattdessen wird die Antwort unter artifacts/markets/<exchange>_swap.json
+abgelegt und beim Start sofort per set_markets() gesetzt. Ist der Eintrag
+aelter als die TTL, wird er im Hintergrund erneuert (der Prozess arbeitet
+solange mit dem alten Stand weiter).
+
+Dateiformat (versioniert):
+  schema       : MARKETS_SCHEMA_VERSION - bei Aenderung wird die Datei ignoriert
+  exchange     : ccxt-ID (z.B. 'bitget')
+  ccxt_version : ccxt-Version beim Schreiben (andere Version = neu laden)
+  fetched_at   : ms seit Epoch
+  markets      : ccxt-Markets (Symbol -> Market-Dict)
+
+Konfiguration: MBOT_MARKETS_CACHE=0 (aus), MBOT_MARKETS_TTL (Sekunden,
+Standard 6h), MBOT_MARKETS_CACHE_DIR.
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+
+import ccxt
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+
+MARKETS_SCHEMA_VERSION = 1
+
+DEFAULT_TTL = float(os.environ.get('MBOT_MARKETS_TTL', 6 * 3600))
+
+
+class MarketsCache:
+    """JSON-Datei pro Exchange mit TTL; refresh() laedt synchron, refresh_async() im Hintergrund."""
+
+    def __init__(self, cache_dir: str = None, ttl: float = DEFAULT_TTL):
+        self.cache_dir = cache_dir or os.environ.get(
+            'MBOT_MARKETS_CACHE_DIR', os.path.join(PROJECT_ROOT, 'artifacts', 'markets'))
+        self.ttl       = float(ttl)
+        self._lock     = threading.Lock()
+        self._running  = set()
+
+    def path(self, exchange_id: str) -> str:
+        return os.path.join(self.cache_dir, f'{exchange_id}_swap.json')
+
+    def read(self, exchange_id: str) -> dict:
+        """Eintrag (dict mit markets, fetched_at, ...) oder None bei fehlender/veralteter Schema-Version."""
+        try:
+            with open(self.path(exchange_id)) as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Markets-Cache {exchange_id} unlesbar ({e}) - wird neu geladen.")
+            return None
+        if entry.get('schema') != MARKETS_SCHEMA_VERSION or entry.get('exchange') != exchange_id \
+                or entry.get('ccxt_version') != ccxt.__version__ or not entry.get('markets'):
+            return None
+        return entry
+
+    def write(self, exchange_id: str, markets: dict):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        entry = {
+            'schema':       MARKETS_SCHEMA_VERSION,
+            'exchange':     exchange_id,
+            'ccxt_version': ccxt.__version__,
+            'fetched_at':   int(time.time() * 1000),
+            'markets':      markets,
+        }
+        path     = self.path(exchange_id)
+        tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(entry, f, default=str)
+        os.replace(tmp_path, path)
+
+    def is_stale(self, entry: dict) -> bool:
+        return time.time() * 1000 - entry.get('fetched_at', 0) > self.ttl * 1000
+
+    def refresh(self, client) -> dict:
+        """load_markets(reload=True) auf client, Ergebnis speichern. Returns die Markets."""
+        markets = client.load_markets(True)
+        try:
+            self.write(client.id, markets)
+        except Exception as e:
+            logger.warning(f"Markets-Cache {client.id} nicht geschrieben: {e}")
+        return markets
+
+    def refresh_async(self, client, on_done=None) -> threading.Thread:
+        """
+        Erneuert den Cache in einem Daemon-Thread (hoechstens einer pro Exchange
+        und Prozess). on_done(markets) wird nach Erfolg aufgerufen.
+        """
+        with self._lock:
+            if client.id in self._running:
+                return None
+            self._running.add(client.id)
+
+        def _run():
+            try:
+                markets = self.refresh(client)
+                if on_done:
+                    on_done(markets)
+                logger.info(f"Markets-Cache {client.id} im Hintergrund erneuert ({len(markets)} Maerkte).")
+            except Exception as e:
+                logger.warning(f"Markets-Cache {client.id}: Hintergrund-Erneuerung fehlgeschlagen: {e}")
+            finally:
+                with self._lock:
+                    self._running.discard(client.id)
+
+        thread = threading.Thread(target=_run, name=f'markets-refresh-{client.id}', daemon=True)
+        thread.start()
+        return thread
+
+
+MARKETS_CACHE = MarketsCache() if os.environ.get('MBOT_MARKETS_CACHE', '1') != '0' else None
@@ -0,0 +1,324 @@
+# src/mbot/utils/ohlcv_cache.py
+"""
+Lokaler OHLCV-Store (ein Verzeichnis pro Symbol/Timeframe).
+
+Ablage unter artifacts/ohlcv_cache/<SYMBOL>_<TF>/:
+  index.json           : Generation, Zeilenzahl, erster/letzter Timestamp,
+                         bereits erfolglos abgefragte Bereiche
+  timestamp.<gen>.npy  : int64, ms seit Epoch
+  ohlcv.<gen>.npy      : float64 [5, n] - je Spalte (open, high, low, close,
+                         volume) ein zusammenhaengender Block
+
+Gelesen wird per np.memmap (read-only): alle Prozesse (Optimizer,
+Portfolio-Optimizer, show_results, interactive_chart) teilen sich dieselben
+Seiten im Page-Cache statt eigener Kopien. arrays() liefert Zero-Copy-Views,
+frame() einen DataFrame direkt auf dem Mapping.
+
+Updates schreiben eine neue Generation (jede .npy erst als Temp-Datei,
+dann os.replace) und ersetzen index.json atomar; offene Mappings alter
+Generationen bleiben gueltig. Lesen-Aendern-Schreiben laeuft unter einem
+Datei-Lock pro Symbol/Timeframe (.lock, fcntl bzw. msvcrt), damit mehrere
+Prozesse (Optimizer, Scheduler, Live-Pfad) sich nicht gegenseitig
+Generationen ueberschreiben. Gespeichert werden nur abgeschlossene Kerzen.
+
+Abschalten: MBOT_OHLCV_CACHE=0, anderes Verzeichnis: MBOT_OHLCV_CACHE_DIR.
+Live-Ringpuffer (LIVE_OHLCV_BUFFER, artifacts/live_ohlcv): MBOT_LIVE_OHLCV_BUFFER=0
+bzw. MBOT_LIVE_OHLCV_DIR.
+"""
+
+import os
+import json
+import glob
+import logging
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+
+COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+INDEX_FILE = 'index.json'
+
+LOCK_FILE = '.lock'
+
+
+class OHLCVCache:
+    """Memmap-Store fuer Kerzen mit Merge (neue Kerzen ersetzen alte)."""
+
+    def __init__(self, cache_dir: str = None):
+        self.cache_dir = cache_dir or os.environ.get(
+            'MBOT_OHLCV_CACHE_DIR', os.path.join(PROJECT_ROOT, 'artifacts', 'ohlcv_cache'))
+        self._lock      = threading.Lock()
+        self._key_locks = {}
+
+    def lock(self, symbol: str, timeframe: str) -> threading.Lock:
+        """Lock pro Symbol/Timeframe: parallele Loader laden fehlende Bereiche nur einmal."""
+        with self._lock:
+            return self._key_locks.setdefault((symbol, timeframe), threading.Lock())
+
+    @contextmanager
+    def file_lock(self, symbol: str, timeframe: str):
+        """Prozessuebergreifender exklusiver Lock fuer Symbol/Timeframe (blockierend)."""
+        path = self.path(symbol, timeframe)
+        os.makedirs(path, exist_ok=True)
+        with open(os.path.join(path, LOCK_FILE), 'a+b') as f:
+            _lock_file(f)
+            try:
+                yield
+            finally:
+                _unlock_file(f)
+
+    def path(self, symbol: str, timeframe: str) -> str:
+        safe = symbol.replace('/', '').replace(':', '')
+        return os.path.join(self.cache_dir, f'{safe}_{timeframe}')
+
+    def index(self, symbol: str, timeframe: str) -> dict:
+        """Inhalt von index.json (Generation, rows, first_ts, last_ts, ...) oder None."""
+        try:
+            with open(os.path.join(self.path(symbol, timeframe), INDEX_FILE)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"OHLCV-Index {symbol} ({timeframe}) unlesbar ({e}) - wird neu aufgebaut.")
+            return None
+
+    def read(self, symbol: str, timeframe: str) -> dict:
+        """
+        Returns dict mit 'timestamp' (int64 ms), 'ohlcv' (float64 [5, n]), den
+        Spalten als Views und 'empty_ranges' (int64 [k, 2], inklusive Grenzen)
+        - alles read-only auf dem Mapping - oder None.
+        """
+        for _ in range(3):
+            index = self.index(symbol, timeframe)
+            if index is None:
+                return None
+            try:
+                return self._map(self.path(symbol, timeframe), index)
+            except FileNotFoundError:
+                # Generation wurde gerade ersetzt - Index neu lesen
+                continue
+            except Exception as e:
+                logger.warning(f"OHLCV-Store {symbol} ({timeframe}) unlesbar ({e}) - wird neu aufgebaut.")
+                return None
+        return None
+
+    def arrays(self, symbol: str, timeframe: str, start_ts: int = None, end_ts: int = None) -> dict:
+        """Zero-Copy-Views (timestamp + OHLCV-Spalten) fuer [start_ts, end_ts], oder None."""
+        data = self.read(symbol, timeframe)
+        if data is None:
+            return None
+        lo, hi = _bounds(data['timestamp'], start_ts, end_ts)
+        out = {'timestamp': data['timestamp'][lo:hi]}
+        out.update({c: data[c][lo:hi] for c in COLUMNS})
+        return out
+
+    def frame(self, symbol: str, timeframe: str, start_ts: int = None, end_ts: int = None) -> pd.DataFrame:
+        """DataFrame-View auf dem Mapping (OHLCV ohne Kopie), leer wenn nichts gespeichert."""
+        data = self.read(symbol, timeframe)
+        return to_dataframe(data or empty_data(), start_ts, end_ts)
+
+    def write(self, symbol: str, timeframe: str, data: dict):
+        with self._lock, self.file_lock(symbol, timeframe):
+            self._write(symbol, timeframe, data)
+
+    def _write(self, symbol: str, timeframe: str, data: dict):
+        """Neue Generation schreiben - nur unter file_lock() aufrufen."""
+        path  = self.path(symbol, timeframe)
+        index = self.index(symbol, timeframe) or {}
+        gen   = int(index.get('generation', 0)) + 1
+        ts    = np.ascontiguousarray(data['timestamp'], dtype=np.int64)
+        ohlcv = np.ascontiguousarray(np.vstack([data[c] for c in COLUMNS]), dtype=np.float64)
+
+        suffix = f'{os.getpid()}.{threading.get_ident()}.tmp'
+        for name, values in (('timestamp', ts), ('ohlcv', ohlcv)):
+            tmp_path = os.path.join(path, f'{name}.{gen}.npy.{suffix}')
+            with open(tmp_path, 'wb') as f:
+                np.save(f, values)
+            os.replace(tmp_path, os.path.join(path, f'{name}.{gen}.npy'))
+        index = {
+            'symbol':       symbol,
+            'timeframe':    timeframe,
+            'generation':   gen,
+            'rows':         int(len(ts)),
+            'first_ts':     int(ts[0]) if len(ts) else None,
+            'last_ts':      int(ts[-1]) if len(ts) else None,
+            'columns':      list(COLUMNS),
+            'empty_ranges': np.asarray(data['empty_ranges'], dtype=np.int64).reshape(-1, 2).tolist(),
+            'updated_at':   datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        }
+        tmp_path = os.path.join(path, f'{INDEX_FILE}.{suffix}')
+        with open(tmp_path, 'w') as f:
+            json.dump(index, f, indent=2)
+        os.replace(tmp_path, os.path.join(path, INDEX_FILE))
+
+        # Alte Generationen entfernen (bestehende Mappings bleiben gueltig)
+        for old in glob.glob(os.path.join(path, '*.npy')):
+            if not old.endswith(f'.{gen}.npy'):
+                try:
+                    os.remove(old)
+                except OSError:
+                    pass
+
+    def update(self, symbol: str, timeframe: str, rows: list = (),
+               empty_ranges: list = (), max_rows: int = None) -> dict:
+        """
+        Fuegt Kerzen [ts, o, h, l, c, v] (und leere Bereiche) zum Store hinzu.
+        Doppelte Timestamps: die neue Kerze gewinnt. max_rows: nur die neuesten
+        Kerzen behalten (Ringpuffer). Returns den neuen Stand.
+        """
+        with self._lock, self.file_lock(symbol, timeframe):
+            data = self.read(symbol, timeframe) or empty_data()
+            data = {'timestamp': data['timestamp'], 'empty_ranges': data['empty_ranges'],
+                    **{c: data[c] for c in COLUMNS}}
+            if len(rows):
+                new  = np.asarray(rows, dtype=np.float64).reshape(-1, 6)
+                ts   = np.concatenate([new[:, 0].astype(np.int64), data['timestamp']])
+                cols = [np.concatenate([new[:, i + 1], data[c]]) for i, c in enumerate(COLUMNS)]
+                # Erstes Vorkommen je Timestamp behalten = die neue Kerze
+                ts, first = np.unique(ts, return_index=True)
+                data = dict(data, timestamp=ts, **{c: col[first] for c, col in zip(COLUMNS, cols)})
+            if len(empty_ranges):
+                ranges = np.vstack([data['empty_ranges'], np.asarray(empty_ranges, dtype=np.int64)])
+                data['empty_ranges'] = _merge_ranges(ranges)
+            if max_rows is not None and len(data['timestamp']) > max_rows:
+                data = dict(data, **{k: data[k][-max_rows:] for k in ('timestamp', *COLUMNS)})
+                data['empty_ranges'] = data['empty_ranges'][data['empty_ranges'][:, 1] >= data['timestamp'][0]]
+            self._write(symbol, timeframe, data)
+            return self.read(symbol, timeframe)
+
+    @staticmethod
+    def _map(path: str, index: dict) -> dict:
+        gen = index['generation']
+        if index['rows'] == 0:
+            data = empty_data()
+        else:
+            ts    = np.load(os.path.join(path, f'timestamp.{gen}.npy'), mmap_mode='r')
+            ohlcv = np.load(os.path.join(path, f'ohlcv.{gen}.npy'),     mmap_mode='r')
+            data  = {'timestamp': ts, 'ohlcv': ohlcv, **{c: ohlcv[i] for i, c in enumerate(COLUMNS)}}
+        data['empty_ranges'] = np.asarray(index.get('empty_ranges', []), dtype=np.int64).reshape(-1, 2)
+        return data
+
+
+def _lock_file(f):
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        return
+    f.seek(0)
+    while True:
+        try:
+            # LK_LOCK gibt nach ~10s mit OSError auf - weiter warten
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            return
+        except OSError:
+            continue
+
+
+def _unlock_file(f):
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def empty_data() -> dict:
+    ohlcv = np.empty((len(COLUMNS), 0), dtype=np.float64)
+    data  = {'timestamp': np.empty(0, dtype=np.int64), 'ohlcv': ohlcv,
+             'empty_ranges': np.empty((0, 2), dtype=np.int64)}
+    data.update({c: ohlcv[i] for i, c in enumerate(COLUMNS)})
+    return data
+
+
+def rows_to_data(rows: list) -> dict:
+    """Kerzen [ts, o, h, l, c, v] im Format von read() (ohne Mapping)."""
+    arr  = np.asarray(rows, dtype=np.float64).reshape(-1, 6)
+    data = empty_data()
+    data['timestamp'] = arr[:, 0].astype(np.int64)
+    data['ohlcv']     = np.ascontiguousarray(arr[:, 1:].T)
+    data.update({c: data['ohlcv'][i] for i, c in enumerate(COLUMNS)})
+    return data
+
+
+def _bounds(ts: np.ndarray, start_ts: int = None, end_ts: int = None) -> tuple:
+    lo = 0 if start_ts is None else int(np.searchsorted(ts, start_ts, side='left'))
+    hi = len(ts) if end_ts is None else int(np.searchsorted(ts, end_ts, side='right'))
+    return lo, hi
+
+
+def _merge_ranges(ranges: np.ndarray) -> np.ndarray:
+    ranges = ranges[np.argsort(ranges[:, 0], kind='stable')]
+    merged = []
+    for start, end in ranges:
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return np.asarray(merged, dtype=np.int64).reshape(-1, 2)
+
+
+def missing_ranges(data: dict, start_ts: int, end_ts: int, tf_ms: int) -> list:
+    """
+    Bereiche [von, bis] (ms, inklusive) innerhalb [start_ts, end_ts], fuer die
+    weder Kerzen noch ein 'leer'-Vermerk im Cache liegen: Anfang, Luecken, Ende.
+    """
+    ts      = data['timestamp']
+    ts      = ts[(ts >= start_ts) & (ts <= end_ts)]
+    bounds  = np.concatenate([[start_ts - tf_ms], ts, [end_ts + tf_ms]])
+    gaps    = np.flatnonzero(np.diff(bounds) > tf_ms)
+    missing = []
+    for i in gaps:
+        lo, hi = int(bounds[i] + tf_ms), int(bounds[i + 1] - tf_ms)
+        if lo > hi:
+            continue
+        missing.extend(_subtract_ranges(lo, hi, data['empty_ranges']))
+    return missing
+
+
+def _subtract_ranges(lo: int, hi: int, ranges: np.ndarray) -> list:
+    parts = [(lo, hi)]
+    for r_lo, r_hi in ranges:
+        nxt = []
+        for a, b in parts:
+            if r_hi < a or r_lo > b:
+                nxt.append((a, b))
+                continue
+            if a < r_lo:
+                nxt.append((a, int(r_lo) - 1))
+            if b > r_hi:
+                nxt.append((int(r_hi) + 1, b))
+        parts = nxt
+    return parts
+
+
+def to_dataframe(data: dict, start_ts: int = None, end_ts: int = None) -> pd.DataFrame:
+    """
+    Store-Stand (oder Ausschnitt) als DataFrame wie load_data() ihn liefert.
+    Die OHLCV-Spalten zeigen ohne Kopie auf data['ohlcv'] (read-only).
+    """
+    ts     = data['timestamp']
+    lo, hi = _bounds(ts, start_ts, end_ts)
+    index  = pd.to_datetime(np.asarray(ts[lo:hi]), unit='ms', utc=True)
+    df     = pd.DataFrame(data['ohlcv'][:, lo:hi].T, index=index, columns=list(COLUMNS), copy=False)
+    df.index.name = 'timestamp'
+    return df
+
+
+OHLCV_CACHE = OHLCVCache() if os.environ.get('MBOT_OHLCV_CACHE', '1') != '0' else None
+
+# Ringpuffer der letzten Kerzen fuer den Live-Signalpfad (Exchange.fetch_recent_ohlcv)
+LIVE_OHLCV_BUFFER = OHLCVCache(os.environ.get(
+    'MBOT_LIVE_OHLCV_DIR', os.path.join(PROJECT_ROOT, 'artifacts', 'live_ohlcv'))) \
+    if os.environ.get('MBOT_LIVE_OHLCV_BUFFER', '1') != '0' else None
@@ -0,0 +1,134 @@
+# src/mbot/utils/ohlcv_downloader.py
+"""
+Paralleler OHLCV-Download mit gemeinsamem Token-Bucket.
+
+Der angefragte Zeitraum wird in seitenbreite Abschnitte (je limit
+Kerzen) zerlegt, die ein Thread-Pool gleichzeitig laedt. Jeder Request
+holt vorher ein Token aus einem prozessweiten Token-Bucket (Standard:
+Bitget Market-Data-Limit 20 Requests/s pro IP), statt nach jedem Request
+die volle rateLimit-Zeit zu schlafen. RateLimitExceeded und
+Netzwerkfehler werden mit exponentiellem Backoff plus Jitter wiederholt.
+
+Das Ergebnis ist unabhaengig von der Fertigstellungsreihenfolge:
+aufsteigend sortiert, ein Eintrag pro Timestamp.
+
+Konfiguration: MBOT_OHLCV_RATE (Requests/s), MBOT_OHLCV_THREADS.
+"""
+
+import os
+import time
+import random
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import ccxt
+
+logger = logging.getLogger(__name__)
+
+# Bitget: /api/v2/mix/market/candles - 20 Requests/s (IP)
+BITGET_OHLCV_RATE = 20.0
+
+PAGE_LIMIT = 200
+
+
+class TokenBucket:
+    """Thread-sicherer Token-Bucket: rate Tokens/s, hoechstens capacity auf Vorrat."""
+
+    def __init__(self, rate: float, capacity: float = None, clock=time.monotonic, sleep=time.sleep):
+        self.rate      = float(rate)
+        self.capacity  = float(capacity if capacity is not None else rate)
+        self._tokens   = self.capacity
+        self._clock    = clock
+        self._sleep    = sleep
+        self._last     = clock()
+        self._lock     = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0):
+        """Blockiert, bis tokens verfuegbar sind."""
+        while True:
+            with self._lock:
+                now          = self._clock()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+                self._last   = now
+                # Toleranz gegen Rundungsreste (sonst Endlos-Warten auf ~1e-16 Tokens)
+                if self._tokens >= tokens - 1e-9:
+                    self._tokens = max(0.0, self._tokens - tokens)
+                    return
+                wait = (tokens - self._tokens) / self.rate
+            self._sleep(wait)
+
+
+SHARED_BUCKET = TokenBucket(float(os.environ.get('MBOT_OHLCV_RATE', BITGET_OHLCV_RATE)))
+
+DEFAULT_THREADS = int(os.environ.get('MBOT_OHLCV_THREADS', 4))
+
+
+def fetch_page(exchange, symbol: str, timeframe: str, since: int, limit: int = PAGE_LIMIT,
+               bucket: TokenBucket = None, max_retries: int = 5,
+               backoff_base: float = 0.5, backoff_max: float = 30.0) -> list:
+    """Ein fetch_ohlcv-Request ueber den Token-Bucket, mit Retry + Jitter-Backoff."""
+    bucket = bucket or SHARED_BUCKET
+    for attempt in range(max_retries + 1):
+        bucket.acquire()
+        try:
+            return exchange.fetch_ohlcv(symbol, timeframe, since, limit)
+        except ccxt.NetworkError as e:
+            # RateLimitExceeded / DDoSProtection / Timeouts sind NetworkError
+            if attempt == max_retries:
+                raise
+            delay = min(backoff_max, backoff_base * 2 ** attempt) * random.uniform(0.5, 1.5)
+            logger.warning(f"OHLCV {symbol} ({timeframe}): {type(e).__name__} - "
+                           f"Retry {attempt + 1}/{max_retries} in {delay:.2f}s")
+            time.sleep(delay)
+
+
+def download_ohlcv(exchange, symbol: str, timeframe: str, since: int, until: int,
+                   limit: int = PAGE_LIMIT, max_workers: int = None,
+                   bucket: TokenBucket = None, **retry_kwargs) -> tuple:
+    """
+    Laedt alle Kerzen mit since <= Timestamp <= until (ms).
+
+    exchange: ccxt-Instanz (oder Fake mit fetch_ohlcv/parse_timeframe/milliseconds).
+    Returns (rows, ok) - rows sortiert und dedupliziert, ok=False wenn ein
+    Abschnitt auch nach allen Retries fehlschlug (rows dann unvollstaendig).
+    """
+    tf_ms = exchange.parse_timeframe(timeframe) * 1000
+    until = min(until, exchange.milliseconds())
+    if since > until:
+        return [], True
+
+    # Abschnitte [start, start + limit * tf) - jeder enthaelt hoechstens limit Kerzen
+    page_ms = limit * tf_ms
+    chunks  = [(start, min(start + page_ms - 1, until)) for start in range(since, until + 1, page_ms)]
+
+    def fetch_chunk(chunk):
+        start, end = chunk
+        rows, current = [], start
+        while current <= end:
+            page = fetch_page(exchange, symbol, timeframe, current, limit, bucket, **retry_kwargs)
+            page = [r for r in page or [] if current <= r[0] <= end]
+            if not page:
+                break
+            rows.extend(page)
+            current = page[-1][0] + tf_ms
+        return rows
+
+    workers = max(1, min(max_workers or DEFAULT_THREADS, len(chunks)))
+    results, ok = [], True
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(fetch_chunk, c) for c in chunks]
+        for chunk, fut in zip(chunks, futures):
+            try:
+                results.append(fut.result())
+            except Exception as e:
+                logger.error(f"Fehler beim Laden der Daten ({symbol} {timeframe}, ab {chunk[0]}): {e}")
+                results.append([])
+                ok = False
+
+    # Abschnitts-Reihenfolge statt Fertigstellungs-Reihenfolge -> deterministisch
+    by_ts = {}
+    for rows in results:
+        for row in rows:
+            by_ts[row[0]] = row
+    return [by_ts[ts] for ts in sorted(by_ts)], ok
@@ -0,0 +1,64 @@
+# src/mbot/utils/ohlcv_resample.py
+"""
+Hoehere Timeframes lokal aus einem Basis-Timeframe (1h oder 15m).
+
+Bitget-Swap-Kerzen liegen in UTC auf dem Epoch-Raster (ccxt: 2H/4H,
+6Hutc/12Hutc/1Dutc): eine 4h-Kerze beginnt bei ts // 4h * 4h. Aggregiert
+wird exakt wie an der Boerse: open = erste, close = letzte Basis-Kerze,
+high/low = Max/Min, volume = Summe.
+
+Nur vollstaendige Buckets (alle Basis-Kerzen vorhanden) gelten als exakt;
+unvollstaendige Buckets in der Vergangenheit (Luecken, Listing mitten im
+Bucket) werden vom Aufrufer beim Exchange nachgeladen. Der Bucket der
+laufenden Kerze wird aus den vorhandenen Basis-Kerzen gebildet.
+"""
+
+import numpy as np
+
+# Ziel-Timeframes, die lokal gebildet werden koennen
+RESAMPLE_TARGETS = ('2h', '4h', '6h', '12h', '1d')
+
+# Basis-Timeframes in Reihenfolge der Bevorzugung (weniger Kerzen zuerst)
+RESAMPLE_BASES = ('1h', '15m')
+
+
+def resample_ohlcv(ts: np.ndarray, ohlcv: np.ndarray, base_ms: int, target_ms: int) -> tuple:
+    """
+    ts: int64 ms (aufsteigend, eindeutig), ohlcv: float64 [5, n] (open, high, low, close, volume).
+
+    Returns (bucket_ts, bucket_ohlcv [5, m], complete) - complete[i] ist True,
+    wenn alle target_ms // base_ms Basis-Kerzen des Buckets vorhanden sind.
+    """
+    if len(ts) == 0:
+        return np.empty(0, dtype=np.int64), np.empty((5, 0)), np.empty(0, dtype=bool)
+
+    buckets = ts // target_ms * target_ms
+    bucket_ts, starts, counts = np.unique(buckets, return_index=True, return_counts=True)
+    ends = starts + counts - 1
+
+    out = np.empty((5, len(bucket_ts)))
+    out[0] = ohlcv[0][starts]
+    out[1] = np.maximum.reduceat(ohlcv[1], starts)
+    out[2] = np.minimum.reduceat(ohlcv[2], starts)
+    out[3] = ohlcv[3][ends]
+    out[4] = np.add.reduceat(ohlcv[4], starts)
+    return bucket_ts, out, counts == target_ms // base_ms
+
+
+def pick_base(cache, symbol: str, timeframe: str, start_ts: int, tf_ms) -> str:
+    """
+    Basis-Timeframe, aus dem timeframe gebildet werden kann: der Store der
+    Basis muss den Anfang des Zeitraums bereits abdecken (sonst waere der
+    Basis-Download teurer als der direkte). tf_ms: Timeframe -> Millisekunden.
+    """
+    if cache is None or timeframe not in RESAMPLE_TARGETS:
+        return None
+    for base in RESAMPLE_BASES:
+        index = cache.index(symbol, base)
+        if not index or not index.get('rows'):
+            continue
+        first = index['first_ts']
+        if first <= start_ts or any(lo <= start_ts and hi >= first - tf_ms(base)
+                                    for lo, hi in index.get('empty_ranges', [])):
+            return base
+    return None
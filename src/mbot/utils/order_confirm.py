@@ -0,0 +1,62 @@
+# src/mbot/utils/order_confirm.py
+"""
+Bestaetigung von Order-Zustaenden per Polling statt fester Pausen.
+
+Bisher wurde nach Entry, Storno und Schliessen pauschal 0.5-3s gewartet -
+zu lang, wenn der Exchange sofort bestaetigt, zu kurz, wenn er haengt.
+poll_until() fragt den Zustand mit adaptivem Backoff ab (erst schnell,
+dann seltener) und kehrt zurueck, sobald er bestaetigt ist, spaetestens
+zur Deadline. Netzwerkfehler und noch unbekannte Orders (OrderNotFound
+direkt nach dem Platzieren) zaehlen als "noch nicht bestaetigt".
+
+Die Exchange-Methoden wait_for_order_fill / wait_for_no_open_orders /
+wait_for_position_closed bauen darauf auf.
+
+Konfiguration: MBOT_CONFIRM_TIMEOUT (Sekunden, Standard 5).
+"""
+
+import os
+import time
+import logging
+
+import ccxt
+
+logger = logging.getLogger(__name__)
+
+CONFIRM_TIMEOUT = float(os.environ.get('MBOT_CONFIRM_TIMEOUT', 5.0))
+
+# Erste Abfrage nach 50 ms, dann Faktor 2 bis hoechstens 1 s Abstand
+POLL_INITIAL = 0.05
+POLL_FACTOR  = 2.0
+POLL_MAX     = 1.0
+
+
+def poll_until(check, timeout: float = None, initial: float = POLL_INITIAL,
+               factor: float = POLL_FACTOR, max_interval: float = POLL_MAX,
+               clock=time.monotonic, sleep=None, what: str = 'Zustand') -> tuple:
+    """
+    Ruft check() auf, bis es einen wahren Wert liefert oder timeout (s) abgelaufen ist.
+
+    Die erste Abfrage erfolgt sofort; danach initial, initial*factor, ...
+    (hoechstens max_interval), die letzte Pause endet genau an der Deadline.
+    Returns (ergebnis, polls) - ergebnis ist None, wenn nicht bestaetigt.
+    """
+    sleep    = sleep or time.sleep
+    timeout  = CONFIRM_TIMEOUT if timeout is None else float(timeout)
+    deadline = clock() + timeout
+    interval = initial
+    polls    = 0
+    while True:
+        polls += 1
+        try:
+            result = check()
+            if result:
+                return result, polls
+        except (ccxt.NetworkError, ccxt.OrderNotFound) as e:
+            logger.debug(f"{what}: Abfrage {polls} ohne Ergebnis ({type(e).__name__}: {e})")
+        remaining = deadline - clock()
+        if remaining <= 0:
+            logger.warning(f"{what} nach {timeout:.1f}s ({polls} Abfragen) nicht bestaetigt.")
+            return None, polls
+        sleep(min(interval, remaining))
+        interval = min(max_interval, interval * factor)
@@ -0,0 +1,71 @@
+# src/mbot/utils/shm_arrays.py
+"""
+NumPy-Arrays in multiprocessing.shared_memory (fuer Worker-Prozesse).
+
+Der Eigentuemer legt die Arrays einmal an (SharedArrays.create) und gibt
+nur den kleinen, picklebaren Deskriptor an die Worker weiter. Worker
+haengen sich mit attach_arrays() an dieselben Speicherbereiche, ohne die
+Daten zu kopieren oder zu pickeln.
+"""
+
+from multiprocessing import shared_memory
+
+import numpy as np
+
+
+class SharedArrays:
+    """Besitzt die Shared-Memory-Bloecke; close()/unlink() nach Ende der Worker."""
+
+    def __init__(self, blocks: dict, descriptor: dict):
+        self._blocks    = blocks
+        self.descriptor = descriptor
+
+    @classmethod
+    def create(cls, arrays: dict) -> 'SharedArrays':
+        blocks, descriptor = {}, {}
+        try:
+            for name, values in arrays.items():
+                values = np.ascontiguousarray(values)
+                shm = shared_memory.SharedMemory(create=True, size=max(1, values.nbytes))
+                np.ndarray(values.shape, dtype=values.dtype, buffer=shm.buf)[...] = values
+                blocks[name]     = shm
+                descriptor[name] = (shm.name, values.shape, values.dtype.str)
+        except Exception:
+            for shm in blocks.values():
+                shm.close()
+                shm.unlink()
+            raise
+        return cls(blocks, descriptor)
+
+    def close(self):
+        for shm in self._blocks.values():
+            shm.close()
+
+    def unlink(self):
+        for shm in self._blocks.values():
+            try:
+                shm.unlink()
+            except FileNotFoundError:
+                pass
+        self._blocks = {}
+
+
+def attach_arrays(descriptor: dict) -> tuple:
+    """
+    Haengt sich an die Arrays eines Deskriptors (SharedArrays.descriptor).
+
+    Returns (handles, arrays): handles muessen offen bleiben, solange die
+    Arrays benutzt werden. Die Arrays sind read-only.
+
+    Fuer per multiprocessing gestartete Worker gedacht: sie teilen den
+    resource_tracker des Eigentuemers, freigegeben wird nur per unlink().
+    """
+    handles, arrays = [], {}
+    for name, (shm_name, shape, dtype) in descriptor.items():
+        shm = shared_memory.SharedMemory(name=shm_name)
+        arr = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+        arr.setflags(write=False)
+        handles.append(shm)
+        arrays[name] = arr
+    return handles, arrays
+
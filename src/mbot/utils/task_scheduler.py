@@ -0,0 +1,104 @@
+# src/mbot/utils/task_scheduler.py
+"""
+Scheduler fuer Symbol/Timeframe-Tasks mit getrennter I/O- und CPU-Phase.
+
+  load   : laeuft in einem Thread-Pool (Downloads parallel zur Optimierung)
+  plan   : im Hauptthread, sobald die Daten da sind; liefert Kosten und
+           CPU-Jobs (picklebare Funktion + Argumente)
+  finish : im Hauptthread, sobald alle Jobs eines Tasks fertig sind
+
+Alle CPU-Jobs teilen sich einen Prozess-Pool mit cpu_budget Prozessen
+(globales CPU-Budget). Jobs werden erst abgegeben, wenn ein Slot frei ist,
+und zwar nach Kosten absteigend (teuerste Tasks zuerst) - so belegen kurze
+Tasks am Ende die Luecken statt lange Tasks zu blockieren.
+"""
+
+import heapq
+import logging
+import multiprocessing
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+logger = logging.getLogger(__name__)
+
+
+class TaskScheduler:
+    """
+    load(task)                        -> payload (None = keine Daten)
+    plan(task, payload)               -> (cost, [(fn, args), ...])
+    finish(task, payload, results, error)
+
+    finish wird fuer jeden Task genau einmal aufgerufen; error ist None oder
+    die erste aufgetretene Exception (results dann unvollstaendig).
+    """
+
+    def __init__(self, cpu_budget: int = 1, download_threads: int = 2, mp_context: str = 'spawn'):
+        self.cpu_budget       = max(1, int(cpu_budget))
+        self.download_threads = max(1, int(download_threads))
+        self.mp_context       = mp_context
+
+    def run(self, tasks: list, load, plan, finish, estimate=None):
+        """
+        Fuehrt alle Tasks aus. estimate(task) -> geschaetzte Kosten bestimmt
+        die Download-Reihenfolge (exakte Kosten liefert erst plan()).
+        """
+        order = sorted(tasks, key=lambda t: -estimate(t)) if estimate else list(tasks)
+        ready, running, seq = [], {}, 0
+
+        ctx = multiprocessing.get_context(self.mp_context)
+        with ThreadPoolExecutor(max_workers=self.download_threads) as io_pool, \
+                ProcessPoolExecutor(max_workers=self.cpu_budget, mp_context=ctx) as cpu_pool:
+            loads = {io_pool.submit(load, task): task for task in order}
+
+            while loads or ready or running:
+                while ready and len(running) < self.cpu_budget:
+                    _, _, state, i = heapq.heappop(ready)
+                    fn, args = state['jobs'][i]
+                    running[cpu_pool.submit(fn, *args)] = (state, i)
+
+                done, _ = wait([*loads, *running], return_when=FIRST_COMPLETED)
+                for fut in done:
+                    if fut in loads:
+                        task = loads.pop(fut)
+                        state = self._plan(task, fut, plan, finish)
+                        if state is not None:
+                            for i in range(len(state['jobs'])):
+                                heapq.heappush(ready, (-state['cost'], seq, state, i))
+                                seq += 1
+                        continue
+
+                    state, i = running.pop(fut)
+                    try:
+                        state['results'][i] = fut.result()
+                    except Exception as e:
+                        logger.error(f"Job fuer {state['task']} fehlgeschlagen: {e}")
+                        state['error'] = state['error'] or e
+                    state['pending'] -= 1
+                    if state['pending'] == 0:
+                        self._finish(state, finish)
+
+    def _plan(self, task, fut, plan, finish):
+        payload = None
+        try:
+            payload = fut.result()
+            if payload is None:
+                self._finish({'task': task, 'payload': None, 'results': [], 'error': None}, finish)
+                return None
+            cost, jobs = plan(task, payload)
+        except Exception as e:
+            logger.error(f"Vorbereitung fuer {task} fehlgeschlagen: {e}")
+            self._finish({'task': task, 'payload': payload, 'results': [], 'error': e}, finish)
+            return None
+
+        state = {'task': task, 'payload': payload, 'cost': cost, 'jobs': list(jobs),
+                 'results': [None] * len(jobs), 'pending': len(jobs), 'error': None}
+        if not jobs:
+            self._finish(state, finish)
+            return None
+        return state
+
+    @staticmethod
+    def _finish(state, finish):
+        try:
+            finish(state['task'], state['payload'], state['results'], state['error'])
+        except Exception as e:
+            logger.error(f"Abschluss fuer {state['task']} fehlgeschlagen: {e}")
@@ -17,6 +17,7 @@ import logging
 import math
 import time
 import ccxt
+from collections import deque
 from datetime import datetime, timezone
 
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
@@ -240,6 +241,74 @@ def calculate_contracts(balance_usdt: float, entry_price: float,
     return contracts
 
 
+def _protective_prices(entry_price: float, side: str, atr, atr_sl_mult, atr_tp_mult,
+                       leverage: int, sl_account_pct: float, tp_price_pct: float,
+                       logger: logging.Logger) -> tuple:
+    """SL/TP ATR-basiert (wie Backtester), ohne ATR prozentbasiert."""
+    if atr and atr > 0 and atr_sl_mult and atr_tp_mult:
+        if side == 'long':
+            sl_price = entry_price - atr_sl_mult * atr
+            tp_price = entry_price + atr_tp_mult * atr
+        else:
+            sl_price = entry_price + atr_sl_mult * atr
+            tp_price = entry_price - atr_tp_mult * atr
+        logger.info(f"SL/TP ATR-basiert: ATR={atr:.4f} | SL-Mult={atr_sl_mult} | TP-Mult={atr_tp_mult}")
+    else:
+        sl_price, tp_price = calculate_sl_tp_prices(
+            entry_price, side, leverage, sl_account_pct, tp_price_pct
+        )
+        logger.info(f"SL/TP prozentbasiert: SL={sl_account_pct}%/Konto | TP={tp_price_pct}%/Preis")
+    return sl_price, tp_price
+
+
+# ============================================================
+# Order-Latenz (Entry -> Position geschuetzt)
+# ============================================================
+
+# Letzte Messungen pro Prozess (Daemon: laufende Statistik)
+ORDER_LATENCY = deque(maxlen=500)
+
+
+def _record_order_latency(symbol: str, path: str, requests: int, started: float,
+                          entry_done: float, protected_at: float, logger: logging.Logger):
+    """
+    path: 'attached' (ein Request mit Preset-SL/TP), 'fallback' (Preset
+    abgelehnt, dann Entry + SL + TP) oder 'separate' (Preset abgeschaltet).
+    protected_ms: Start des Entry-Requests bis der SL aktiv ist.
+    """
+    done  = time.perf_counter()
+    entry = {
+        'symbol':       symbol,
+        'path':         path,
+        'requests':     requests,
+        'entry_ms':     (entry_done - started) * 1000,
+        'protected_ms': (protected_at - started) * 1000,
+        'total_ms':     (done - started) * 1000,
+    }
+    ORDER_LATENCY.append(entry)
+    logger.info(f"Order-Latenz [{path}] {symbol}: Entry {entry['entry_ms']:.0f} ms | "
+                f"geschuetzt nach {entry['protected_ms']:.0f} ms | gesamt {entry['total_ms']:.0f} ms | "
+                f"{requests} Request(s)")
+
+
+def order_latency_summary(records=None) -> dict:
+    """Median/Max pro Pfad ueber ORDER_LATENCY (oder records)."""
+    by_path = {}
+    for rec in (ORDER_LATENCY if records is None else records):
+        by_path.setdefault(rec['path'], []).append(rec)
+    summary = {}
+    for path, recs in by_path.items():
+        protected = sorted(r['protected_ms'] for r in recs)
+        summary[path] = {
+            'count':               len(recs),
+            'requests':            sum(r['requests'] for r in recs) / len(recs),
+            'protected_median_ms': protected[len(protected) // 2],
+            'protected_max_ms':    protected[-1],
+            'total_median_ms':     sorted(r['total_ms'] for r in recs)[len(recs) // 2],
+        }
+    return summary
+
+
 # ============================================================
 # Haupt-Trading-Funktion: Signal-Modus
 # ============================================================
@@ -251,6 +320,12 @@ def execute_signal_trade(exchange, symbol: str, timeframe: str,
     Wird aufgerufen wenn ein Signal erkannt wurde.
     Prueft ob Strategie frei ist, platziert Entry + SL + TP.
 
+    Standard: ein Entry-Request mit Preset-SL/TP (risk_config
+    attached_tpsl, Default True) - SL/TP dann vom erwarteten statt vom
+    gefuellten Entry-Preis. Lehnt Bitget das ab, folgt der bisherige Ablauf
+    (Market-Entry, dann SL und TP als Trigger-Orders vom Fill-Preis).
+    Latenz beider Pfade: ORDER_LATENCY / order_latency_summary().
+
     Returns True wenn Trade erfolgreich platziert.
     """
     side               = signal['side']
@@ -313,12 +388,57 @@ def execute_signal_trade(exchange, symbol: str, timeframe: str,
     logger.info(f"Platziere Entry: {side.upper()} {contracts:.4f} {symbol} "
                 f"| Hebel: {leverage}x | Kapital: {balance:.2f} USDT | Risiko: {risk_per_trade_pct}%")
 
+    # --- Entry: bevorzugt ein Request mit Preset-SL/TP, sonst Entry + SL + TP einzeln ---
+    started     = time.perf_counter()
+    requests    = 0
+    path        = 'separate'
+    entry_order = None
+    sl_side     = 'sell' if side == 'long' else 'buy'
+    if risk_config.get('attached_tpsl', True):
+        # SL/TP vom erwarteten Entry-Preis - beim Fill bereits aktiv
+        sl_price, tp_price = _protective_prices(current_price, side, atr, atr_sl_mult, atr_tp_mult,
+                                                leverage, sl_account_pct, tp_price_pct, logger)
+        requests += 1
+        try:
+            entry_order = exchange.place_market_order_with_tpsl(symbol, entry_side, contracts,
+                                                                sl_price, tp_price, margin_mode)
+            path = 'attached'
+        except (ccxt.InsufficientFunds, ccxt.NetworkError) as e:
+            # Kein Fallback: ohne Guthaben sinnlos, bei Timeout evtl. bereits ausgefuehrt
+            logger.error(f"Entry fehlgeschlagen: {e}")
+            return False
+        except ccxt.ExchangeError as e:
+            logger.warning(f"Entry mit Preset-TP/SL abgelehnt ({e}) - Fallback auf Entry + SL + TP.")
+            path = 'fallback'
+        except Exception as e:
+            logger.error(f"Entry fehlgeschlagen: {e}")
+            return False
+
+    if entry_order is None:
+        requests += 1
+        try:
+            entry_order = exchange.place_market_order(symbol, entry_side, contracts,
+                                                       margin_mode=margin_mode)
+        except Exception as e:
+            logger.error(f"Entry fehlgeschlagen: {e}")
+            return False
+    entry_done = time.perf_counter()
+
+    # Fill per Polling bestaetigen (Bitget liefert beim Platzieren oft nur die Order-ID).
+    # Fehler hier gelten als "nicht bestaetigt" - der Entry kann bereits gefuellt sein,
+    # SL/TP und State duerfen dann nicht ausbleiben.
     try:
-        entry_order = exchange.place_market_order(symbol, entry_side, contracts,
-                                                   margin_mode=margin_mode)
+        confirmed = exchange.wait_for_order_fill(symbol, entry_order)
     except Exception as e:
-        logger.error(f"Entry fehlgeschlagen: {e}")
+        logger.warning(f"Entry-Fill-Abfrage fehlgeschlagen: {e}")
+        confirmed = None
+    if confirmed is None:
+        logger.warning("Entry-Fill nicht bestaetigt - verwende Werte aus der Order-Antwort.")
+    elif float(confirmed.get('filled') or 0) <= 0:
+        logger.error(f"Entry nicht ausgefuehrt (Status: {confirmed.get('status')}).")
         return False
+    else:
+        entry_order = confirmed
 
     # Tatsaechlicher Entry-Preis aus Order-Rueckmeldung
     entry_price = float(entry_order.get('average') or entry_order.get('price') or current_price)
@@ -331,47 +451,43 @@ def execute_signal_trade(exchange, symbol: str, timeframe: str,
     if filled <= 0:
         filled = contracts
 
-    # --- SL / TP mit tatsaechlichem Fill-Preis berechnen ---
-    if atr and atr > 0 and atr_sl_mult and atr_tp_mult:
-        if side == 'long':
-            sl_price = entry_price - atr_sl_mult * atr
-            tp_price = entry_price + atr_tp_mult * atr
-        else:
-            sl_price = entry_price + atr_sl_mult * atr
-            tp_price = entry_price - atr_tp_mult * atr
-        logger.info(f"SL/TP ATR-basiert: ATR={atr:.4f} | SL-Mult={atr_sl_mult} | TP-Mult={atr_tp_mult}")
+    if path == 'attached':
+        protected_at = entry_done
+        logger.info(f"SL/TP mit dem Entry gesetzt (Preset): SL {sl_price:.4f} | TP {tp_price:.4f}")
     else:
-        sl_price, tp_price = calculate_sl_tp_prices(
-            entry_price, side, leverage, sl_account_pct, tp_price_pct
-        )
-        logger.info(f"SL/TP prozentbasiert: SL={sl_account_pct}%/Konto | TP={tp_price_pct}%/Preis")
+        # --- SL / TP mit tatsaechlichem Fill-Preis berechnen ---
+        sl_price, tp_price = _protective_prices(entry_price, side, atr, atr_sl_mult, atr_tp_mult,
+                                                leverage, sl_account_pct, tp_price_pct, logger)
 
     logger.info(f"Entry-Preis: {entry_price:.4f} | SL: {sl_price:.4f} | TP: {tp_price:.4f}")
     sl_dist_pct = abs(entry_price - sl_price) / entry_price * 100
     tp_dist_pct = abs(tp_price - entry_price) / entry_price * 100
     logger.info(f"SL-Abstand: {sl_dist_pct:.3f}% | TP-Abstand: {tp_dist_pct:.3f}% | R:R=1:{tp_dist_pct/sl_dist_pct:.1f}")
 
-    time.sleep(1.0)
+    if path != 'attached':
+        # --- SL platzieren (reduceOnly Trigger) ---
+        requests += 1
+        try:
+            exchange.place_trigger_market_order(symbol, sl_side, filled, sl_price, reduce=True)
+            logger.info(f"SL platziert @ {sl_price:.4f}")
+        except Exception as e:
+            logger.error(f"SL konnte nicht platziert werden: {e}. Schliesse Position!")
+            try:
+                exchange.close_position(symbol)
+            except Exception as ce:
+                logger.critical(f"Konnte Position nicht schliessen: {ce}")
+            return False
+        protected_at = time.perf_counter()
 
-    # --- SL platzieren (reduceOnly Trigger) ---
-    sl_side = 'sell' if side == 'long' else 'buy'
-    try:
-        exchange.place_trigger_market_order(symbol, sl_side, filled, sl_price, reduce=True)
-        logger.info(f"SL platziert @ {sl_price:.4f}")
-    except Exception as e:
-        logger.error(f"SL konnte nicht platziert werden: {e}. Schliesse Position!")
+        # --- TP platzieren (reduceOnly Trigger) ---
+        requests += 1
         try:
-            exchange.close_position(symbol)
-        except Exception as ce:
-            logger.critical(f"Konnte Position nicht schliessen: {ce}")
-        return False
+            exchange.place_trigger_market_order(symbol, sl_side, filled, tp_price, reduce=True)
+            logger.info(f"TP platziert @ {tp_price:.4f}")
+        except Exception as e:
+            logger.error(f"TP konnte nicht platziert werden: {e}")
 
-    # --- TP platzieren (reduceOnly Trigger) ---
-    try:
-        exchange.place_trigger_market_order(symbol, sl_side, filled, tp_price, reduce=True)
-        logger.info(f"TP platziert @ {tp_price:.4f}")
-    except Exception as e:
-        logger.error(f"TP konnte nicht platziert werden: {e}")
+    _record_order_latency(symbol, path, requests, started, entry_done, protected_at, logger)
 
     # --- Position in State eintragen ---
     claimed = claim_position(symbol, timeframe, side, entry_price,
@@ -425,18 +541,19 @@ def housekeeper_routine(exchange, symbol: str, logger: logging.Logger) -> bool:
     Wird aufgerufen wenn keine offene Position mehr existiert."""
     try:
         logger.info(f"Housekeeper: Starte Aufraeumroutine fuer {symbol}...")
-        exchange.cancel_all_orders_for_symbol(symbol)
-        time.sleep(1)
+        if not exchange.cancel_all_orders_for_symbol(symbol):
+            logger.warning(f"Housekeeper: Storno fuer {symbol} nicht bestaetigt.")
 
+        closed   = True
         position = exchange.fetch_open_positions(symbol)
         if position:
             pos_info = position[0]
             close_side = 'sell' if pos_info['side'] == 'long' else 'buy'
             logger.warning(f"Housekeeper: Verwaiste Position ({pos_info['side']}) — schliesse...")
             exchange.place_market_order(symbol, close_side, float(pos_info['contracts']), reduce=True)
-            time.sleep(3)
+            closed = exchange.wait_for_position_closed(symbol, pos_info['side'])
 
-        if exchange.fetch_open_positions(symbol):
+        if not closed:
             logger.error("Housekeeper: Position konnte nicht geschlossen werden!")
         else:
             logger.info(f"Housekeeper: {symbol} ist sauber.")
@@ -479,12 +596,18 @@ def check_position_status(exchange, symbol: str, timeframe: str,
 
     # Getrackte Position wurde geschlossen -> Telegram + State bereinigen
     logger.info(f"Position fuer {symbol} wurde geschlossen (TP oder SL getroffen).")
+    _finish_closed_position(pos, telegram_config)
+
 
-    entry_p  = pos.get('entry_price', '?')
-    sl_p     = pos.get('sl_price', '?')
-    tp_p     = pos.get('tp_price', '?')
-    side_str = pos.get('side', '?')
-    since    = pos.get('active_since', '?')
+def _finish_closed_position(pos: dict, telegram_config: dict):
+    """Telegram-Meldung, Position aus dem State entfernen, Candle-Cooldown setzen."""
+    symbol    = pos.get('symbol')
+    timeframe = pos.get('timeframe')
+    entry_p   = pos.get('entry_price', '?')
+    sl_p      = pos.get('sl_price', '?')
+    tp_p      = pos.get('tp_price', '?')
+    side_str  = pos.get('side', '?')
+    since     = pos.get('active_since', '?')
 
     direction_emoji = "🟢" if side_str == 'long' else "🔴"
     msg = (
@@ -502,3 +625,78 @@ def check_position_status(exchange, symbol: str, timeframe: str,
 
     clear_position(symbol, timeframe)
     set_candle_cooldown(symbol, timeframe)
+
+
+# ============================================================
+# Reconciliation: alle Positionen des Accounts in einem Durchlauf
+# ============================================================
+
+def reconcile_positions(exchange, telegram_config: dict, logger: logging.Logger,
+                        active_keys: set = None) -> dict | None:
+    """
+    Gleicht active_positions.json mit einem Account-Snapshot ab - statt
+    check_position_status + housekeeper_routine pro Position
+    (je fetch_positions, 2x cancel_all_orders, 2x fetch_positions, Pausen):
+
+      1 Request : alle offenen Positionen
+      1 Request : alle offenen Trigger-Orders
+      1 Storno  : nur je Symbol mit Trigger-Orders ohne offene Position
+
+    Getrackte Positionen ohne Gegenstueck auf dem Exchange werden wie im
+    Check-Modus gemeldet, aus dem State entfernt und bekommen den
+    Candle-Cooldown. active_keys ((symbol, timeframe) der aktiven
+    Strategien) begrenzt wie im master_runner die geprueften Positionen;
+    aufgeraeumt wird nur fuer deren Symbole - fremde Orders auf dem
+    Account bleiben unberuehrt. Offene, aber nicht getrackte Positionen
+    werden nur gemeldet.
+
+    Returns Zusammenfassung (open/closed/cancelled/untracked) oder None,
+    wenn der Snapshot fehlschlug - dann wird nichts veraendert.
+    """
+    try:
+        positions = exchange.fetch_all_open_positions()
+        triggers  = exchange.fetch_all_open_trigger_orders()
+    except Exception as e:
+        logger.error(f"Reconciliation: Account-Snapshot fehlgeschlagen ({e}) - keine Aenderungen.")
+        return None
+
+    tracked   = [p for p in read_active_positions()
+                 if active_keys is None or (p.get('symbol'), p.get('timeframe')) in active_keys]
+    by_symbol = {}
+    for p in positions:
+        by_symbol.setdefault(p.get('symbol'), []).append(p)
+    scope     = {p.get('symbol') for p in tracked} | {k[0] for k in active_keys or ()}
+    summary   = {'open': [], 'closed': [], 'cancelled': [], 'untracked': []}
+
+    for pos in tracked:
+        symbol, timeframe = pos.get('symbol'), pos.get('timeframe')
+        if symbol in by_symbol:
+            p       = by_symbol[symbol][0]
+            unr_pnl = float(p.get('unrealizedPnl') or 0.0)
+            logger.info(
+                f"Position fuer {symbol} ({timeframe}) noch offen: {p.get('side', '?').upper()} "
+                f"| Entry: {pos.get('entry_price', '?')} | Unrealized PnL: {unr_pnl:.2f} USDT"
+            )
+            summary['open'].append((symbol, timeframe))
+
+    # Ghost-Trigger: TP/SL-Reste ohne offene Position
+    for symbol in sorted({o.get('symbol') for o in triggers if o.get('symbol') in scope} - set(by_symbol)):
+        logger.info(f"Reconciliation: Trigger-Orders ohne Position fuer {symbol} - storniere.")
+        exchange.cancel_trigger_orders_for_symbol(symbol)
+        summary['cancelled'].append(symbol)
+
+    for pos in tracked:
+        symbol, timeframe = pos.get('symbol'), pos.get('timeframe')
+        if symbol not in by_symbol:
+            logger.info(f"Position fuer {symbol} ({timeframe}) wurde geschlossen (TP oder SL getroffen).")
+            _finish_closed_position(pos, telegram_config)
+            summary['closed'].append((symbol, timeframe))
+
+    tracked_symbols = {p.get('symbol') for p in tracked}
+    for symbol in sorted(s for s in by_symbol if s in scope and s not in tracked_symbols):
+        logger.warning(f"Reconciliation: offene Position {symbol} ohne Eintrag in active_positions.json.")
+        summary['untracked'].append(symbol)
+
+    logger.info(f"Reconciliation: {len(summary['open'])} offen, {len(summary['closed'])} geschlossen, "
+                f"{len(summary['cancelled'])} Storno(s), {2 + len(summary['cancelled'])} Request(s).")
+    return summary
@@ -0,0 +1,146 @@
+"""
+Gemeinsame Test-Umgebung und Fixtures
+
+Caches, Logs und Trade-State liegen waehrend der Tests ausserhalb des
+Repositorys (artifacts/, logs/): in einem temporaeren Verzeichnis, der
+Numba-Cache im pytest-Cache (.pytest_cache), damit nicht jeder Lauf neu
+kompiliert. Die Umgebungsvariablen muessen vor dem ersten Import von mbot
+gesetzt sein; bereits gesetzte Werte gelten weiter.
+
+Fixtures fuer die FakeBitget-Tests:
+  ohlcv_store   : Factory fuer einen Store mit Zufallspfad-Kerzen
+  fake_exchange : Factory fuer FakeBitget + Exchange auf diesem Store
+  make_signal   : Factory fuer ein MERS-Signal zum aktuellen Fake-Kurs
+  no_sleep      : time.sleep ohne Wartezeit, liefert die angefragten Pausen
+  replay_start  : erster Kerzen-Timestamp der Stores (ms)
+"""
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+
+import numpy as np
+import pytest
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(os.path.join(PROJECT_ROOT, 'src'))
+
+import ccxt
+
+MIN   = 60 * 1000
+START = ccxt.Exchange.parse8601('2025-01-01T00:00:00Z')
+
+TEST_ROOT = tempfile.mkdtemp(prefix='mbot-tests-')
+
+
+def pytest_configure(config):
+    cache     = getattr(config, 'cache', None)
+    numba_dir = str(cache.mkdir('numba_cache')) if cache is not None else os.path.join(TEST_ROOT, 'numba_cache')
+    for name, path in (('NUMBA_CACHE_DIR',        numba_dir),
+                       ('MBOT_OHLCV_CACHE_DIR',   os.path.join(TEST_ROOT, 'ohlcv_cache')),
+                       ('MBOT_LIVE_OHLCV_DIR',    os.path.join(TEST_ROOT, 'live_ohlcv')),
+                       ('MBOT_MARKETS_CACHE_DIR', os.path.join(TEST_ROOT, 'markets')),
+                       ('MBOT_LOG_DIR',           os.path.join(TEST_ROOT, 'logs'))):
+        os.environ.setdefault(name, path)
+
+
+def pytest_unconfigure(config):
+    shutil.rmtree(TEST_ROOT, ignore_errors=True)
+
+
+@pytest.fixture(autouse=True)
+def isolated_state(tmp_path, monkeypatch):
+    """Trade-State (aktive Positionen, Candle-Cooldowns) pro Test in tmp_path."""
+    from mbot.utils import trade_manager
+    monkeypatch.setattr(trade_manager, 'ACTIVE_POSITIONS_PATH', str(tmp_path / 'active_positions.json'))
+    monkeypatch.setattr(trade_manager, 'CANDLE_COOLDOWNS_PATH', str(tmp_path / 'candle_cooldowns.json'))
+    return tmp_path
+
+
+@pytest.fixture
+def replay_start() -> int:
+    return START
+
+
+@pytest.fixture
+def no_sleep(monkeypatch) -> list:
+    """time.sleep kehrt sofort zurueck (FakeBitget-Latenz bleibt echt)."""
+    sleeps = []
+    monkeypatch.setattr(time, 'sleep', sleeps.append)
+    return sleeps
+
+
+@pytest.fixture
+def ohlcv_store(tmp_path):
+    """
+    Factory: Store unter tmp_path/name mit n Kerzen ab START pro Symbol und
+    Timeframe. Symbol k laeuft um base * (k + 1); ein gemeinsamer Zufallsstrom
+    (seed) ueber alle Symbole/Timeframes, Dochte +/- wick um Open/Close.
+    """
+    from mbot.utils.ohlcv_cache import OHLCVCache
+
+    def make(symbols, timeframes=('15m',), n=300, seed=0, base=50.0, vol=0.003,
+             wick=0.002, name='ohlcv'):
+        cache = OHLCVCache(str(tmp_path / name))
+        rng   = np.random.default_rng(seed)
+        for k, symbol in enumerate(symbols):
+            for timeframe in timeframes:
+                tf_ms = ccxt.Exchange.parse_timeframe(timeframe) * 1000
+                close = base * (k + 1) * np.exp(np.cumsum(rng.normal(0.0, vol, n)))
+                open_ = np.r_[close[0], close[:-1]]
+                rows  = np.column_stack([START + np.arange(n) * tf_ms, open_,
+                                         np.maximum(open_, close) * (1 + wick),
+                                         np.minimum(open_, close) * (1 - wick), close, np.ones(n)])
+                cache.update(symbol, timeframe, rows.tolist())
+        return cache
+    return make
+
+
+@pytest.fixture
+def fake_exchange(ohlcv_store, tmp_path):
+    """
+    Factory: (FakeBitget, Exchange) auf einem Store. store: fertiger
+    OHLCVCache oder kwargs fuer ohlcv_store. Die Uhr startet offset_ms nach
+    dem Beginn der Kerze start_candle; weitere kwargs gehen an FakeBitget.
+    live_buffer: Live-Abrufe ueber einen eigenen Buffer unter tmp_path/live
+    statt LIVE_OHLCV_BUFFER (type(exchange) baut weitere Instanzen davon).
+    """
+    from mbot.utils.exchange import Exchange
+    from mbot.utils.fake_exchange import FakeBitget
+    from mbot.utils.ohlcv_cache import OHLCVCache
+
+    def make(symbols=('BTC/USDT:USDT',), timeframe='15m', start_candle=100, offset_ms=MIN,
+             store=None, live_buffer=False, **kwargs):
+        if store is None or isinstance(store, dict):
+            store = ohlcv_store(symbols, **dict({'timeframes': (timeframe,)}, **(store or {})))
+        tf_ms = ccxt.Exchange.parse_timeframe(timeframe) * 1000
+        fake  = FakeBitget(store, timeframe=timeframe, symbols=list(symbols),
+                           start_ts=START + start_candle * tf_ms + offset_ms, **kwargs)
+        exchange_cls = _buffered_exchange(OHLCVCache(str(tmp_path / 'live'))) if live_buffer else Exchange
+        return fake, exchange_cls({}, client=fake)
+    return make
+
+
+def _buffered_exchange(buffer):
+    from mbot.utils.exchange import Exchange
+
+    class BufferedExchange(Exchange):
+        def fetch_recent_ohlcv(self, symbol, timeframe, limit=200, buffer=buffer):
+            return super().fetch_recent_ohlcv(symbol, timeframe, limit, buffer)
+
+        async def fetch_recent_ohlcv_async(self, client, symbol, timeframe, limit=200, buffer=buffer):
+            return await super().fetch_recent_ohlcv_async(client, symbol, timeframe, limit, buffer)
+    return BufferedExchange
+
+
+@pytest.fixture
+def make_signal():
+    """Factory: MERS-Signal zum aktuellen Kurs (ATR als Anteil des Preises)."""
+    def make(fake, symbol, side='long', entry_price=None, atr_pct=0.004, sl_mult=1.5, tp_mult=2.0,
+             reason='test'):
+        price = fake.price(symbol) if entry_price is None else entry_price
+        return {'side': side, 'entry_price': price, 'atr': price * atr_pct,
+                'atr_sl_mult': sl_mult, 'atr_tp_mult': tp_mult, 'reason': reason}
+    return make
@@ -0,0 +1,202 @@
+"""
+mbot Backtester Tests
+
+Prueft den Array-Kernel (simulate_trades) auf synthetischen Kerzen
+(kein API-Zugriff noetig).
+"""
+
+import os
+import sys
+
+import numpy as np
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(os.path.join(PROJECT_ROOT, 'src'))
+
+import pandas as pd
+
+from mbot.analysis.backtester import (
+    simulate_trades,
+    run_backtest,
+    run_backtest_batch,
+    build_entropy_cube,
+    build_exit_index,
+    save_entropy_cube,
+    load_entropy_cube,
+    FeatureCache,
+    _simulate_trades_numpy,
+    _simulate_trades_jit,
+    _first_passage,
+)
+
+
+def _simulate(high, low, close, entry_side, **overrides):
+    params = dict(atr_sl_mult=1.0, atr_tp_mult=2.0, start_capital=1000.0,
+                  risk_per_trade_pct=1.0, fee_rate=0.0, slippage_pct=0.0,
+                  min_notional_usdt=0.0)
+    params.update(overrides)
+    n = len(close)
+    return simulate_trades(np.asarray(high, float), np.asarray(low, float),
+                           np.asarray(close, float), np.ones(n),
+                           np.asarray(entry_side, np.int8), **params)
+
+
+def test_sl_priority_and_no_entry_on_exit_bar():
+    """SL+TP auf gleicher Kerze = Verlust; auf der Exit-Kerze kein neuer Entry"""
+    close = [100.0] * 6
+    high  = [100.0, 100.0, 103.0, 100.0, 100.0, 100.0]
+    low   = [100.0, 100.0,  98.0, 100.0, 100.0,  98.0]
+    side  = [0, 1, 1, -1, 0, 0]
+    sim   = _simulate(high, low, close, side)
+
+    assert list(sim['entry_idx']) == [1, 3]
+    assert list(sim['exit_idx'])  == [2, 5]
+    assert list(sim['win'])       == [False, True]
+    assert sim['pnl_usdt'][0] == -10.0
+    assert sim['capital_after'][-1] == sim['end_capital']
+
+
+def test_open_trade_at_end_is_discarded():
+    """Ein bis zum Datenende offener Trade wird nicht gezaehlt"""
+    sim = _simulate([100.0] * 4, [100.0] * 4, [100.0] * 4, [0, 1, 0, 0])
+    assert len(sim['entry_idx']) == 0
+    assert sim['end_capital'] == 1000.0
+
+
+def test_min_notional_skips_candidate():
+    """Zu kleine Positionen werden uebersprungen, der naechste Kandidat zaehlt"""
+    close = [100.0, 50.0, 100.0, 100.0]
+    high  = [100.0, 50.0, 100.0, 103.0]
+    low   = [100.0, 50.0, 100.0, 100.0]
+    sim   = _simulate(high, low, close, [0, 1, 1, 0], min_notional_usdt=800.0)
+    assert list(sim['entry_idx']) == [2]
+    assert list(sim['win']) == [True]
+
+
+def test_jit_kernel_matches_numpy_path():
+    """_simulate_trades_jit (kompiliert oder als Python) == _simulate_trades_numpy"""
+    rng   = np.random.default_rng(3)
+    n     = 2000
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.01, n)))
+    high  = close * (1 + rng.random(n) * 0.01)
+    low   = close * (1 - rng.random(n) * 0.01)
+    atr   = np.full(n, 1.5)
+    side  = rng.choice(np.array([-1, 0, 0, 0, 1], dtype=np.int8), n)
+    args  = (high, low, *build_exit_index(high, low), close, atr, side,
+             1.2, 2.5, 1000.0, 2.0, 0.0006, 0.15, 5.0)
+
+    columns, capital = _simulate_trades_numpy(*args)
+    *jit_columns, jit_capital = _simulate_trades_jit(*args)
+    assert len(columns[0]) > 10
+    for ref, got in zip(columns, jit_columns):
+        assert np.array_equal(np.asarray(ref), got)
+    assert capital == jit_capital
+
+
+def test_first_passage_matches_linear_scan():
+    """Sparse-Table-Suche == lineare Suche, inkl. NaN-Kerzen und Datenende"""
+    rng  = np.random.default_rng(5)
+    n    = 777
+    high = 100 + np.cumsum(rng.normal(0.0, 1.0, n))
+    low  = high - rng.random(n) * 2
+    high[[40, 41, 300]] = np.nan
+    low[[40, 300, 500]] = np.nan
+    min_low, max_high = build_exit_index(high, low)
+
+    for _ in range(500):
+        start = int(rng.integers(0, n + 1))
+        lo    = float(rng.uniform(low[np.isfinite(low)].min() - 5, 100))
+        hi    = float(rng.uniform(100, high[np.isfinite(high)].max() + 5))
+        with np.errstate(invalid='ignore'):
+            hits = np.flatnonzero((low[start:] <= lo) | (high[start:] >= hi))
+        expected = start + int(hits[0]) if len(hits) else -1
+        assert _first_passage(min_low, max_high, start, lo, hi) == expected
+
+
+def test_feature_cache_lru_and_counters():
+    """LRU-Verdraengung nach Speicherlimit, Hit/Miss-Zaehler"""
+    cache = FeatureCache(max_bytes=2 * 800)
+    make  = lambda: np.zeros(100)
+    cache.get('a', make)
+    cache.get('b', make)
+    cache.get('a', make)
+    cache.get('c', make)
+    assert cache.stats()['entries'] == 2
+    cache.get('b', make)
+    assert (cache.hits, cache.misses) == (1, 4)
+
+
+def _make_ohlcv(n: int, seed: int = 8) -> pd.DataFrame:
+    rng   = np.random.default_rng(seed)
+    close = np.round(100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.012, n))), 3)
+    open_ = np.r_[close[0], close[:-1]]
+    return pd.DataFrame({'open': open_, 'close': close, 'volume': 1.0,
+                         'high': np.maximum(open_, close) * (1 + rng.random(n) * 0.006),
+                         'low':  np.minimum(open_, close) * (1 - rng.random(n) * 0.006)},
+                        index=pd.date_range('2025-01-01', periods=n, freq='h', tz='UTC'))
+
+
+def test_run_backtest_with_feature_cache_matches_uncached():
+    """Gecachte Features liefern dasselbe Ergebnis wie die Direktberechnung"""
+    df    = _make_ohlcv(1500)
+    risk  = {'fee_rate_pct': 0.06, 'min_notional_usdt': 5.0}
+    cache = FeatureCache()
+    for cfg in [{'use_multitf_filter': 1, 'min_entropy_drop_pct': 0.0},
+                {'entropy_window': 30, 'min_energy_rise_pct': 0.1},
+                {'use_multitf_filter': 1, 'min_entropy_drop_pct': 0.0, 'atr_sl_mult': 2.0}]:
+        expected = run_backtest(df, cfg, risk, feature_cache=None)
+        assert run_backtest(df, cfg, risk, feature_cache=cache) == expected
+        assert run_backtest(df, cfg, risk, feature_cache=cache) == expected
+    assert cache.hits > cache.misses
+
+
+def test_exit_only_variation_reuses_entry_stage():
+    """Nur SL/TP/Risiko geaendert -> Entry-Stufe komplett aus dem Cache"""
+    df    = _make_ohlcv(1500)
+    cache = FeatureCache()
+    cfg   = {'use_regime_filter': 1, 'use_multitf_filter': 1, 'min_entropy_drop_pct': 0.0}
+    run_backtest(df, cfg, {}, feature_cache=cache)
+    misses = cache.misses
+
+    for sl, tp, risk in [(0.75, 2.0, 0.5), (2.5, 5.0, 3.0)]:
+        variant = dict(cfg, atr_sl_mult=sl, atr_tp_mult=tp, risk_per_trade_pct=risk, leverage=12)
+        assert run_backtest(df, variant, {}, feature_cache=cache) == \
+            run_backtest(df, variant, {}, feature_cache=None)
+    assert cache.misses == misses
+
+
+def test_run_backtest_batch_matches_single_runs():
+    """Jede Zeile von run_backtest_batch() == Kennzahlen von run_backtest()"""
+    df   = _make_ohlcv(1500)
+    risk = {'fee_rate_pct': 0.06}
+    configs = [
+        {'min_entropy_drop_pct': 0.0, 'min_energy_rise_pct': 0.0},
+        {'min_entropy_drop_pct': 0.0, 'atr_sl_mult': 1.0, 'atr_tp_mult': 4.0, 'risk_per_trade_pct': 2.5},
+        {'entropy_window': 30, 'atr_period': 10, 'use_multitf_filter': 1, 'min_entropy_drop_pct': 0.0},
+        {'use_regime_filter': 0, 'min_energy_rise_pct': 5.0},
+        {'allow_range_trade': 1, 'energy_lookback': 8, 'min_entropy_drop_pct': 0.01},
+    ]
+    table = run_backtest_batch(df, configs, risk)
+    assert len(table) == len(configs)
+    assert table['total_trades'].sum() > 0
+    for cfg, row in zip(configs, table.to_dict('records')):
+        single = run_backtest(df, cfg, risk, feature_cache=None)
+        assert {k: single[k] for k in row} == row
+
+
+def test_entropy_cube_roundtrip_and_dataset_check(tmp_path):
+    """Gespeicherter Cube liefert dieselben Trades; fremder Datensatz wird ignoriert"""
+    df   = _make_ohlcv(1200)
+    cfg  = {'entropy_window': 24, 'min_entropy_drop_pct': 0.0, 'min_energy_rise_pct': 0.05}
+    cube = build_entropy_cube(df, range(10, 31))
+    path = str(tmp_path / 'cube.npz')
+    save_entropy_cube(path, cube)
+    loaded = load_entropy_cube(path)
+
+    with_cube = run_backtest(df, cfg, {}, feature_cache=None, entropy_cube=cube)
+    assert with_cube['total_trades'] > 0
+    assert run_backtest(df, cfg, {}, feature_cache=None, entropy_cube=loaded) == with_cube
+
+    other = _make_ohlcv(1200, seed=9)
+    assert (run_backtest(other, cfg, {}, feature_cache=None, entropy_cube=cube)
+            == run_backtest(other, cfg, {}, feature_cache=None))
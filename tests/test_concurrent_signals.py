@@ -0,0 +1,100 @@
+"""
+mbot Concurrent-Signal Tests
+
+Prueft die asyncio-Signal-Auswertung mit FakeBitget: gleichzeitige
+OHLCV-Abrufe, feste Prioritaetsreihenfolge der Orders unabhaengig von der
+Antwort-Reihenfolge, max_open_positions und den Latenz-Report.
+"""
+
+import os
+import sys
+import time
+import random
+import logging
+
+import pytest
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(os.path.join(PROJECT_ROOT, 'src'))
+
+from mbot.utils import trade_manager
+from mbot.strategy import concurrent_signals
+from mbot.strategy.concurrent_signals import (
+    make_signal_pool,
+    priority_order,
+    run_signal_checks,
+    format_latency_report,
+)
+
+LOG = logging.getLogger('test-concurrent')
+
+
+@pytest.fixture
+def setup(fake_exchange, no_sleep):
+    """n Symbole, Uhr 2s nach dem Schluss von Kerze 299"""
+    def make(n_symbols, latency):
+        symbols = [f'CS{i}/USDT:USDT' for i in range(n_symbols)]
+        fake, exchange = fake_exchange(symbols, start_candle=300, offset_ms=2000, latency=latency,
+                                       live_buffer=True,
+                                       store={'n': 400, 'seed': 11, 'base': 20.0, 'vol': 0.004})
+        strategies = [{'symbol': s, 'timeframe': '15m', 'active': True} for s in symbols]
+        configs    = {(s, '15m'): ({}, {'leverage': 5, 'risk_per_trade_pct': 0.5}) for s in symbols}
+        return fake, exchange, strategies, configs
+    return make
+
+
+def test_priority_order_is_deterministic():
+    strategies = [{'symbol': 'A'}, {'symbol': 'B', 'priority': 2}, {'symbol': 'C'}, {'symbol': 'D', 'priority': 2}]
+    assert [s['symbol'] for s in priority_order(strategies)] == ['B', 'D', 'A', 'C']
+
+
+def test_fetches_overlap_and_report_covers_all(setup):
+    """6 Abrufe mit je 0.3s Latenz laufen gleichzeitig statt nacheinander (1.8s)"""
+    fake, exchange, strategies, configs = setup(
+        6, latency=lambda m: 0.3 if m == 'fetch_ohlcv' else 0.0)
+    with make_signal_pool(1) as pool:
+        started = time.perf_counter()
+        report  = run_signal_checks(exchange, strategies, configs, 10, {},
+                                    get_logger=lambda s, tf: LOG, pool=pool)
+        elapsed = time.perf_counter() - started
+
+    assert elapsed < 1.2
+    assert fake.calls['fetch_ohlcv'] == 6 and report['evaluated'] == 6
+    for rec in report['strategies']:
+        assert rec['status'] in ('no_signal', 'traded', 'not_placed')
+        assert rec['close_ms'] <= rec['fetched_ms'] <= rec['decided_ms']
+    # Kerzen-Schluss liegt 2s vor dem Start (simulierte Uhr)
+    assert report['close_to_last_decision_ms'] >= 2000
+    text = format_latency_report(report)
+    assert 'letzte Entscheidung' in text and text.count('CS') == 6
+
+
+def test_orders_follow_priority_and_max_open(setup, monkeypatch):
+    """Antworten kommen in zufaelliger Reihenfolge; Orders trotzdem nach Prioritaet, max. 2 Positionen"""
+    rng = random.Random(4)
+    fake, exchange, strategies, configs = setup(
+        5, latency=lambda m: rng.uniform(0.0, 0.05) if m == 'fetch_ohlcv' else 0.0)
+    strategies[3]['priority'] = 1
+
+    def always_long(df, signal_config):
+        price = float(df['close'].iloc[-2])
+        return {'side': 'long', 'entry_price': price, 'atr': price * 0.004, 'atr_sl_mult': 1.5,
+                'atr_tp_mult': 2.0, 'reason': 'test', 'entropy_drop': True, 'energy_rise': True,
+                'acceleration': 1.0}
+
+    monkeypatch.setattr(concurrent_signals, 'compute_signal', always_long)
+    with make_signal_pool(1) as pool:
+        report = run_signal_checks(exchange, strategies, configs, 2, {},
+                                   get_logger=lambda s, tf: LOG, pool=pool)
+
+    status = [(r['symbol'], r['status']) for r in report['strategies']]
+    assert status == [('CS3/USDT:USDT', 'traded'), ('CS0/USDT:USDT', 'traded'),
+                      ('CS1/USDT:USDT', 'max_open'), ('CS2/USDT:USDT', 'max_open'),
+                      ('CS4/USDT:USDT', 'max_open')]
+    assert {p['symbol'] for p in trade_manager.read_active_positions()} == {'CS3/USDT:USDT', 'CS0/USDT:USDT'}
+
+    # Zweiter Lauf: belegte Strategien werden nicht erneut abgerufen
+    calls  = fake.calls['fetch_ohlcv']
+    report = run_signal_checks(exchange, strategies, configs, 3, {}, get_logger=lambda s, tf: LOG)
+    assert fake.calls['fetch_ohlcv'] - calls == 3
+    assert [r['status'] for r in report['strategies']][:2] == ['in_trade', 'in_trade']
@@ -0,0 +1,119 @@
+"""
+mbot Daemon Tests
+
+Prueft den Master-Daemon mit FakeBitget: Takt an Kerzen-Grenzen, eine
+Exchange-Instanz fuer alle Ticks, Signal-Checks nur fuer faellige Strategien.
+"""
+
+import os
+import sys
+import json
+import logging
+
+import pytest
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(os.path.join(PROJECT_ROOT, 'src'))
+
+from mbot.strategy.daemon import MasterDaemon, next_boundary
+
+HOUR = 3600
+
+
+@pytest.fixture
+def setup(tmp_path, fake_exchange, no_sleep):
+    symbols  = ['DMA/USDT:USDT', 'DMB/USDT:USDT']
+    fake, ex = fake_exchange(symbols, timeframe='1h', start_candle=300, offset_ms=0, live_buffer=True,
+                             store={'timeframes': ('1h', '4h'), 'n': 600, 'seed': 5, 'vol': 0.01,
+                                    'wick': 0.01})
+    created  = []
+    fake.calls.clear()    # nur die Exchange-Instanzen des Daemons zaehlen
+
+    def factory(account):
+        created.append(account)
+        return type(ex)(account, client=fake)
+
+    settings = {'live_trading_settings': {'max_open_positions': 5, 'active_strategies': [
+        {'symbol': symbols[0], 'timeframe': '1h', 'active': True},
+        {'symbol': symbols[1], 'timeframe': '4h', 'active': True},
+    ]}, 'risk': {'leverage': 5}}
+    (tmp_path / 'settings.json').write_text(json.dumps(settings))
+    (tmp_path / 'secret.json').write_text(json.dumps({'mbot': [{'apiKey': 'x'}]}))
+
+    clock  = [fake.now_ms / 1000]
+    daemon = MasterDaemon(str(tmp_path / 'settings.json'), str(tmp_path / 'secret.json'),
+                          check_interval=900, close_delay=2.0, exchange_factory=factory,
+                          clock=lambda: clock[0])
+    return daemon, fake, clock, created, symbols
+
+
+def test_next_boundary_is_utc_grid(replay_start):
+    start = replay_start // 1000
+    assert next_boundary(start + 10, 4 * HOUR) == start + 4 * HOUR
+    assert next_boundary(start + 4 * HOUR, 4 * HOUR) == start + 8 * HOUR
+
+
+def test_wakes_at_candle_close_and_runs_due_strategies(setup):
+    """1h-Strategie an jeder Stunde, 4h nur an 4h-Grenzen; Positions-Checks dazwischen"""
+    daemon, fake, clock, created, symbols = setup
+    daemon.reload()
+
+    wakes = []
+    for _ in range(10):
+        wake, due = daemon.next_wake(clock[0])
+        wakes.append((wake, sorted(s['timeframe'] for s in due)))
+        clock[0]    = wake
+        fake.now_ms = int(wake * 1000)
+        daemon.tick(due)
+
+    for wake, due in wakes:
+        if due:
+            # 2s (close_delay) nach einer vollen UTC-Stunde
+            assert (wake - 2) % HOUR == 0
+            assert due == (['1h', '4h'] if (wake - 2) % (4 * HOUR) == 0 else ['1h'])
+    assert ['1h', '4h'] in [due for _, due in wakes]
+    # Positions-Check ohne Signal: spaetestens nach check_interval
+    assert any(not due for w, due in wakes)
+    assert len(created) == 1 and fake.calls['load_markets'] == 1
+    assert fake.calls['fetch_ohlcv'] >= sum(len(d) for w, d in wakes)
+
+
+def test_settings_are_reloaded_only_on_change(setup):
+    daemon, fake, clock, created, symbols = setup
+    daemon.reload()
+    daemon.reload()
+    assert len(created) == 1 and len(daemon.active_strategies()) == 2
+
+    path     = daemon.settings_path
+    settings = json.load(open(path))
+    settings['live_trading_settings']['active_strategies'][1]['active'] = False
+    with open(path, 'w') as f:
+        json.dump(settings, f)
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 10**9))
+    daemon.reload()
+    assert [s['timeframe'] for s in daemon.active_strategies()] == ['1h']
+    assert len(created) == 1
+
+
+def test_async_signals_evaluate_due_strategies_in_one_pass(setup, caplog):
+    """async_signals: alle faelligen Strategien in einem Durchlauf mit Latenz-Report"""
+    daemon, fake, clock, created, symbols = setup
+    daemon.async_signals = True
+    daemon.reload()
+
+    wake, due = daemon.next_wake(clock[0])
+    while len(due) < 2:
+        clock[0]    = wake
+        fake.now_ms = int(wake * 1000)
+        daemon.tick(due)
+        wake, due = daemon.next_wake(clock[0])
+    clock[0]    = wake
+    fake.now_ms = int(wake * 1000)
+    with caplog.at_level(logging.INFO, logger='mbot.strategy.daemon'):
+        daemon.tick(due)
+    assert any(r.getMessage().startswith('Daemon-Tick: 2 Signal-Check(s)') for r in caplog.records)
+
+    report = daemon.last_report
+    assert sorted(r['timeframe'] for r in report['strategies']) == ['1h', '4h']
+    assert all(r['decided_ms'] is not None for r in report['strategies'])
+    assert report['close_to_last_decision_ms'] >= 2000
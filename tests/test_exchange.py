@@ -0,0 +1,99 @@
+"""
+mbot Exchange Tests
+
+Prueft fetch_recent_ohlcv() mit Live-Ringpuffer gegen einen Fake-Exchange:
+Delta-Abruf pro Tick, Ergebnis wie ohne Puffer (kein API-Zugriff noetig).
+"""
+
+import os
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(os.path.join(PROJECT_ROOT, 'src'))
+
+import ccxt
+
+from mbot.utils.exchange import Exchange
+from mbot.utils.ohlcv_cache import OHLCVCache
+from mbot.strategy.mers_signal import required_candles
+
+HOUR = 3600 * 1000
+
+
+class _ClockExchange:
+    """1h-Kerzen bis now_ts (laufende Kerze inklusive); protokolliert (since, limit)."""
+
+    def __init__(self, now_ts: int):
+        self.now_ts = now_ts
+        self.calls  = []
+
+    def parse_timeframe(self, timeframe):
+        return ccxt.Exchange.parse_timeframe(timeframe)
+
+    def milliseconds(self):
+        return self.now_ts
+
+    def fetch_ohlcv(self, symbol, timeframe, since, limit):
+        self.calls.append((since, limit))
+        first = since + (-since % HOUR)
+        rows  = []
+        for ts in range(first, min(self.now_ts + 1, first + limit * HOUR), HOUR):
+            price = 100.0 + (ts // HOUR) % 23
+            # Laufende Kerze: Schlusskurs haengt von der Uhrzeit ab
+            close = price + (self.now_ts - ts) / HOUR if ts + HOUR > self.now_ts else price + 0.5
+            rows.append([ts, price, price + 2, price - 2, close, 10.0])
+        return rows
+
+
+def _exchange(fake) -> Exchange:
+    ex = Exchange.__new__(Exchange)
+    ex.account, ex.exchange, ex.markets = {}, fake, {'BTC/USDT:USDT': {}}
+    return ex
+
+
+def test_ticks_fetch_only_new_candles(tmp_path):
+    """Folgeaufrufe: ein Request ab der letzten gespeicherten Kerze, Ergebnis wie ohne Puffer"""
+    now    = ccxt.Exchange.parse8601('2025-03-01T00:00:00Z') + 20 * 60 * 1000
+    fake   = _ClockExchange(now)
+    buffer = OHLCVCache(str(tmp_path))
+    first  = _exchange(fake).fetch_recent_ohlcv('BTC/USDT:USDT', '1h', limit=80, buffer=buffer)
+    assert len(first) == 80
+
+    for _ in range(3):
+        fake.now_ts += HOUR
+        fake.calls.clear()
+        df     = _exchange(fake).fetch_recent_ohlcv('BTC/USDT:USDT', '1h', limit=80, buffer=buffer)
+        direct = _exchange(fake).fetch_recent_ohlcv('BTC/USDT:USDT', '1h', limit=80, buffer=None)
+        assert len(fake.calls) == 2 and fake.calls[0][1] <= 3
+        assert df.index.equals(direct.index)
+        assert (df.to_numpy() == direct.to_numpy()).all()
+
+    # Die laufende Kerze landet nicht im Puffer
+    assert buffer.index('BTC/USDT:USDT', '1h')['last_ts'] == fake.now_ts // HOUR * HOUR - HOUR
+
+
+def test_required_candles_follows_signal_config():
+    """Abruflaenge = min_required + ATR-Vorlauf, bei MTF mindestens 3 Makro-Schritte"""
+    cfg = {'entropy_window': 20, 'entropy_lookback': 10, 'energy_lookback': 5,
+           'atr_period': 14, 'regime_window': 20}
+    assert required_candles(cfg) == 20 + 10 + 14 + 20 + 5 + 5 * 14
+    assert required_candles(dict(cfg, use_multitf_filter=1, macro_tf_mult=30)) == 139
+    assert required_candles(dict(cfg, use_multitf_filter=1, macro_tf_mult=60)) == 181
+
+
+def test_growing_limit_refetches_missing_history(tmp_path):
+    """Puffer aus limit=30, danach limit=80: volles Fenster statt 30 Kerzen, dann wieder Delta"""
+    now    = ccxt.Exchange.parse8601('2025-03-01T00:00:00Z') + 20 * 60 * 1000
+    fake   = _ClockExchange(now)
+    buffer = OHLCVCache(str(tmp_path))
+    assert len(_exchange(fake).fetch_recent_ohlcv('BTC/USDT:USDT', '1h', limit=30, buffer=buffer)) == 30
+
+    df     = _exchange(fake).fetch_recent_ohlcv('BTC/USDT:USDT', '1h', limit=80, buffer=buffer)
+    direct = _exchange(fake).fetch_recent_ohlcv('BTC/USDT:USDT', '1h', limit=80, buffer=None)
+    assert len(df) == 80 and df.index.equals(direct.index)
+    assert (df.to_numpy() == direct.to_numpy()).all()
+
+    fake.now_ts += HOUR
+    fake.calls.clear()
+    assert len(_exchange(fake).fetch_recent_ohlcv('BTC/USDT:USDT', '1h', limit=80, buffer=buffer)) == 80
+    assert len(fake.calls) == 1 and fake.calls[0][1] <= 3
@@ -0,0 +1,102 @@
+"""
+mbot Fake-Exchange Tests
+
+Prueft FakeBitget (Matching-Engine, Konto, Fehler-Injektion) und den
+Live-Pfad execute_signal_trade -> check_position_status -> housekeeper
+ohne Netzwerk.
+"""
+
+import os
+import sys
+import logging
+
+import pytest
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(os.path.join(PROJECT_ROOT, 'src'))
+
+from mbot.utils import trade_manager
+
+STORE = {'n': 400, 'seed': 3, 'base': 100.0, 'vol': 0.004}
+
+
+def test_trigger_orders_match_against_replayed_candles(fake_exchange):
+    """TP/SL loesen beim Replay aus; der Gegen-Trigger verfaellt als Ghost-Order"""
+    fake, ex = fake_exchange(['BTC/USDT:USDT'], store=STORE, balance=1000.0)
+    assert 'BTC/USDT:USDT' in ex.markets
+
+    entry = ex.place_market_order('BTC/USDT:USDT', 'buy', 1.0)
+    price = entry['average']
+    assert entry['status'] == 'closed' and price == fake.price('BTC/USDT:USDT')
+    ex.place_trigger_market_order('BTC/USDT:USDT', 'sell', 1.0, price * 0.99, reduce=True)
+    ex.place_trigger_market_order('BTC/USDT:USDT', 'sell', 1.0, price * 1.01, reduce=True)
+
+    for _ in range(300):
+        if not ex.fetch_open_positions('BTC/USDT:USDT'):
+            break
+        fake.advance()
+    assert not ex.fetch_open_positions('BTC/USDT:USDT')
+
+    balance = ex.fetch_balance_usdt()
+    closes  = [o for o in fake._orders.values() if o['triggerPrice'] and o['status'] == 'closed']
+    assert len(closes) == 1
+    expected = 1000.0 + (closes[0]['average'] - price) - 0.0006 * (price + closes[0]['average'])
+    assert balance == pytest.approx(expected)
+
+    # Verbleibender Trigger ist noch offen, cancel_all raeumt ihn ab
+    assert len(fake.fetch_open_orders('BTC/USDT:USDT', params={'stop': True})) == 1
+    ex.cancel_all_orders_for_symbol('BTC/USDT:USDT')
+    assert fake.fetch_open_orders('BTC/USDT:USDT') == []
+
+
+def test_live_cycle_with_trade_manager(fake_exchange, make_signal, no_sleep):
+    """Entry + SL/TP, Check waehrend offen, Housekeeper + State-Reset nach Ausloesung"""
+    fake, ex = fake_exchange(['ETH/USDT:USDT'], store=STORE, start_candle=150)
+    log      = logging.getLogger('test-fake')
+    signal   = make_signal(fake, 'ETH/USDT:USDT', 'short')
+
+    assert trade_manager.execute_signal_trade(ex, 'ETH/USDT:USDT', '15m', signal,
+                                              {'leverage': 5}, {}, log)
+    assert trade_manager.read_position('ETH/USDT:USDT', '15m')['side'] == 'short'
+    # SL/TP kommen als Preset mit dem Entry (Bitget planType profit_loss)
+    assert len(fake.fetch_open_orders('ETH/USDT:USDT', params={'stop': True, 'planType': 'profit_loss'})) == 2
+
+    trade_manager.check_position_status(ex, 'ETH/USDT:USDT', '15m', {}, log)
+    assert trade_manager.read_position('ETH/USDT:USDT', '15m') is not None
+
+    while fake.fetch_positions(['ETH/USDT:USDT']):
+        fake.advance()
+    trade_manager.check_position_status(ex, 'ETH/USDT:USDT', '15m', {}, log)
+    assert trade_manager.read_position('ETH/USDT:USDT', '15m') is None
+    assert fake.fetch_open_orders('ETH/USDT:USDT') == []
+
+
+def test_soak_many_strategies_with_injected_errors(fake_exchange, make_signal, no_sleep):
+    """120 Strategien mit Timeouts: kein offener Trade ohne State, keine Position ohne Schutz"""
+    symbols  = [f'C{i:03d}/USDT:USDT' for i in range(120)]
+    fake, ex = fake_exchange(symbols, store=dict(STORE, n=200), start_candle=50,
+                             balance=1_000_000.0, error_rate=0.05, seed=11,
+                             error_methods={'create_order', 'fetch_positions', 'cancel_all_orders'})
+    log      = logging.getLogger('test-fake-soak')
+    log.setLevel(logging.CRITICAL)
+
+    for symbol in symbols:
+        signal = make_signal(fake, symbol, atr_pct=0.003, sl_mult=1.0, tp_mult=1.0, reason='soak')
+        trade_manager.execute_signal_trade(ex, symbol, '15m', signal,
+                                           {'leverage': 5, 'risk_per_trade_pct': 0.005}, {}, log)
+
+    for _ in range(40):
+        fake.advance()
+        for pos in trade_manager.read_active_positions():
+            trade_manager.check_position_status(ex, pos['symbol'], '15m', {}, log)
+
+    # Ohne Stoerungen raeumt der Housekeeper alles Ungetrackte ab
+    fake.error_rate = 0.0
+    tracked = {p['symbol'] for p in trade_manager.read_active_positions()}
+    for symbol in set(symbols) - tracked:
+        assert trade_manager.housekeeper_routine(ex, symbol, log)
+    for pos in fake.fetch_positions():
+        assert pos['symbol'] in tracked
+        assert fake.fetch_open_orders(pos['symbol'], params={'stop': True}) or \
+            fake.fetch_open_orders(pos['symbol'], params={'stop': True, 'planType': 'profit_loss'})
+    assert fake.calls['create_order'] >= len(symbols)
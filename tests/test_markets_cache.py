@@ -0,0 +1,101 @@
+"""
+mbot Markets-Cache Tests
+
+Prueft Exchange-Start aus dem Markets-Cache: kein load_markets() bei
+frischem Cache, Hintergrund-Erneuerung nach TTL, Schema-Version
+(kein API-Zugriff noetig).
+"""
+
+import os
+import sys
+import json
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(os.path.join(PROJECT_ROOT, 'src'))
+
+import ccxt
+
+from mbot.utils.exchange import Exchange
+from mbot.utils.markets_cache import MarketsCache, MARKETS_SCHEMA_VERSION
+
+
+def _market(symbol: str, amount_step: float, price_step: float, min_amount: float) -> dict:
+    base = symbol.split('/')[0]
+    return {
+        'id': f'{base}USDT', 'symbol': symbol, 'base': base, 'quote': 'USDT', 'settle': 'USDT',
+        'baseId': base, 'quoteId': 'USDT', 'settleId': 'USDT', 'type': 'swap',
+        'spot': False, 'margin': False, 'swap': True, 'future': False, 'option': False,
+        'contract': True, 'linear': True, 'inverse': False, 'contractSize': 1.0, 'active': True,
+        'precision': {'amount': amount_step, 'price': price_step},
+        'limits': {'amount': {'min': min_amount, 'max': None}, 'price': {'min': None, 'max': None},
+                   'cost': {'min': None, 'max': None}, 'leverage': {'min': 1, 'max': 125}},
+        'info': {},
+    }
+
+
+MARKETS = {
+    'BTC/USDT:USDT':  _market('BTC/USDT:USDT', 0.0001, 0.1, 0.0001),
+    'PEPE/USDT:USDT': _market('PEPE/USDT:USDT', 1.0, 1e-8, 100.0),
+}
+
+
+class _Counter:
+    def __init__(self, monkeypatch, markets=MARKETS):
+        self.calls = 0
+
+        def load_markets(client, reload=False, params={}):
+            self.calls += 1
+            client.set_markets(markets)
+            return client.markets
+        monkeypatch.setattr(ccxt.bitget, 'load_markets', load_markets)
+
+
+def test_fresh_cache_skips_load_markets(tmp_path, monkeypatch):
+    """Frischer Cache: Start ohne Request, Precision/Minimum aus dem Cache"""
+    cache = MarketsCache(str(tmp_path), ttl=3600)
+    cache.write('bitget', MARKETS)
+    counter = _Counter(monkeypatch)
+
+    ex = Exchange({}, markets_cache=cache)
+    assert counter.calls == 0
+    assert set(ex.markets) == set(MARKETS)
+    assert ex.amount_to_precision('BTC/USDT:USDT', 0.123456) == '0.1234'
+    assert ex.price_to_precision('PEPE/USDT:USDT', 0.0000123456) == '0.00001235'
+    assert ex.fetch_min_amount_tradable('PEPE/USDT:USDT') == 100.0
+    assert counter.calls == 0
+
+
+def test_missing_or_outdated_cache_loads_and_writes(tmp_path, monkeypatch):
+    """Ohne Cache bzw. mit alter Schema-Version: load_markets() und Datei schreiben"""
+    cache   = MarketsCache(str(tmp_path), ttl=3600)
+    counter = _Counter(monkeypatch)
+    Exchange({}, markets_cache=cache)
+    assert counter.calls == 1
+
+    entry = json.load(open(cache.path('bitget')))
+    assert entry['schema'] == MARKETS_SCHEMA_VERSION and set(entry['markets']) == set(MARKETS)
+
+    entry['schema'] = MARKETS_SCHEMA_VERSION - 1
+    json.dump(entry, open(cache.path('bitget'), 'w'))
+    Exchange({}, markets_cache=cache)
+    assert counter.calls == 2
+
+
+def test_stale_cache_is_refreshed_in_background(tmp_path, monkeypatch):
+    """Abgelaufener Cache: sofort nutzbar, Erneuerung im Hintergrund aktualisiert Datei und Exchange"""
+    cache = MarketsCache(str(tmp_path), ttl=60)
+    cache.write('bitget', {'BTC/USDT:USDT': MARKETS['BTC/USDT:USDT']})
+    entry = json.load(open(cache.path('bitget')))
+    entry['fetched_at'] -= 3600 * 1000
+    json.dump(entry, open(cache.path('bitget'), 'w'))
+    counter = _Counter(monkeypatch)
+
+    ex = Exchange({}, markets_cache=cache)
+    assert 'BTC/USDT:USDT' in ex.markets
+    deadline = time.time() + 5
+    while (cache.is_stale(cache.read('bitget')) or 'PEPE/USDT:USDT' not in ex.markets) \
+            and time.time() < deadline:
+        time.sleep(0.01)
+    assert not cache.is_stale(cache.read('bitget'))
+    assert counter.calls == 1 and 'PEPE/USDT:USDT' in ex.markets
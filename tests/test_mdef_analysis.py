@@ -0,0 +1,121 @@
+"""
+mbot MDEF-Analyse Tests
+
+Prueft die vektorisierten Indikator-Berechnungen gegen die
+Referenz-Implementierungen (kein API-Zugriff noetig).
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(os.path.join(PROJECT_ROOT, 'src'))
+
+from mbot.strategy.mdef_analysis import (
+    calc_log_returns,
+    calc_rolling_entropy,
+    calc_entropy_cube,
+    calc_velocity,
+    calc_acceleration,
+    classify_phase_regime,
+    classify_phase_regime_series,
+    calc_multitf_alignment,
+    calc_multitf_alignment_series,
+    REGIME_NONE,
+    REGIME_NAMES,
+    _entropy_block,
+    _rolling_entropy_jit,
+)
+
+
+def _make_price(n: int, seed: int = 42, decimals: int = 2) -> pd.Series:
+    rng   = np.random.default_rng(seed)
+    price = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.01, n)))
+    idx   = pd.date_range('2025-01-01', periods=n, freq='h', tz='UTC')
+    return pd.Series(np.round(price, decimals), index=idx, name='close')
+
+
+def _reference_rolling_entropy(returns: pd.Series, window: int = 20, bins: int = 10) -> pd.Series:
+    """Urspruengliche Implementierung: np.histogram pro Fenster via rolling().apply()."""
+    def _entropy(x: np.ndarray) -> float:
+        counts, _ = np.histogram(x, bins=bins)
+        counts = counts[counts > 0]
+        if len(counts) == 0:
+            return 0.0
+        p = counts / counts.sum()
+        return float(-np.sum(p * np.log(p + 1e-12)))
+
+    return returns.rolling(window).apply(_entropy, raw=True).bfill()
+
+
+def test_rolling_entropy_matches_reference():
+    """Vektorisierte Entropy ist bitidentisch zur rolling().apply()-Referenz"""
+    for seed, decimals in [(1, 2), (2, 0), (3, 6)]:
+        returns = calc_log_returns(_make_price(600, seed=seed, decimals=decimals))
+        for window in [1, 5, 20, 60]:
+            for bins in [3, 10]:
+                fast = calc_rolling_entropy(returns, window=window, bins=bins)
+                ref  = _reference_rolling_entropy(returns, window=window, bins=bins)
+                assert fast.index.equals(ref.index)
+                assert np.array_equal(fast.to_numpy(), ref.to_numpy(), equal_nan=True), \
+                    f'Abweichung bei seed={seed} window={window} bins={bins}'
+
+
+def test_rolling_entropy_constant_and_short_series():
+    """Konstante Fenster (leerer Bereich) und zu kurze Serien wie Referenz"""
+    flat = pd.Series(np.zeros(50))
+    assert np.array_equal(calc_rolling_entropy(flat, window=10).to_numpy(),
+                          _reference_rolling_entropy(flat, window=10).to_numpy())
+
+    short = pd.Series([0.01, -0.02, 0.03])
+    assert calc_rolling_entropy(short, window=20).isna().all()
+
+
+def test_entropy_cube_rows_match_rolling_entropy():
+    """Zeile r des Cubes == calc_rolling_entropy(window=windows[r]) (auf float32 gerundet)"""
+    returns = calc_log_returns(_make_price(500, seed=6, decimals=3))
+    windows = [25, 10, 60, 25, 1]
+    cube    = calc_entropy_cube(returns, windows)
+    assert cube.shape == (len(windows), len(returns)) and cube.dtype == np.float32
+    for row, window in zip(cube, windows):
+        expected = calc_rolling_entropy(returns, window=window).to_numpy().astype(np.float32)
+        np.testing.assert_allclose(row, expected, rtol=1e-6)
+
+
+def test_entropy_jit_kernel_matches_numpy_block():
+    """Numba-Kernel (oder dessen Python-Fallback) == NumPy-Blockvariante bis auf log()-Rundung"""
+    values = calc_log_returns(_make_price(400, seed=4, decimals=3)).to_numpy().copy()
+    values[150] = np.nan
+    for window, bins in [(1, 10), (20, 10), (45, 3), (30, 12)]:
+        windows = np.lib.stride_tricks.sliding_window_view(values, window)
+        np.testing.assert_allclose(_rolling_entropy_jit(values, window, bins),
+                                   _entropy_block(windows, bins), rtol=1e-13, atol=0.0)
+
+
+def test_regime_series_matches_single_window_classification():
+    """classify_phase_regime_series()[i] == classify_phase_regime() auf Daten bis i"""
+    velocity = calc_velocity(_make_price(300, seed=5))
+    acc      = calc_acceleration(velocity)
+    for window in [2, 14, 20]:
+        codes = classify_phase_regime_series(velocity, acc, window=window)
+        assert codes.dtype == np.int8 and len(codes) == len(velocity)
+        assert (codes[:window - 1] == REGIME_NONE).all()
+        for i in range(window - 1, len(velocity)):
+            expected = classify_phase_regime(velocity.iloc[:i + 1], acc.iloc[:i + 1], window=window)
+            assert REGIME_NAMES[int(codes[i])] == expected, f'Abweichung bei i={i} window={window}'
+
+
+def test_multitf_alignment_series_matches_windowed_call():
+    """calc_multitf_alignment_series() == calc_multitf_alignment() auf dem Fenster bis i"""
+    df = _make_price(260, seed=9, decimals=0).to_frame()
+    for meso, macro, window in [(4, 16, 111), (3, 8, None), (2, 24, 60)]:
+        series = calc_multitf_alignment_series(df, meso_mult=meso, macro_mult=macro, window=window)
+        for i in range(len(df)):
+            start    = 0 if window is None else max(0, i - window + 1)
+            expected = calc_multitf_alignment(df.iloc[start:i + 1], meso_mult=meso, macro_mult=macro)
+            row      = series.iloc[i]
+            assert {k: type(expected[k])(row[k]) for k in expected} == expected, \
+                f'Abweichung bei i={i} meso={meso} macro={macro} window={window}'
@@ -0,0 +1,84 @@
+"""
+mbot MERS-Signal Tests
+
+Prueft den Stream-Zustand (MersStreamState) gegen get_mers_signal()
+auf denselben Kerzen (kein API-Zugriff noetig).
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(os.path.join(PROJECT_ROOT, 'src'))
+
+from mbot.strategy.mers_signal import get_mers_signal, required_candles, MersStreamState
+
+
+def _make_ohlcv(n: int, seed: int = 7) -> pd.DataFrame:
+    rng   = np.random.default_rng(seed)
+    close = np.round(100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.01, n))), 2)
+    open_ = np.r_[close[0], close[:-1]]
+    high  = np.maximum(open_, close) * (1 + rng.random(n) * 0.004)
+    low   = np.minimum(open_, close) * (1 - rng.random(n) * 0.004)
+    idx   = pd.date_range('2025-01-01', periods=n, freq='h', tz='UTC')
+    return pd.DataFrame({'open': open_, 'high': high, 'low': low,
+                         'close': close, 'volume': 1.0}, index=idx)
+
+
+def test_stream_state_matches_batch_signal():
+    """MersStreamState.signal() == get_mers_signal() nach jeder Kerze"""
+    df = _make_ohlcv(220)
+    signal_config = {
+        'entropy_window': 18, 'entropy_lookback': 6, 'energy_lookback': 4,
+        'min_entropy_drop_pct': 0.0, 'min_energy_rise_pct': 0.0, 'atr_period': 10,
+        'use_regime_filter': 1, 'regime_window': 14, 'allow_range_trade': 1,
+        'use_multitf_filter': 1, 'meso_tf_mult': 3, 'macro_tf_mult': 7,
+    }
+
+    state = MersStreamState(signal_config)
+    n_signals = 0
+    for i, (ts, row) in enumerate(df.iterrows()):
+        state.update(row['high'], row['low'], row['close'], timestamp=ts)
+        expected = get_mers_signal(df.iloc[:i + 1], signal_config)
+        assert state.signal() == expected, f'Abweichung nach Kerze {i}'
+        n_signals += expected['side'] is not None
+
+    assert n_signals > 0, 'Testdaten erzeugen kein einziges Signal'
+
+
+def test_stream_state_ignores_duplicate_candles():
+    """Bereits verarbeitete Kerzen (gleicher timestamp) werden ignoriert"""
+    df    = _make_ohlcv(150)
+    state = MersStreamState.from_df(df, {})
+    last  = df.iloc[-1]
+    assert state.update(last['high'], last['low'], last['close'], timestamp=df.index[-1]) is False
+    assert state.count == len(df)
+    assert state.signal() == get_mers_signal(df, {})
+
+
+def test_live_window_matches_full_history():
+    """Signal aus required_candles Kerzen (Live-Abruf) == Signal aus voller Historie (ATR/SL/TP)"""
+    df = _make_ohlcv(700, seed=3)
+    signal_config = {
+        'entropy_window': 18, 'entropy_lookback': 6, 'energy_lookback': 4,
+        'min_entropy_drop_pct': 0.0, 'min_energy_rise_pct': 0.0, 'atr_period': 14,
+        'use_regime_filter': 1, 'regime_window': 14, 'allow_range_trade': 1,
+    }
+    n = required_candles(signal_config)
+
+    compared = 0
+    for end in range(450, 700):
+        full = get_mers_signal(df.iloc[:end], signal_config)
+        live = get_mers_signal(df.iloc[end - n:end], signal_config)
+        assert live['side'] == full['side'], f'Abweichung bei Kerze {end}'
+        if full['side'] is None:
+            continue
+        compared += 1
+        for key in ('atr', 'sl_price', 'tp_price'):
+            assert live[key] == pytest.approx(full[key], rel=1e-5), f'{key} bei Kerze {end}'
+
+    assert compared > 0, 'Testdaten erzeugen kein einziges Signal'
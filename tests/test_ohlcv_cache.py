@@ -0,0 +1,170 @@
+"""
+mbot OHLCV-Cache Tests
+
+Prueft load_data() mit lokalem Cache gegen einen Fake-Exchange:
+inkrementelles Nachladen, Luecken und Bereiche vor dem Listing
+(kein API-Zugriff noetig).
+"""
+
+import os
+import sys
+import multiprocessing
+
+import numpy as np
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(os.path.join(PROJECT_ROOT, 'src'))
+
+import ccxt
+
+from mbot.analysis.backtester import load_data
+from mbot.utils.ohlcv_cache import OHLCVCache
+
+HOUR = 3600 * 1000
+
+
+class _PagedExchange:
+    """Liefert 1h-Kerzen ab listed_ts, hoechstens 200 pro Abruf, und zaehlt die Abrufe."""
+
+    def __init__(self, listed_ts: int, now_ts: int, missing=()):
+        self.listed_ts = listed_ts
+        self.now_ts    = now_ts
+        self.missing   = set(missing)
+        self.calls     = []
+
+    def parse8601(self, text):
+        return ccxt.Exchange.parse8601(text)
+
+    def parse_timeframe(self, timeframe):
+        return ccxt.Exchange.parse_timeframe(timeframe)
+
+    def milliseconds(self):
+        return self.now_ts
+
+    def fetch_ohlcv(self, symbol, timeframe, since, limit):
+        self.calls.append(since)
+        first = max(since, self.listed_ts)
+        first += -(first - self.listed_ts) % HOUR
+        rows = []
+        for ts in range(first, min(self.now_ts, first + limit * HOUR), HOUR):
+            if ts not in self.missing:
+                price = 100.0 + (ts // HOUR) % 17
+                rows.append([ts, price, price + 1, price - 1, price + 0.5, 10.0])
+        return rows
+
+
+class _Wrapper:
+    def __init__(self, exchange):
+        self.exchange = exchange
+
+
+def _is_mapped(arr) -> bool:
+    while arr is not None:
+        if isinstance(arr, np.memmap):
+            return True
+        arr = arr.base
+    return False
+
+
+def _ts(date: str) -> int:
+    return ccxt.Exchange.parse8601(date + 'T00:00:00Z')
+
+
+def test_second_call_is_served_from_cache(tmp_path):
+    """Gleicher Zeitraum: kein Abruf mehr, identisches Ergebnis wie ohne Cache"""
+    ex    = _PagedExchange(_ts('2025-01-01'), _ts('2025-03-01'))
+    cache = OHLCVCache(str(tmp_path))
+    first = load_data(_Wrapper(ex), 'BTC/USDT:USDT', '1h', '2025-01-01', '2025-02-10', cache=cache)
+    assert len(first) == 41 * 24
+
+    ex.calls.clear()
+    again = load_data(_Wrapper(ex), 'BTC/USDT:USDT', '1h', '2025-01-05', '2025-02-10', cache=cache)
+    assert ex.calls == []
+    uncached = load_data(_Wrapper(ex), 'BTC/USDT:USDT', '1h', '2025-01-05', '2025-02-10', cache=None)
+    assert again.equals(uncached)
+
+
+def test_only_newer_candles_are_fetched(tmp_path):
+    """Spaeteres Enddatum: Abruf beginnt direkt nach der letzten gespeicherten Kerze"""
+    ex    = _PagedExchange(_ts('2025-01-01'), _ts('2025-03-01'))
+    cache = OHLCVCache(str(tmp_path))
+    load_data(_Wrapper(ex), 'ETH/USDT:USDT', '1h', '2025-01-01', '2025-01-20', cache=cache)
+
+    ex.calls.clear()
+    df = load_data(_Wrapper(ex), 'ETH/USDT:USDT', '1h', '2025-01-01', '2025-02-20', cache=cache)
+    assert min(ex.calls) == _ts('2025-01-21')
+    assert len(df) == 51 * 24
+    assert df.index.is_monotonic_increasing and not df.index.duplicated().any()
+
+
+def test_listing_and_exchange_gaps_are_not_refetched(tmp_path):
+    """Bereiche ohne Kerzen (vor Listing, Ausfall) werden vermerkt statt erneut geladen"""
+    gap   = [_ts('2025-01-10') + i * HOUR for i in range(5)]
+    ex    = _PagedExchange(_ts('2025-01-08'), _ts('2025-03-01'), missing=gap)
+    cache = OHLCVCache(str(tmp_path))
+    df    = load_data(_Wrapper(ex), 'SOL/USDT:USDT', '1h', '2025-01-01', '2025-01-31', cache=cache)
+    assert df.index[0].value // 10**6 == _ts('2025-01-08')
+    assert not np.isin(df.index.asi8 // 10**6, gap).any()
+
+    ex.calls.clear()
+    load_data(_Wrapper(ex), 'SOL/USDT:USDT', '1h', '2025-01-01', '2025-01-31', cache=cache)
+    assert ex.calls == []
+
+
+def test_open_candle_is_returned_but_not_cached(tmp_path):
+    """Die laufende Kerze kommt mit, landet aber nicht im Cache"""
+    now   = _ts('2025-01-03') + 30 * 60 * 1000
+    ex    = _PagedExchange(_ts('2025-01-01'), now)
+    cache = OHLCVCache(str(tmp_path))
+    df    = load_data(_Wrapper(ex), 'BTC/USDT:USDT', '1h', '2025-01-01', '2025-01-03', cache=cache)
+    assert df.index[-1].value // 10**6 == _ts('2025-01-03')
+    assert cache.read('BTC/USDT:USDT', '1h')['timestamp'][-1] == _ts('2025-01-03') - HOUR
+
+
+def test_store_views_are_memmapped_and_survive_updates(tmp_path):
+    """arrays()/frame() zeigen ohne Kopie auf die Spaltendateien; Index beschreibt den Stand"""
+    ex    = _PagedExchange(_ts('2025-01-01'), _ts('2025-03-01'))
+    cache = OHLCVCache(str(tmp_path))
+    load_data(_Wrapper(ex), 'BTC/USDT:USDT', '1h', '2025-01-01', '2025-01-10', cache=cache)
+
+    index = cache.index('BTC/USDT:USDT', '1h')
+    assert (index['rows'], index['first_ts']) == (10 * 24, _ts('2025-01-01'))
+    assert index['last_ts'] == _ts('2025-01-11') - HOUR
+
+    arrays = cache.arrays('BTC/USDT:USDT', '1h', _ts('2025-01-02'), _ts('2025-01-03'))
+    frame  = cache.frame('BTC/USDT:USDT', '1h')
+    assert len(arrays['close']) == 25 and not arrays['close'].flags.writeable
+    assert _is_mapped(arrays['close']) and _is_mapped(frame['close'].to_numpy())
+
+    before = arrays['close'].copy()
+    load_data(_Wrapper(ex), 'BTC/USDT:USDT', '1h', '2025-01-01', '2025-01-20', cache=cache)
+    assert cache.index('BTC/USDT:USDT', '1h')['generation'] == index['generation'] + 1
+    assert np.array_equal(arrays['close'], before)
+
+
+def _append_rows(cache_dir: str, worker: int, n: int):
+    cache = OHLCVCache(cache_dir)
+    for i in range(n):
+        ts = _ts('2025-01-01') + (i * 8 + worker) * HOUR
+        cache.update('BTC/USDT:USDT', '1h', [[ts, 1.0, 2.0, 0.5, 1.5, float(worker)]])
+
+
+def test_concurrent_processes_do_not_lose_updates(tmp_path):
+    """4 Prozesse aktualisieren denselben Store gleichzeitig: keine verlorenen Kerzen, konsistenter Stand"""
+    ctx   = multiprocessing.get_context('fork' if hasattr(os, 'fork') else 'spawn')
+    procs = [ctx.Process(target=_append_rows, args=(str(tmp_path), w, 25)) for w in range(4)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join(60)
+        assert p.exitcode == 0
+
+    cache = OHLCVCache(str(tmp_path))
+    data  = cache.read('BTC/USDT:USDT', '1h')
+    index = cache.index('BTC/USDT:USDT', '1h')
+    assert len(data['timestamp']) == len(data['close']) == index['rows'] == 100
+    assert index['generation'] == 100
+    assert np.array_equal(data['volume'], (np.asarray(data['timestamp']) - _ts('2025-01-01')) // HOUR % 8)
+    # Nur die aktuelle Generation, keine Temp-Reste
+    files = sorted(f for f in os.listdir(cache.path('BTC/USDT:USDT', '1h')) if not f.startswith('.'))
+    assert files == ['index.json', 'ohlcv.100.npy', 'timestamp.100.npy']
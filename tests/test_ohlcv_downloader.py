@@ -0,0 +1,97 @@
+"""
+mbot OHLCV-Downloader Tests
+
+Prueft den parallelen Download gegen einen lokalen Fake-Exchange
+(Latenz, RateLimitExceeded) und den Token-Bucket (kein API-Zugriff noetig).
+"""
+
+import os
+import sys
+import time
+import random
+import threading
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(os.path.join(PROJECT_ROOT, 'src'))
+
+import ccxt
+
+from mbot.utils.ohlcv_downloader import TokenBucket, download_ohlcv
+
+HOUR = 3600 * 1000
+
+
+class _FlakyExchange:
+    """1h-Kerzen mit zufaelliger Latenz; jeder erste Abruf pro since -> RateLimitExceeded."""
+
+    def __init__(self, now_ts: int, seed: int = 1):
+        self.now_ts   = now_ts
+        self.rng      = random.Random(seed)
+        self.seen     = set()
+        self.calls    = 0
+        self.active   = 0
+        self.peak     = 0
+        self._lock    = threading.Lock()
+
+    def parse_timeframe(self, timeframe):
+        return ccxt.Exchange.parse_timeframe(timeframe)
+
+    def milliseconds(self):
+        return self.now_ts
+
+    def fetch_ohlcv(self, symbol, timeframe, since, limit):
+        with self._lock:
+            self.calls  += 1
+            self.active += 1
+            self.peak    = max(self.peak, self.active)
+            first_try    = since not in self.seen
+            self.seen.add(since)
+            delay        = self.rng.random() * 0.004
+        try:
+            time.sleep(delay)
+            if first_try:
+                raise ccxt.RateLimitExceeded('429')
+            start = since + (-since % HOUR)
+            return [[ts, 1.0, 2.0, 0.5, float(ts // HOUR), 3.0]
+                    for ts in range(start, min(start + limit * HOUR, self.now_ts), HOUR)]
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+def test_parallel_download_is_complete_sorted_and_deterministic():
+    """Alle Kerzen genau einmal, aufsteigend, trotz Retries und Parallelitaet"""
+    since = ccxt.Exchange.parse8601('2025-01-01T00:30:00Z')
+    until = since + 1500 * HOUR
+    runs  = []
+    for seed in (1, 2):
+        ex = _FlakyExchange(now_ts=until + 10 * HOUR, seed=seed)
+        rows, ok = download_ohlcv(ex, 'BTC/USDT:USDT', '1h', since, until, limit=100,
+                                  max_workers=4, bucket=TokenBucket(1000.0),
+                                  backoff_base=0.001)
+        assert ok
+        assert ex.peak > 1
+        runs.append(rows)
+
+    ts = [r[0] for r in runs[0]]
+    assert ts == list(range(since + HOUR // 2, until + 1, HOUR))
+    assert runs[0] == runs[1]
+
+
+def test_failed_chunk_is_reported():
+    """Abschnitt, der auch nach allen Retries scheitert -> ok=False, Rest bleibt"""
+    since = ccxt.Exchange.parse8601('2025-01-01T00:00:00Z')
+    ex    = _FlakyExchange(now_ts=since + 400 * HOUR)
+    rows, ok = download_ohlcv(ex, 'BTC/USDT:USDT', '1h', since, since + 300 * HOUR, limit=100,
+                              bucket=TokenBucket(1000.0), max_retries=0)
+    assert not ok and rows == []
+
+
+def test_token_bucket_limits_rate():
+    """Nach dem Vorrat (capacity) kommt hoechstens rate Tokens pro Sekunde"""
+    clock  = [0.0]
+    bucket = TokenBucket(rate=20.0, capacity=5.0, clock=lambda: clock[0],
+                         sleep=lambda s: clock.__setitem__(0, clock[0] + s))
+    for _ in range(45):
+        bucket.acquire()
+    assert abs(clock[0] - 2.0) < 1e-9
@@ -0,0 +1,120 @@
+"""
+mbot OHLCV-Resampling Tests
+
+Prueft, dass 2h/4h/1d aus gecachten 1h-Kerzen exakt den Exchange-Kerzen
+(UTC-Raster) entsprechen und Luecken ueber den Exchange geschlossen werden.
+"""
+
+import os
+import sys
+
+import numpy as np
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(os.path.join(PROJECT_ROOT, 'src'))
+
+import ccxt
+
+from mbot.analysis.backtester import load_data
+from mbot.utils.ohlcv_cache import OHLCVCache
+from mbot.utils.ohlcv_resample import resample_ohlcv
+
+HOUR = 3600 * 1000
+
+
+class _MultiTfExchange:
+    """
+    Liefert Kerzen beliebiger Timeframes, die wie an der Boerse aus einer
+    15m-Reihe auf dem UTC-Raster gebildet werden. missing: fehlende 1h-Kerzen.
+    """
+
+    def __init__(self, listed_ts: int, now_ts: int, missing=()):
+        self.listed_ts = listed_ts
+        self.now_ts    = now_ts
+        self.missing   = set(missing)
+        self.calls     = []
+
+    def parse8601(self, text):
+        return ccxt.Exchange.parse8601(text)
+
+    def parse_timeframe(self, timeframe):
+        return ccxt.Exchange.parse_timeframe(timeframe)
+
+    def milliseconds(self):
+        return self.now_ts
+
+    def _bucket(self, ts, tf_ms):
+        step   = 15 * 60 * 1000
+        prices = [(ts + i * step) // step for i in range(tf_ms // step) if ts + i * step < self.now_ts]
+        prices = [100.0 + (p * 7919) % 50 for p in prices]
+        return [ts, prices[0], max(prices) + 1, min(prices) - 1, prices[-1], 2.5 * len(prices)]
+
+    def fetch_ohlcv(self, symbol, timeframe, since, limit):
+        self.calls.append((timeframe, since))
+        tf_ms = self.parse_timeframe(timeframe) * 1000
+        first = max(since, self.listed_ts)
+        first += -first % tf_ms
+        return [self._bucket(ts, tf_ms) for ts in range(first, min(self.now_ts, first + limit * tf_ms), tf_ms)
+                if not (timeframe == '1h' and ts in self.missing)]
+
+
+class _Wrapper:
+    def __init__(self, exchange):
+        self.exchange = exchange
+
+
+def _ts(date: str) -> int:
+    return ccxt.Exchange.parse8601(date + 'T00:00:00Z')
+
+
+def test_resample_ohlcv_aggregates_on_utc_grid():
+    """open = erste, close = letzte Kerze; Bucket-Start = ts // tf * tf"""
+    ts    = np.arange(3, 11, dtype=np.int64) * HOUR
+    ohlcv = np.vstack([np.arange(8.0), np.arange(8.0) + 10, np.arange(8.0) - 10,
+                       np.arange(8.0) + 0.5, np.ones(8)])
+    bucket_ts, out, complete = resample_ohlcv(ts, ohlcv, HOUR, 4 * HOUR)
+    assert bucket_ts.tolist() == [0, 4 * HOUR, 8 * HOUR]
+    assert complete.tolist() == [False, True, False]
+    assert out[:, 1].tolist() == [1.0, 14.0, -9.0, 4.5, 4.0]
+
+
+def test_higher_timeframes_equal_exchange_candles(tmp_path):
+    """2h/4h/1d aus dem 1h-Store: identisch zu den direkt geladenen Kerzen, ohne Abruf"""
+    ex    = _MultiTfExchange(_ts('2025-01-01'), _ts('2025-03-01'))
+    cache = OHLCVCache(str(tmp_path))
+    load_data(_Wrapper(ex), 'BTC/USDT:USDT', '1h', '2025-01-01', '2025-02-10', cache=cache)
+
+    for tf in ('2h', '4h', '1d'):
+        ex.calls.clear()
+        local = load_data(_Wrapper(ex), 'BTC/USDT:USDT', tf, '2025-01-03', '2025-02-10', cache=cache)
+        assert ex.calls == []
+        direct = load_data(_Wrapper(ex), 'BTC/USDT:USDT', tf, '2025-01-03', '2025-02-10', cache=None)
+        assert local.equals(direct)
+
+
+def test_base_gaps_fall_back_to_exchange(tmp_path):
+    """Fehlende 1h-Kerzen: nur die betroffenen 4h-Kerzen kommen vom Exchange"""
+    gap   = [_ts('2025-01-10') + i * HOUR for i in range(5, 7)]
+    ex    = _MultiTfExchange(_ts('2025-01-01'), _ts('2025-03-01'), missing=gap)
+    cache = OHLCVCache(str(tmp_path))
+    load_data(_Wrapper(ex), 'ETH/USDT:USDT', '1h', '2025-01-01', '2025-01-31', cache=cache)
+
+    ex.calls.clear()
+    local  = load_data(_Wrapper(ex), 'ETH/USDT:USDT', '4h', '2025-01-01', '2025-01-31', cache=cache)
+    assert ex.calls == [('4h', _ts('2025-01-10') + 4 * HOUR)]
+    direct = load_data(_Wrapper(ex), 'ETH/USDT:USDT', '4h', '2025-01-01', '2025-01-31', cache=None)
+    assert local.equals(direct)
+
+
+def test_forming_candle_is_built_from_base(tmp_path):
+    """Laufende 4h-Kerze: aus den vorhandenen 1h-Kerzen, kein Nachladen"""
+    now   = _ts('2025-01-05') + 2 * HOUR + 10 * 60 * 1000
+    ex    = _MultiTfExchange(_ts('2025-01-01'), now)
+    cache = OHLCVCache(str(tmp_path))
+    load_data(_Wrapper(ex), 'BTC/USDT:USDT', '1h', '2025-01-01', '2025-01-05', cache=cache)
+
+    ex.calls.clear()
+    df = load_data(_Wrapper(ex), 'BTC/USDT:USDT', '4h', '2025-01-01', '2025-01-05',
+                   cache=cache, resample_from='1h')
+    assert df.index[-1].value // 10**6 == _ts('2025-01-05')
+    assert all(tf == '1h' for tf, _ in ex.calls)
@@ -0,0 +1,81 @@
+"""
+mbot Optimizer Tests
+
+Prueft das picklebare MersObjective und den Shared-Memory-Transport
+der OHLCV-Daten (kein API-Zugriff noetig).
+"""
+
+import os
+import sys
+import pickle
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(os.path.join(PROJECT_ROOT, 'src'))
+
+from mbot.analysis.backtester import run_backtest, build_entropy_cube, dataset_hash
+from mbot.analysis.optimizer import MersObjective
+from mbot.utils.shm_arrays import SharedArrays, attach_arrays
+
+
+def _make_ohlcv(n: int, seed: int = 4) -> pd.DataFrame:
+    rng   = np.random.default_rng(seed)
+    close = np.round(100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.012, n))), 3)
+    open_ = np.r_[close[0], close[:-1]]
+    return pd.DataFrame({'open': open_,
+                         'high': np.maximum(open_, close) * (1 + rng.random(n) * 0.006),
+                         'low':  np.minimum(open_, close) * (1 - rng.random(n) * 0.006),
+                         'close': close, 'volume': 1.0},
+                        index=pd.date_range('2025-01-01', periods=n, freq='h', tz='UTC'))
+
+
+def test_shared_arrays_roundtrip():
+    """Angehaengte Arrays sind identisch und read-only"""
+    data   = {'a': np.arange(10.0), 'b': np.arange(6, dtype=np.int8).reshape(2, 3)}
+    shared = SharedArrays.create(data)
+    try:
+        handles, arrays = attach_arrays(pickle.loads(pickle.dumps(shared.descriptor)))
+        for name, values in data.items():
+            assert arrays[name].dtype == values.dtype
+            assert np.array_equal(arrays[name], values)
+            assert not arrays[name].flags.writeable
+        del arrays
+        for shm in handles:
+            shm.close()
+    finally:
+        shared.close()
+        shared.unlink()
+
+
+def test_objective_pickles_descriptor_only():
+    """Geteiltes Objective wird ohne Daten gepickelt und liefert dieselben Backtests"""
+    df   = _make_ohlcv(1500)
+    cube = build_entropy_cube(df, range(10, 31))
+    cfg  = {'entropy_window': 20, 'min_entropy_drop_pct': 0.0, 'use_multitf_filter': 1}
+    obj  = MersObjective(df, 'BTC/USDT:USDT', {'fee_rate_pct': 0.06}, entropy_cube=cube)
+
+    obj.share()
+    try:
+        payload = pickle.dumps(obj)
+        assert len(payload) < 4096
+        clone = pickle.loads(payload)
+        assert dataset_hash(clone.df) == dataset_hash(df)
+        assert clone.min_trades == obj.min_trades
+        assert (run_backtest(clone.df, cfg, clone.risk_config, feature_cache=None,
+                             entropy_cube=clone.entropy_cube)
+                == run_backtest(df, cfg, obj.risk_config, feature_cache=None, entropy_cube=cube))
+        del clone
+    finally:
+        obj.release()
+
+
+def test_score_constraints():
+    """strict verlangt alle Constraints, best_profit nur Trades und Drawdown"""
+    result = {'total_pnl_pct': 12.0, 'max_drawdown': 10.0, 'win_rate': 40.0, 'total_trades': 30}
+    strict = MersObjective(None, 'X', {}, mode='strict')
+    best   = MersObjective(None, 'X', {}, mode='best_profit')
+    assert strict.score(result) is None
+    assert best.score(result) == 12.0
+    assert best.score(dict(result, total_trades=5)) is None
@@ -0,0 +1,138 @@
+"""
+mbot Order-Bestaetigung Tests
+
+Prueft poll_until (adaptiver Backoff, Deadline, Netzwerkfehler) und die
+Pfade ohne feste Pausen mit FakeBitget: Entry-Fill per fetch_order,
+Housekeeper mit bestaetigtem Storno und Schliessen.
+"""
+
+import os
+import sys
+import time
+import logging
+
+import pytest
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(os.path.join(PROJECT_ROOT, 'src'))
+
+import ccxt
+
+from mbot.utils import trade_manager
+from mbot.utils.order_confirm import poll_until
+
+LOG    = logging.getLogger('test-order-confirm')
+SYMBOL = 'OC/USDT:USDT'
+RISK   = {'leverage': 5, 'risk_per_trade_pct': 0.5}
+
+REAL_SLEEP = time.sleep  # vor dem Patchen durch no_sleep gebunden
+
+
+class _Clock:
+    """Simulierte Uhr: sleep() stellt sie vor und merkt sich die Pausen."""
+
+    def __init__(self):
+        self.now    = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def test_poll_until_backs_off_and_returns_on_confirmation():
+    clock   = _Clock()
+    answers = iter([None, ccxt.RequestTimeout('timeout'), False, 'ok'])
+
+    def check():
+        answer = next(answers)
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+    result, polls = poll_until(check, timeout=5.0, clock=clock, sleep=clock.sleep)
+    assert result == 'ok' and polls == 4
+    assert clock.sleeps == pytest.approx([0.05, 0.1, 0.2])
+
+
+def test_poll_until_honours_deadline():
+    clock = _Clock()
+    result, polls = poll_until(lambda: None, timeout=2.0, clock=clock, sleep=clock.sleep)
+    assert result is None
+    assert clock.now == pytest.approx(2.0)
+    assert max(clock.sleeps) <= 1.0 and polls == len(clock.sleeps) + 1
+
+
+@pytest.fixture
+def make_fake(fake_exchange, no_sleep):
+    def make(**kwargs):
+        fake, ex = fake_exchange([SYMBOL], store={'seed': 5, 'base': 30.0}, balance=1000.0, **kwargs)
+        return fake, ex, no_sleep
+    return make
+
+
+@pytest.mark.parametrize('attached', [True, False])
+def test_entry_fill_is_polled_not_slept(make_fake, make_signal, attached):
+    """Nur Order-ID als Antwort, Fill erst bei der 3. Abfrage sichtbar: zwei kurze Pausen statt 1s"""
+    fake, ex, sleeps = make_fake(ack_only=True, pending_polls=2)
+    assert trade_manager.execute_signal_trade(ex, SYMBOL, '15m', make_signal(fake, SYMBOL),
+                                              dict(RISK, attached_tpsl=attached), {}, LOG)
+
+    assert fake.calls['fetch_order'] == 3
+    assert sleeps == pytest.approx([0.05, 0.1])
+    # Entry-Preis und Kontrakte aus der bestaetigten Order
+    pos = trade_manager.read_position(SYMBOL, '15m')
+    assert pos['entry_price'] == pytest.approx(fake.fetch_positions([SYMBOL])[0]['entryPrice'])
+    assert pos['contracts'] == pytest.approx(fake.fetch_positions([SYMBOL])[0]['contracts'])
+
+
+@pytest.mark.parametrize('attached', [True, False])
+def test_failed_fill_query_still_protects_and_tracks(make_fake, make_signal, attached):
+    """fetch_order scheitert nach gefuelltem Entry: Werte aus der Antwort, SL/TP und State trotzdem"""
+    fake, ex, _ = make_fake(ack_only=True)
+    fake.fail_next('fetch_order', ccxt.BadRequest('fake bitget: 40001 Parameter verification failed'))
+    assert trade_manager.execute_signal_trade(ex, SYMBOL, '15m', make_signal(fake, SYMBOL),
+                                              dict(RISK, attached_tpsl=attached), {}, LOG)
+
+    position = fake.fetch_positions([SYMBOL])[0]
+    pos      = trade_manager.read_position(SYMBOL, '15m')
+    plan     = 'profit_loss' if attached else 'normal_plan'
+    stops    = fake.fetch_open_orders(SYMBOL, params={'stop': True, 'planType': plan})
+    # ohne Fill-Antwort die angefragte Menge, Bitget rundet auf die Mengen-Praezision
+    step     = fake.markets[SYMBOL]['precision']['amount']
+    assert pos['side'] == 'long' and pos['contracts'] == pytest.approx(position['contracts'], abs=step)
+    assert sorted(o['triggerPrice'] for o in stops) == pytest.approx(sorted([pos['sl_price'], pos['tp_price']]),
+                                                                     rel=1e-5)
+
+
+def test_immediate_fill_needs_no_extra_request(make_fake, make_signal):
+    fake, ex, sleeps = make_fake()
+    assert trade_manager.execute_signal_trade(ex, SYMBOL, '15m', make_signal(fake, SYMBOL),
+                                              dict(RISK, attached_tpsl=False), {}, LOG)
+    assert fake.calls['fetch_order'] == 0 and sleeps == []
+
+
+def test_unconfirmed_fill_gives_up_at_deadline(make_fake, monkeypatch):
+    fake, ex, _ = make_fake(ack_only=True, pending_polls=1000)
+    monkeypatch.setattr(time, 'sleep', REAL_SLEEP)
+    order   = ex.place_market_order(SYMBOL, 'buy', 1.0)
+    started = time.perf_counter()
+    assert ex.wait_for_order_fill(SYMBOL, order, timeout=0.3) is None
+    assert 0.3 <= time.perf_counter() - started < 0.6
+
+
+def test_housekeeper_confirms_cancel_and_close_without_sleeping(make_fake):
+    fake, ex, sleeps = make_fake()
+    price = fake.price(SYMBOL)
+    ex.place_market_order(SYMBOL, 'buy', 2.0)
+    ex.place_trigger_market_order(SYMBOL, 'sell', 2.0, price * 0.9, reduce=True)
+    ex.place_trigger_market_order(SYMBOL, 'sell', 2.0, price * 1.1, reduce=True)
+
+    fake.calls.clear()
+    assert trade_manager.housekeeper_routine(ex, SYMBOL, LOG)
+    assert sleeps == []
+    assert fake.calls['cancel_all_orders'] == 2 and fake.calls['fetch_open_orders'] == 2
+    assert not fake.fetch_positions([SYMBOL]) and fake.fetch_open_orders(SYMBOL) == []
@@ -0,0 +1,93 @@
+"""
+mbot Order-Pfad Tests
+
+Prueft execute_signal_trade mit FakeBitget: Entry mit Preset-SL/TP in
+einem Request, Fallback auf Entry + SL + TP bei Ablehnung, kein Fallback
+bei Timeouts, und die Latenz-Messung beider Pfade.
+"""
+
+import os
+import sys
+import logging
+
+import pytest
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(os.path.join(PROJECT_ROOT, 'src'))
+
+from mbot.utils import trade_manager
+
+LOG    = logging.getLogger('test-order-paths')
+SYMBOL = 'OP/USDT:USDT'
+RISK   = {'leverage': 5, 'risk_per_trade_pct': 0.5}
+
+
+@pytest.fixture
+def make_fake(fake_exchange, no_sleep):
+    trade_manager.ORDER_LATENCY.clear()
+    # Latenz des Fakes wird wirklich abgewartet (gebunden an das echte time.sleep)
+    return lambda **kwargs: fake_exchange([SYMBOL], store={'seed': 2}, balance=1000.0, **kwargs)
+
+
+def test_attached_entry_is_one_request(make_fake, make_signal):
+    fake, ex = make_fake()
+    assert trade_manager.execute_signal_trade(ex, SYMBOL, '15m', make_signal(fake, SYMBOL), RISK, {}, LOG)
+
+    assert fake.calls['create_order'] == 1
+    presets = fake.fetch_open_orders(SYMBOL, params={'stop': True, 'planType': 'profit_loss'})
+    pos     = trade_manager.read_position(SYMBOL, '15m')
+    assert sorted(o['triggerPrice'] for o in presets) == pytest.approx(sorted([pos['sl_price'], pos['tp_price']]),
+                                                                      rel=1e-5)
+    rec = trade_manager.ORDER_LATENCY[-1]
+    assert rec['path'] == 'attached' and rec['requests'] == 1
+    assert rec['protected_ms'] == pytest.approx(rec['entry_ms'])
+
+    # Position zu -> Presets verfallen, keine Ghost-Trigger
+    while fake.fetch_positions([SYMBOL]):
+        fake.advance()
+    assert fake.fetch_open_orders(SYMBOL) == []
+
+
+def test_rejected_preset_falls_back_to_three_orders(make_fake, make_signal):
+    fake, ex = make_fake(preset_tpsl=False)
+    assert trade_manager.execute_signal_trade(ex, SYMBOL, '15m', make_signal(fake, SYMBOL, 'short'),
+                                              RISK, {}, LOG)
+
+    assert fake.calls['create_order'] == 4
+    assert len(fake.fetch_open_orders(SYMBOL, params={'stop': True})) == 2
+    rec = trade_manager.ORDER_LATENCY[-1]
+    assert rec['path'] == 'fallback' and rec['requests'] == 4
+
+
+def test_invalid_preset_prices_fall_back_with_fill_based_stops(make_fake, make_signal):
+    """Erwarteter Entry weit ueber dem Kurs -> Preset-SL ueber dem Kurs, Bitget lehnt ab"""
+    fake, ex = make_fake()
+    signal   = make_signal(fake, SYMBOL, entry_price=fake.price(SYMBOL) * 1.05)
+    assert trade_manager.execute_signal_trade(ex, SYMBOL, '15m', signal, RISK, {}, LOG)
+    pos = trade_manager.read_position(SYMBOL, '15m')
+    assert pos['sl_price'] < pos['entry_price'] < pos['tp_price']
+    assert trade_manager.ORDER_LATENCY[-1]['path'] == 'fallback'
+
+
+def test_timeout_on_entry_does_not_fall_back(make_fake, make_signal):
+    fake, ex = make_fake()
+    fake.fail_next('create_order')
+    assert not trade_manager.execute_signal_trade(ex, SYMBOL, '15m', make_signal(fake, SYMBOL), RISK, {}, LOG)
+    assert fake.calls['create_order'] == 1 and not fake.fetch_positions([SYMBOL])
+
+
+def test_latency_attached_vs_separate(make_fake, make_signal):
+    """50 ms pro Order-Request: Preset schuetzt nach einem Round-Trip, separat nach zweien"""
+    latency = lambda method: 0.05 if method == 'create_order' else 0.0
+    for attached in (True, False):
+        fake, ex = make_fake(latency=latency)
+        assert trade_manager.execute_signal_trade(ex, SYMBOL, '15m', make_signal(fake, SYMBOL),
+                                                  dict(RISK, attached_tpsl=attached), {}, LOG)
+        trade_manager.clear_position(SYMBOL, '15m')
+
+    summary = trade_manager.order_latency_summary()
+    assert summary['attached']['requests'] == 1 and summary['separate']['requests'] == 3
+    assert summary['attached']['protected_median_ms'] >= 40
+    assert summary['separate']['protected_median_ms'] >= 90
+    assert summary['attached']['protected_median_ms'] < summary['separate']['protected_median_ms']
+    assert summary['attached']['total_median_ms'] < summary['separate']['total_median_ms']
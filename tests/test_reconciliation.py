@@ -0,0 +1,97 @@
+"""
+mbot Reconciliation Tests
+
+Prueft trade_manager.reconcile_positions mit FakeBitget: ein Snapshot
+(Positionen + Trigger-Orders) pro Durchlauf, Storno nur fuer Symbole mit
+Ghost-Triggern, State-Bereinigung wie im Check-Modus.
+"""
+
+import os
+import sys
+import logging
+
+import pytest
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(os.path.join(PROJECT_ROOT, 'src'))
+
+from mbot.utils import trade_manager
+
+LOG = logging.getLogger('test-reconcile')
+TF  = '15m'
+
+
+@pytest.fixture
+def account(fake_exchange, make_signal, no_sleep):
+    """6 Symbole, auf 4 davon ein Trade mit engem SL/TP (schliesst beim Replay)."""
+    symbols  = [f'RC{i}/USDT:USDT' for i in range(6)]
+    fake, ex = fake_exchange(symbols, timeframe=TF, balance=10000.0,
+                             store={'n': 400, 'seed': 8, 'base': 10.0, 'vol': 0.004})
+
+    for k, symbol in enumerate(symbols[:4]):
+        # RC0/RC1: sehr enger SL -> schliessen frueh; RC2/RC3: weit -> bleiben offen
+        mult   = 0.3 if k < 2 else 20.0
+        signal = make_signal(fake, symbol, atr_pct=0.01, sl_mult=mult, tp_mult=mult)
+        # Separate Trigger-Orders (wie im Fallback) - Preset-TP/SL verfallen mit der Position
+        assert trade_manager.execute_signal_trade(ex, symbol, TF, signal,
+                                                  {'leverage': 5, 'risk_per_trade_pct': 0.1,
+                                                   'attached_tpsl': False}, {}, LOG)
+    return fake, ex, symbols
+
+
+def _closed(fake, symbols):
+    return [s for s in symbols if not fake.fetch_positions([s])]
+
+
+def test_reconcile_uses_one_snapshot_and_cancels_only_ghost_triggers(account):
+    fake, ex, symbols = account
+    for _ in range(200):
+        if len(_closed(fake, symbols[:4])) >= 2:
+            break
+        fake.advance()
+    closed = _closed(fake, symbols[:4])
+    assert closed == symbols[:2]
+
+    active_keys = {(s, TF) for s in symbols}
+    fake.calls.clear()
+    summary = trade_manager.reconcile_positions(ex, {}, LOG, active_keys)
+
+    assert fake.calls['fetch_positions'] == 1 and fake.calls['fetch_open_orders'] == 1
+    assert fake.calls['cancel_all_orders'] == len(closed)
+    assert sorted(summary['cancelled']) == closed
+    assert sorted(k[0] for k in summary['closed']) == closed
+    assert sorted(k[0] for k in summary['open']) == symbols[2:4]
+    assert {p['symbol'] for p in trade_manager.read_active_positions()} == set(symbols[2:4])
+    assert all(trade_manager.is_candle_cooldown_active(s, TF) for s in closed)
+    # Ghost-Trigger weg, Trigger der offenen Positionen unberuehrt
+    remaining = {o['symbol'] for o in fake.fetch_open_orders(params={'stop': True})}
+    assert remaining == set(symbols[2:4])
+
+    # Zweiter Durchlauf: nichts mehr zu tun -> nur der Snapshot
+    fake.calls.clear()
+    summary = trade_manager.reconcile_positions(ex, {}, LOG, active_keys)
+    assert sum(fake.calls.values()) == 2 and not summary['closed'] and not summary['cancelled']
+
+
+def test_snapshot_failure_changes_nothing(account):
+    fake, ex, symbols = account
+    before = trade_manager.read_active_positions()
+    fake.fail_next('fetch_positions')
+    fake.calls.clear()
+    assert trade_manager.reconcile_positions(ex, {}, LOG, {(s, TF) for s in symbols}) is None
+    assert trade_manager.read_active_positions() == before
+    assert fake.calls['cancel_all_orders'] == 0
+
+
+def test_foreign_orders_and_untracked_positions_are_left_alone(account):
+    fake, ex, symbols = account
+    # Fremder Trigger auf einem Symbol ausserhalb der aktiven Strategien (ohne Position)
+    fake.create_order(symbols[5], 'market', 'sell', 1.0, params={'triggerPrice': fake.price(symbols[5]) * 0.5})
+    # Offene, aber nicht getrackte Position auf einem aktiven Symbol
+    ex.place_market_order(symbols[4], 'buy', 1.0)
+
+    active_keys = {(s, TF) for s in symbols[:5]}
+    summary     = trade_manager.reconcile_positions(ex, {}, LOG, active_keys)
+    assert summary['untracked'] == [symbols[4]] and not summary['cancelled']
+    assert [o['symbol'] for o in fake.fetch_open_orders(symbols[5], params={'stop': True})] == [symbols[5]]
+    assert fake.fetch_positions([symbols[4]])
@@ -0,0 +1,45 @@
+"""
+mbot TaskScheduler Tests
+
+Prueft Download-/CPU-Phasen und Fehlerbehandlung des
+Task-Schedulers (kein API-Zugriff noetig).
+"""
+
+import os
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(os.path.join(PROJECT_ROOT, 'src'))
+
+from mbot.utils.task_scheduler import TaskScheduler
+
+
+def test_tasks_finish_once_with_results_and_errors():
+    """Jeder Task endet genau einmal; Lade-, Plan- und Job-Fehler werden gemeldet"""
+    tasks = [{'name': n, 'size': s} for n, s in [('a', 3), ('b', 1), ('empty', 2),
+                                                   ('bad_load', 1), ('bad_job', 5)]]
+    finished = {}
+
+    def load(task):
+        if task['name'] == 'bad_load':
+            raise RuntimeError('download')
+        return None if task['name'] == 'empty' else {'size': task['size']}
+
+    def plan(task, payload):
+        exponent = 'x' if task['name'] == 'bad_job' else payload['size']
+        return payload['size'], [(pow, (2, exponent)), (pow, (3, 2))]
+
+    def finish(task, payload, results, error):
+        assert task['name'] not in finished
+        finished[task['name']] = (payload, results, error)
+
+    TaskScheduler(cpu_budget=2, download_threads=2).run(
+        tasks, load, plan, finish, estimate=lambda t: t['size'])
+
+    assert set(finished) == {t['name'] for t in tasks}
+    assert finished['a'][1] == [8, 9]
+    assert finished['b'][1] == [2, 9]
+    assert finished['empty'] == (None, [], None)
+    assert isinstance(finished['bad_load'][2], RuntimeError)
+    assert isinstance(finished['bad_job'][2], TypeError)
+    assert finished['bad_job'][1][1] == 9